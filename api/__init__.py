@@ -1,5 +1,47 @@
-from flask import Blueprint
+from flask import Blueprint, Response, request
+from src.data import serialization
+from src.data.project_store import DEFAULT_PROJECT_ID, validate_project_id
 
 api = Blueprint('api', __name__)
 
-from . import projects, scheduler, visualizations
\ No newline at end of file
+MAX_PAGE_SIZE = 200
+
+def requested_project_id():
+    """Project addressed by the ?project_id= query argument (the default project if absent)."""
+    return validate_project_id(request.args.get('project_id', DEFAULT_PROJECT_ID))
+
+def requested_page(default_limit=50):
+    """(offset, limit) from the ?offset= and ?limit= query arguments, limit capped at MAX_PAGE_SIZE."""
+    try:
+        offset = max(0, int(request.args.get('offset', 0)))
+        limit = min(MAX_PAGE_SIZE, max(1, int(request.args.get('limit', default_limit))))
+    except ValueError:
+        raise ValueError("offset and limit must be integers")
+    return offset, limit
+
+def requested_mimetype(streamable=False):
+    """Encoding the Accept header prefers among those available (JSON if it names none of them)."""
+    available = serialization.mimetypes()
+    if not streamable:
+        available.remove(serialization.NDJSON)
+    return request.accept_mimetypes.best_match(available, default=serialization.JSON)
+
+def encoded_response(payload, stream=None, status=200, mimetype=None):
+    """
+    payload (or a function returning it) as JSON, encoded with orjson when
+    installed, or as msgpack when installed and preferred. If stream is given
+    as (header, items) clients may also ask for newline-delimited JSON, which
+    is sent one item at a time.
+    """
+    mimetype = mimetype or requested_mimetype(streamable=stream is not None)
+    if mimetype == serialization.NDJSON:
+        header, items = stream
+        response = Response(serialization.iter_ndjson(header, items), status=status, mimetype=mimetype)
+    else:
+        if callable(payload):
+            payload = payload()
+        response = Response(serialization.encode(payload, mimetype), status=status, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+from . import projects, scheduler, visualizations, jobs, metrics
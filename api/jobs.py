@@ -0,0 +1,69 @@
+from flask import jsonify, current_app, url_for
+from . import api, requested_project_id
+from src.data.project_store import ProjectStore, project_output_path
+from src.service.job_service import JobQueue, JobQueueFull, file_digest
+from src.service.scheduler_service import SchedulerService
+from src.service.dependency_graph_service import DependencyGraphService
+from src.service.gantt_chart_service import GanttChartService
+
+def _project_version(project_id):
+    version = ProjectStore.instance().version(project_id)
+    if version is None:
+        raise FileNotFoundError(f"Project not found: {project_id}")
+    return version
+
+# kind -> (work function, input identity used to spot duplicate jobs)
+JOB_KINDS = {
+    'schedule': (SchedulerService.schedule_from_file, _project_version),
+    'dependency-graph': (DependencyGraphService.generate_from_file, _project_version),
+    'gantt-chart': (GanttChartService.generate_from_file,
+                    lambda project_id: file_digest(project_output_path('schedule_output', project_id))),
+}
+
+ERROR_STATUS = {
+    'FileNotFoundError': 404,
+    'ValueError': 400,
+}
+
+@api.route('/jobs/<kind>', methods=['POST'])
+def submit_job(kind):
+    if kind not in JOB_KINDS:
+        return jsonify({"error": f"Unknown job kind: {kind}"}), 404
+    try:
+        project_id = requested_project_id()
+        func, input_identity = JOB_KINDS[kind]
+        job = JobQueue.instance().submit(kind, func, project_id, key=(kind, project_id, input_identity(project_id)))
+        response = jsonify(job.to_dict())
+        response.headers['Location'] = url_for('api.get_job', job_id=job.id)
+        return response, 202
+    except JobQueueFull as e:
+        response = jsonify({"error": str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"An error occurred while submitting a {kind} job: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = JobQueue.instance().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+@api.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    job = JobQueue.instance().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not job.done:
+        return jsonify(job.to_dict()), 202
+    if job.status == "failed":
+        return jsonify({"error": job.error}), ERROR_STATUS.get(job.error_type, 500)
+    if job.kind == 'schedule':
+        return jsonify({"result": job.result}), 200
+    return jsonify({"file_path": job.result}), 200
@@ -0,0 +1,7 @@
+from flask import Response
+from . import api
+from src.service.metrics_service import MetricsRegistry
+
+@api.route('/metrics', methods=['GET'])
+def get_metrics():
+    return Response(MetricsRegistry.instance().render(), mimetype='text/plain; version=0.0.4')
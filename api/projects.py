@@ -1,22 +1,15 @@
-import json
-import os
 from flask import jsonify, request, current_app
-from . import api
-from src.config import CONFIG
+from . import api, requested_page
+from src.data.project_store import ProjectStore, DEFAULT_PROJECT_ID, validate_project_id
+from src.service.scheduler_service import SchedulerService
 
-@api.route('/projects', methods=['GET'])
-def get_projects():
-    try:
-        with open(CONFIG['paths']['project_input'], 'r') as f:
-            projects = json.load(f)
-        return jsonify(projects), 200
-    except FileNotFoundError:
+def _get_project(project_id):
+    project = ProjectStore.instance().get(project_id)
+    if project is None:
         return jsonify({"error": "Project data not found"}), 404
-    except json.JSONDecodeError:
-        return jsonify({"error": "Invalid project data format"}), 500
+    return jsonify(project), 200
 
-@api.route('/projects', methods=['POST'])
-def create_project():
+def _save_project(project_id, status):
     try:
         data = request.json
         if not data:
@@ -25,12 +18,47 @@ def create_project():
         if 'tasks' not in data or 'resources' not in data:
             return jsonify({"error": "Invalid project data. 'tasks' and 'resources' are required."}), 400
 
-        os.makedirs(os.path.dirname(CONFIG['paths']['project_input']), exist_ok=True)
-        with open(CONFIG['paths']['project_input'], 'w') as f:
-            json.dump(data, f, indent=2)
+        version = ProjectStore.instance().put(project_id, data)
+        SchedulerService.invalidate_cache(project_id)
 
-        return jsonify({"message": "Project created successfully"}), 201
+        return jsonify({"message": "Project created successfully", "id": project_id, "version": version}), status
 
     except Exception as e:
         current_app.logger.error(f"An error occurred while creating the project: {str(e)}")
-        return jsonify({"error": "An unexpected error occurred"}), 500
\ No newline at end of file
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@api.route('/projects', methods=['GET'])
+def get_projects():
+    return _get_project(DEFAULT_PROJECT_ID)
+
+@api.route('/projects', methods=['POST'])
+def create_project():
+    return _save_project(DEFAULT_PROJECT_ID, 201)
+
+@api.route('/projects/list', methods=['GET'])
+def list_projects():
+    try:
+        offset, limit = requested_page()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    projects, total = ProjectStore.instance().list(offset, limit)
+    return jsonify({"projects": projects, "total": total, "offset": offset, "limit": limit}), 200
+
+@api.route('/projects/<project_id>', methods=['GET'])
+def get_project(project_id):
+    return _get_project(project_id)
+
+@api.route('/projects/<project_id>', methods=['PUT'])
+def put_project(project_id):
+    try:
+        validate_project_id(project_id)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return _save_project(project_id, 200)
+
+@api.route('/projects/<project_id>', methods=['DELETE'])
+def delete_project(project_id):
+    if not ProjectStore.instance().delete(project_id):
+        return jsonify({"error": "Project data not found"}), 404
+    SchedulerService.invalidate_cache(project_id)
+    return jsonify({"message": "Project deleted successfully"}), 200
@@ -1,19 +1,132 @@
-from flask import jsonify, current_app
-from . import api
+from flask import Response, jsonify, current_app, request, stream_with_context
+from . import api, requested_project_id, requested_mimetype, encoded_response
+from src.data import serialization
 from src.service.scheduler_service import SchedulerService
+from src.service.metrics_service import profile_call
+from src.service.stream_service import ScheduleStreams, StreamLimitReached
+from src.data.project_store import VersionConflict
+from src.config import CONFIG
+
+PROFILE_MODES = {'cpu': (True, False), 'memory': (False, True), 'all': (True, True)}
+
+def _flag(name):
+    value = request.args.get(name)
+    return None if value is None else value.lower() in ('1', 'true', 'yes')
+
+def _schedule_stream(response):
+    """(header, tasks) of a response carrying a schedule result, for newline-delimited JSON."""
+    result = response["result"]
+    header = dict(response, result={key: value for key, value in result.items() if key != 'scheduled_tasks'})
+    return header, result['scheduled_tasks']
 
 @api.route('/schedule', methods=['POST'])
 def schedule_tasks():
     try:
-        result = SchedulerService.schedule_from_file()
-        return jsonify({
+        metrics_config = CONFIG.get('metrics', {})
+        refresh = _flag('refresh') or False
+        include_metrics = _flag('metrics')
+        if include_metrics is None:
+            include_metrics = metrics_config.get('include_in_result', False)
+        profile = request.args.get('profile')
+        if profile is not None:
+            if not metrics_config.get('allow_profiling', False):
+                return jsonify({"error": "Profiling is disabled ([metrics] allow_profiling)"}), 403
+            if profile not in PROFILE_MODES:
+                return jsonify({"error": f"profile must be one of: {', '.join(PROFILE_MODES)}"}), 400
+
+        run_metrics = {}
+        args = (requested_project_id(),)
+        kwargs = {"use_cache": not refresh, "optimize": _flag('optimize'), "run_metrics": run_metrics}
+        report = None
+        if profile is not None:
+            cpu, memory = PROFILE_MODES[profile]
+            result, report = profile_call(SchedulerService.schedule_from_file, *args, cpu=cpu, memory=memory,
+                                          top=metrics_config.get('profile_top', 25), **kwargs)
+        else:
+            result = SchedulerService.schedule_from_file(*args, **kwargs)
+
+        response = {
             "message": "Scheduling completed successfully",
             "result": result
-        }), 200
+        }
+        if include_metrics:
+            response["metrics"] = run_metrics
+        if report is not None:
+            response["profile"] = report
+        return encoded_response(response, stream=_schedule_stream(response))
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
     except ValueError as e:
         return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"An error occurred: {str(e)}")
-        return jsonify({"error": "An unexpected error occurred"}), 500
\ No newline at end of file
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@api.route('/schedule', methods=['GET'])
+def get_schedule():
+    try:
+        result, etag = SchedulerService.get_cached_result(requested_project_id())
+        if result is None:
+            return jsonify({"error": "No schedule for the current project. POST /schedule first."}), 404
+        mimetype = requested_mimetype(streamable=True)
+        body = {"result": result}
+        response = encoded_response(body, stream=_schedule_stream(body), mimetype=mimetype)
+        # One entity tag per encoding, so a cached JSON copy never validates a msgpack request
+        response.set_etag(etag if mimetype == serialization.JSON else f"{etag}-{mimetype.split('/')[-1]}")
+        return response.make_conditional(request)
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"An error occurred while retrieving the schedule: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@api.route('/schedule/delta', methods=['POST'])
+def reschedule_tasks():
+    try:
+        patch = request.json
+        if not patch:
+            return jsonify({"error": "No patch provided"}), 400
+        result = SchedulerService.reschedule(patch, requested_project_id())
+        response = {
+            "message": "Rescheduling completed successfully",
+            "result": result
+        }
+        return encoded_response(response, stream=_schedule_stream(response))
+    except VersionConflict as e:
+        return jsonify({"error": str(e)}), 409
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"An error occurred while rescheduling: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@api.route('/schedule/stream', methods=['GET'])
+def stream_schedule():
+    # Server-Sent Events from a scheduling run, ending with a done (or error) event
+    try:
+        channel = ScheduleStreams.instance().open(requested_project_id(), use_cache=not _flag('refresh'))
+    except StreamLimitReached as e:
+        return jsonify({"error": str(e)}), 503
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    heartbeat = CONFIG.get('streaming', {}).get('heartbeat', 15)
+
+    def generate():
+        try:
+            for record in channel.events(heartbeat):
+                if record is None:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield b"event: " + record["event"].encode('utf-8') + b"\ndata: " + serialization.dumps(record) + b"\n\n"
+        finally:
+            channel.close()
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # keep reverse proxies from buffering the stream
+    return response
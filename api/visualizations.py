@@ -1,18 +1,21 @@
-from flask import jsonify, current_app, send_file
-from . import api
-from src.service.dependency_graph_service import DependencyGraphService
+from flask import jsonify, current_app, send_file, request
+from . import api, requested_project_id, requested_page, requested_mimetype, encoded_response
+from src.data import serialization
+from src.service.dependency_graph_service import DependencyGraphService, GRAPH_FORMATS
 from src.service.gantt_chart_service import GanttChartService
 
 @api.route('/dependency-graph', methods=['POST'])
 def create_dependency_graph():
     try:
-        output_path = DependencyGraphService.generate_from_file()
+        output_path = DependencyGraphService.generate_from_file(requested_project_id())
         return jsonify({
             "message": "Dependency graph created successfully",
             "file_path": output_path
         }), 200
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"An error occurred: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
@@ -20,13 +23,15 @@ def create_dependency_graph():
 @api.route('/gantt-chart', methods=['POST'])
 def create_gantt_chart():
     try:
-        output_path = GanttChartService.generate_from_file()
+        output_path = GanttChartService.generate_from_file(requested_project_id())
         return jsonify({
             "message": "Gantt chart data created successfully",
             "file_path": output_path
         }), 200
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"An error occurred: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
@@ -34,21 +39,83 @@ def create_gantt_chart():
 @api.route('/dependency-graph', methods=['GET'])
 def get_dependency_graph():
     try:
-        file_path = DependencyGraphService.get_graph_file()
-        return send_file(file_path, mimetype='image/png')
+        image_format = request.args.get('format', 'png')
+        file_path = DependencyGraphService.get_graph_file(requested_project_id(), image_format)
+        return send_file(file_path, mimetype=GRAPH_FORMATS[image_format])
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"An error occurred while retrieving the dependency graph: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
 
+@api.route('/dependency-graph/nodes', methods=['GET'])
+def query_dependency_graph():
+    try:
+        offset, limit = requested_page()
+        try:
+            depth = int(request.args.get('depth', 1))
+        except ValueError:
+            raise ValueError("depth must be an integer")
+        if depth < 0:
+            raise ValueError("depth must not be negative")
+        page = DependencyGraphService.query_nodes(
+            requested_project_id(), request.args.get('task'), depth,
+            request.args.get('direction', 'both'), offset, limit
+        )
+        return encoded_response(page)
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"An error occurred while querying the dependency graph: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+def _time_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+@api.route('/gantt-chart/tasks', methods=['GET'])
+def query_gantt_chart():
+    try:
+        offset, limit = requested_page()
+        page = GanttChartService.query_tasks(
+            requested_project_id(), _time_arg('start'), _time_arg('end'),
+            request.args.get('resource'), offset, limit
+        )
+        header = {key: value for key, value in page.items() if key != 'tasks'}
+        return encoded_response(page, stream=(header, page['tasks']))
+    except FileNotFoundError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        current_app.logger.error(f"An error occurred while querying the Gantt chart data: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
 @api.route('/gantt-chart', methods=['GET'])
 def get_gantt_chart():
     try:
-        chart_data = GanttChartService.get_chart_data()
-        return jsonify(chart_data), 200
+        file_path = GanttChartService.get_chart_file(requested_project_id())
+        mimetype = requested_mimetype(streamable=True)
+        if mimetype == serialization.JSON:
+            # Already JSON on disk; serve it without parsing
+            response = send_file(file_path, mimetype=mimetype)
+            response.vary.add('Accept')
+            return response
+        stream = (serialization.read_header(file_path, 'tasks'), serialization.iter_items(file_path, 'tasks'))
+        return encoded_response(lambda: serialization.read_document(file_path), stream=stream, mimetype=mimetype)
     except FileNotFoundError as e:
         return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         current_app.logger.error(f"An error occurred while retrieving the Gantt chart data: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""Synthetic projects in the project input format, for benchmarking the scheduler."""
+import random
+
+RESOURCE_NAMES = ("Alice", "Bob", "Carol", "Dave", "Erin", "Frank", "Grace", "Heidi")
+DECAY_FACTORS = (0.85, 0.9, 0.95, 0.99)
+WORDS = ("design", "implement", "review", "deploy", "test", "integration", "migration", "security",
+         "documentation", "performance", "cleanup", "infrastructure", "launch", "research")
+
+
+def _task(task_id, dependencies, rnd, resource_names):
+    words = rnd.sample(WORDS, 3)
+    return {
+        "id": task_id,
+        "title": f"{words[0].capitalize()} {task_id}",
+        "description": f"{' '.join(words)} work for {task_id}",
+        "requiredTime": rnd.randint(1, 8),
+        "dependencies": dependencies,
+        "requiredResources": rnd.sample(resource_names, rnd.randint(1, 2)),
+        "baseReward": rnd.randint(10, 100),
+        "rewardDecayFactor": rnd.choice(DECAY_FACTORS)
+    }
+
+
+def _resources(n, resource_names):
+    # Roughly one unit per 25 tasks of each name, so larger projects stay contended but not starved
+    units = max(1, min(64, n // 25))
+    return [name for name in resource_names for _ in range(units)]
+
+
+def _project(task_dependencies, seed, resource_count):
+    rnd = random.Random(seed)
+    resource_names = list(RESOURCE_NAMES[:resource_count])
+    tasks = [_task(f"T{i}", deps, rnd, resource_names) for i, deps in enumerate(task_dependencies)]
+    return {"tasks": tasks, "resources": _resources(len(tasks), resource_names)}
+
+
+def chain(n, seed=0, resource_count=4):
+    """Every task depends on the previous one."""
+    return _project([[f"T{i - 1}"] if i else [] for i in range(n)], seed, resource_count)
+
+
+def fan_out(n, seed=0, resource_count=4):
+    """One root task that every other task depends on."""
+    return _project([["T0"] if i else [] for i in range(n)], seed, resource_count)
+
+
+def random_dag(n, seed=0, resource_count=4, max_dependencies=3, window=50):
+    """Each task depends on up to max_dependencies of the window tasks before it."""
+    rnd = random.Random(seed + 1)
+    dependencies = []
+    for i in range(n):
+        candidates = range(max(0, i - window), i)
+        count = min(len(candidates), rnd.randint(0, max_dependencies))
+        dependencies.append([f"T{j}" for j in rnd.sample(candidates, count)])
+    return _project(dependencies, seed, resource_count)
+
+
+def layered(n, seed=0, resource_count=4, width=None, max_dependencies=3):
+    """Tasks in layers of width; each depends on tasks of the previous layer only."""
+    rnd = random.Random(seed + 1)
+    width = width or max(1, int(n ** 0.5))
+    dependencies = []
+    for i in range(n):
+        layer_start = (i // width) * width
+        previous = range(max(0, layer_start - width), layer_start)
+        count = min(len(previous), rnd.randint(1, max_dependencies))
+        dependencies.append([f"T{j}" for j in rnd.sample(previous, count)])
+    return _project(dependencies, seed, resource_count)
+
+
+def cyclic(n, seed=0, resource_count=4, cycles=None):
+    """A random DAG with back edges injected to create dependency cycles."""
+    project = random_dag(n, seed, resource_count)
+    rnd = random.Random(seed + 2)
+    cycles = max(1, n // 100) if cycles is None else cycles
+    tasks = project["tasks"]
+    for _ in range(cycles if n > 1 else 0):
+        i = rnd.randrange(n - 1)
+        j = rnd.randrange(i + 1, min(n, i + 20))
+        # j must (transitively) depend on i for the back edge i -> j to close a cycle
+        if f"T{i}" not in tasks[j]["dependencies"]:
+            tasks[j]["dependencies"].append(f"T{i}")
+        tasks[i]["dependencies"].append(f"T{j}")
+    return project
+
+
+def pooled(n, seed=0, resource_count=4):
+    """A random DAG on typed resources: {name: capacity} pools and per-task unit demands."""
+    project = random_dag(n, seed, resource_count)
+    rnd = random.Random(seed + 3)
+    capacity = max(1, min(64, n // 25))
+    for task in project["tasks"]:
+        task["requiredResources"] = {name: rnd.randint(1, min(4, capacity)) for name in task["requiredResources"]}
+    project["resources"] = {name: capacity for name in RESOURCE_NAMES[:resource_count]}
+    return project
+
+
+GENERATORS = {
+    "chain": chain,
+    "fan_out": fan_out,
+    "random_dag": random_dag,
+    "layered": layered,
+    "cyclic": cyclic,
+    "pooled": pooled
+}
@@ -0,0 +1,198 @@
+"""
+Scheduler benchmark: schedules synthetic projects with the local heuristic
+analyzer (no network, deterministic) and reports time, peak memory and
+schedule quality per phase. Results are saved as JSON so two versions can
+be compared.
+
+    python -m benchmarks.run --sizes 10,1000,10000 --label before
+    python -m benchmarks.run --sizes 10,1000,10000 --compare benchmarks/results/before.json
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generators import GENERATORS  # noqa: E402
+from src.analysis.heuristic_analyzer import HeuristicAnalyzer  # noqa: E402
+from src.models.task import Task  # noqa: E402
+from src.scheduling.scheduler import Scheduler  # noqa: E402
+from src.scheduling.tracing import EventTracer  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+# (phase name, Scheduler method) in the order schedule() runs them
+PHASES = (
+    ("analysis", "_analyze_tasks"),
+    ("priorities", "_prepare_priorities"),
+    ("validation", "_validate_dependencies"),
+    ("cycles", "_break_dependency_cycles"),
+    ("critical_path", "_analyze_critical_path"),
+    ("engine", "_run_engine")
+)
+
+
+class BenchmarkScheduler(Scheduler):
+    """Scheduler that records wall time (and optionally peak traced memory) of each phase."""
+
+    def __init__(self, tasks, resources, engine=None, track_memory=False):
+        super().__init__(tasks, resources, engine=engine, analyzer=HeuristicAnalyzer(), tracer=EventTracer())
+        self.track_memory = track_memory
+        self.phases = {}
+        self.phase_results = {}
+        for phase, method in PHASES:
+            setattr(self, method, self._timed(phase, getattr(self, method)))
+
+    def _timed(self, phase, method):
+        def run(*args, **kwargs):
+            if self.track_memory:
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            result = method(*args, **kwargs)
+            stats = {"seconds": time.perf_counter() - started}
+            if self.track_memory:
+                stats["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - baseline
+            self.phases[phase] = stats
+            self.phase_results[phase] = result
+            return result
+        return run
+
+
+def run_case(shape, size, engine, seed, track_memory):
+    project = GENERATORS[shape](size, seed=seed)
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    tasks = [Task.from_input_dict(task) for task in project["tasks"]]
+    load_seconds = time.perf_counter() - started
+    scheduler = BenchmarkScheduler(tasks, project["resources"], engine=engine, track_memory=track_memory)
+    scheduled = scheduler.schedule()
+    total_seconds = time.perf_counter() - started
+    peak = None
+    if track_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "shape": shape,
+        "size": size,
+        "engine": scheduler.engine,
+        "seed": seed,
+        "load_seconds": load_seconds,
+        "total_seconds": total_seconds,
+        "peak_memory_bytes": peak,
+        "phases": scheduler.phases,
+        "iterations": scheduler._steps,
+        "cycles_broken": scheduler.phase_results.get("cycles"),
+        "scheduled": len(scheduled),
+        "makespan": max((task.end_time for task in scheduled), default=0),
+        "total_reward": sum(task.actual_reward for task in scheduled),
+        "critical_path_length": scheduler.critical_path.length if scheduler.critical_path else None
+    }
+
+
+def run_benchmarks(shapes, sizes, engine, seed, repeat, track_memory):
+    cases = []
+    for shape in shapes:
+        for size in sizes:
+            runs = [run_case(shape, size, engine, seed, False) for _ in range(repeat)]
+            case = min(runs, key=lambda r: r["total_seconds"])
+            if track_memory:
+                # Measured in a separate run so tracing overhead does not distort the timings
+                memory_run = run_case(shape, size, engine, seed, True)
+                case["peak_memory_bytes"] = memory_run["peak_memory_bytes"]
+                for phase, stats in memory_run["phases"].items():
+                    case["phases"].setdefault(phase, {})["peak_memory_bytes"] = stats.get("peak_memory_bytes")
+            print(format_case(case), flush=True)
+            cases.append(case)
+    return cases
+
+
+def format_case(case):
+    phases = " ".join(f"{phase}={stats['seconds'] * 1000:.1f}ms" for phase, stats in case["phases"].items())
+    memory = ""
+    if case["peak_memory_bytes"] is not None:
+        memory = f" peak={case['peak_memory_bytes'] / 1e6:.1f}MB"
+    return (f"{case['shape']:>10} {case['size']:>7} {case['total_seconds']:8.3f}s{memory}"
+            f" iterations={case['iterations']} makespan={case['makespan']} reward={case['total_reward']:.1f}"
+            f" [{phases}]")
+
+
+def compare(cases, baseline_path):
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    previous = {(case["shape"], case["size"], case["engine"]): case for case in baseline["cases"]}
+    print(f"\nCompared with {baseline_path} ({baseline.get('label')}):")
+    for case in cases:
+        before = previous.get((case["shape"], case["size"], case["engine"]))
+        if before is None:
+            continue
+        ratio = case["total_seconds"] / before["total_seconds"] if before["total_seconds"] else float("inf")
+        print(f"{case['shape']:>10} {case['size']:>7} time x{ratio:.2f}"
+              f" makespan {before['makespan']} -> {case['makespan']}"
+              f" reward {before['total_reward']:.1f} -> {case['total_reward']:.1f}")
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler on synthetic projects")
+    parser.add_argument("--shapes", default=",".join(GENERATORS),
+                        help=f"comma-separated project shapes ({', '.join(GENERATORS)})")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated task counts, e.g. 10,1000,100000")
+    parser.add_argument("--engine", default=None, help="scheduler engine (default: config.toml)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--label", default=None, help="name of the results file (default: git revision)")
+    parser.add_argument("--compare", default=None, help="results file to compare against")
+    args = parser.parse_args(argv)
+
+    shapes = [shape for shape in args.shapes.split(",") if shape]
+    unknown = [shape for shape in shapes if shape not in GENERATORS]
+    if unknown:
+        parser.error(f"unknown shapes: {', '.join(unknown)}")
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger("src").setLevel(logging.WARNING)
+
+    cases = run_benchmarks(shapes, sizes, args.engine, args.seed, args.repeat, not args.no_memory)
+
+    revision = git_revision()
+    label = args.label or revision or datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    output = os.path.join(RESULTS_DIR, f"{label}.json")
+    with open(output, "w") as f:
+        json.dump({
+            "label": label,
+            "revision": revision,
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": cases
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+
+    if args.compare:
+        compare(cases, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+API cold-start benchmark: times `import main`, `create_app()` and the first
+`GET /api/v1/projects` in fresh interpreters, and lists which heavy modules
+were already loaded by then.
+
+    python -m benchmarks.startup --repeat 10
+    python -m benchmarks.startup --preload --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imports that should wait until their endpoints are used
+HEAVY_MODULES = ("numpy", "networkx", "PIL", "pygraphviz", "replicate", "src.scheduling.scheduler")
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+if {preload}:
+    main.preload()
+app = main.create_app()
+created = time.perf_counter()
+app.test_client().get('/api/v1/projects')
+served = time.perf_counter()
+print(json.dumps({{
+    "import_seconds": imported - started,
+    "create_app_seconds": created - imported,
+    "first_request_seconds": served - created,
+    "total_seconds": served - started,
+    "loaded": [name for name in {heavy!r} if name in sys.modules]
+}}))
+"""
+
+
+def probe(preload):
+    code = PROBE.format(preload=bool(preload), heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def top_imports(count, preload):
+    """The count slowest imports (cumulative microseconds) reported by -X importtime."""
+    code = "import main\n" + ("main.preload()\n" if preload else "") + "main.create_app()\n"
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                            text=True, check=True)
+    imports = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), name.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark API process startup")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters to time")
+    parser.add_argument("--preload", action="store_true", help="call main.preload() as [server] preload does")
+    parser.add_argument("--top", type=int, default=0, help="also list the slowest imports")
+    args = parser.parse_args(argv)
+
+    runs = [probe(args.preload) for _ in range(args.repeat)]
+    for key in ("import_seconds", "create_app_seconds", "first_request_seconds", "total_seconds"):
+        values = [run[key] for run in runs]
+        print(f"{key:>22} median={statistics.median(values) * 1000:7.1f}ms min={min(values) * 1000:7.1f}ms")
+    print(f"{'heavy modules loaded':>22} {', '.join(runs[-1]['loaded']) or 'none'}")
+
+    if args.top:
+        print("\nSlowest imports (cumulative):")
+        for cumulative, name in top_imports(args.top, args.preload):
+            print(f"{cumulative / 1000:8.1f}ms {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,36 @@
+import importlib
+import logging
 from flask import Flask, jsonify
 from flask_cors import CORS
 from api import api
 from src.config import CONFIG
 
+# Modules the API only imports when their endpoints are first used
+PRELOAD_MODULES = (
+    'src.scheduling.scheduler',
+    'src.scheduling.incremental',
+    'src.scheduling.search',
+    'src.visualization.dependency_graph',
+    'src.analysis.llm_analyzer',
+    'replicate'
+)
+
+def preload():
+    """
+    Import the lazily loaded modules now. Nothing is connected or started,
+    so this is safe before a server forks its workers.
+    """
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            logging.getLogger(__name__).warning("Could not preload %s: %s", name, e)
+
 def create_app():
+    logging.basicConfig(level=logging.INFO)
+    if CONFIG.server_preload:
+        preload()
+
     app = Flask(__name__)
     CORS(app)  # This will enable CORS for all routes
 
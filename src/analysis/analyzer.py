@@ -0,0 +1,32 @@
+from ..config import CONFIG
+
+ANALYSIS_MODES = ('llm', 'llm_async', 'local')
+
+
+class TaskAnalyzer:
+    """
+    Interface shared by all task analyzers. analyze_batch attaches an
+    llm_analysis dict (estimated_complexity, potential_risks, required_skills,
+    suggested_priority) to each task and returns the tasks, or None when the
+    analysis failed as a whole. provisional is the number of tasks of the
+    last batch that only got stand-in estimates a later run will replace.
+    """
+    provisional = 0
+
+    def analyze_batch(self, tasks, on_task_analyzed=None):
+        raise NotImplementedError
+
+
+def create_analyzer(mode=None):
+    """Build the analyzer selected by [analysis] mode in config.toml."""
+    mode = mode or CONFIG.get('analysis', {}).get('mode', 'llm')
+    if mode == 'llm':
+        from .llm_analyzer import LLMAnalyzer
+        return LLMAnalyzer()
+    if mode == 'llm_async':
+        from .llm_analyzer import AsyncLLMAnalyzer
+        return AsyncLLMAnalyzer()
+    if mode == 'local':
+        from .heuristic_analyzer import HeuristicAnalyzer
+        return HeuristicAnalyzer()
+    raise ValueError(f"Unknown analysis mode: {mode}. Expected one of {', '.join(ANALYSIS_MODES)}")
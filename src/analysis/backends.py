@@ -0,0 +1,60 @@
+import hashlib
+import json
+import re
+import time
+
+TASK_PATTERN = re.compile(r"Task (\d+):\nTitle: (.*?)\nDescription: (.*?)\n\n", re.DOTALL)
+
+
+class ReplicateBackend:
+    """Runs prompts against a model hosted on Replicate."""
+    name = "replicate"
+
+    def run(self, model, input_data):
+        import replicate  # heavy; only needed once a prompt is actually sent
+        return replicate.run(model, input=input_data)
+
+
+class LocalBackend:
+    """
+    Offline stand-in for the hosted model. Answers the analysis prompt with
+    deterministic values derived from each task's text and streams the JSON
+    back in small pieces, the way the hosted model does.
+    """
+    name = "local"
+
+    def __init__(self, latency=0.0, piece_size=64):
+        self.latency = latency
+        self.piece_size = piece_size
+
+    def run(self, model, input_data):
+        if self.latency:
+            time.sleep(self.latency)
+        response = json.dumps(self._analyze_prompt(input_data["prompt"]), indent=2)
+        return (response[i:i + self.piece_size] for i in range(0, len(response), self.piece_size))
+
+    @staticmethod
+    def _analyze_prompt(prompt):
+        results = {}
+        for number, title, description in TASK_PATTERN.findall(prompt):
+            digest = hashlib.sha256(f"{title}\n{description}".encode('utf-8')).digest()
+            results[f"Task {number}"] = {
+                "estimatedComplexity": 1 + digest[0] % 10,
+                "potentialRisks": ["Scope creep", "Underestimated effort", "Unclear requirements"],
+                "requiredSkills": ["Planning", "Communication", "Domain knowledge"],
+                "suggestedPriority": ("low", "medium", "high")[digest[1] % 3]
+            }
+        return results
+
+
+BACKENDS = {
+    ReplicateBackend.name: ReplicateBackend,
+    LocalBackend.name: LocalBackend,
+}
+
+
+def get_backend(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown LLM backend: {name}")
@@ -0,0 +1,100 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """
+    Size-bounded LRU cache of LLM analysis results persisted as a JSON file.
+    Entries are keyed by a content hash, so an edited task simply misses.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @classmethod
+    def shared(cls, path, max_entries=10000):
+        """Return one cache instance per file so counters survive across requests."""
+        with cls._instances_lock:
+            cache = cls._instances.get(path)
+            if cache is None:
+                cache = cls._instances[path] = cls(path, max_entries)
+            return cache
+
+    @classmethod
+    def all_stats(cls):
+        """Stats of every shared cache in this process, by path."""
+        with cls._instances_lock:
+            caches = dict(cls._instances)
+        return {path: cache.stats() for path, cache in caches.items()}
+
+    @staticmethod
+    def make_key(model, prompt_version, title, description):
+        payload = json.dumps([model, prompt_version, title, description], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key, count=True):
+        """Cached value for key or None; count=False leaves hits and misses as they are."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return dict(value)
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = dict(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        with self._lock:
+            data = list(self._entries.items())
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_file, self.path)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_entries": self.max_entries
+            }
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable analysis cache {self.path}: {e}")
+            return
+        # Stored oldest first, so replaying keeps the LRU order
+        for key, value in data[-self.max_entries:]:
+            self._entries[key] = value
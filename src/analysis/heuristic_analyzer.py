@@ -0,0 +1,62 @@
+import math
+from collections import Counter
+from .analyzer import TaskAnalyzer
+
+HIGH_PRIORITY_WORDS = ('critical', 'urgent', 'blocker', 'security', 'deadline', 'launch', 'deploy', 'production')
+LOW_PRIORITY_WORDS = ('optional', 'nice to have', 'cleanup', 'polish', 'documentation', 'minor')
+COMPLEX_WORDS = ('architecture', 'integration', 'migration', 'design', 'algorithm', 'security',
+                 'performance', 'distributed', 'optimi', 'infrastructure')
+
+
+class HeuristicAnalyzer(TaskAnalyzer):
+    """
+    Local, deterministic stand-in for the LLM. Complexity grows with required
+    time, description length, technical vocabulary and the number of
+    dependencies; priority follows how many tasks are waiting on this one and
+    a few urgency keywords. Runs in microseconds per task with no I/O.
+    """
+
+    def analyze_batch(self, tasks, on_task_analyzed=None):
+        dependents = self.dependent_counts(tasks)
+        for task in tasks:
+            task.llm_analysis = self.estimate(task, dependents[task.id])
+            if on_task_analyzed:
+                on_task_analyzed(task)
+        return tasks
+
+    @staticmethod
+    def dependent_counts(tasks):
+        return Counter(dep for task in tasks for dep in set(task.dependencies))
+
+    @staticmethod
+    def estimate(task, dependents=0):
+        text = f"{task.title or ''} {task.description or ''}".lower()
+        required_time = task.required_time or 0
+
+        complexity = 1 + min(4, int(math.log2(1 + required_time)))
+        complexity += min(2, len(text.split()) // 25)
+        complexity += min(2, sum(word in text for word in COMPLEX_WORDS))
+        complexity += min(1, len(task.dependencies) // 3)
+        complexity = max(1, min(10, complexity))
+
+        if dependents >= 3 or any(word in text for word in HIGH_PRIORITY_WORDS):
+            suggested_priority = "high"
+        elif dependents == 0 and any(word in text for word in LOW_PRIORITY_WORDS):
+            suggested_priority = "low"
+        else:
+            suggested_priority = "medium"
+
+        risks = []
+        if dependents:
+            risks.append(f"Delays block {dependents} downstream task(s)")
+        if len(task.dependencies) > 1:
+            risks.append(f"Waits on {len(task.dependencies)} upstream task(s)")
+        if required_time >= 5:
+            risks.append(f"Long duration ({required_time} time units)")
+
+        return {
+            "estimated_complexity": complexity,
+            "potential_risks": risks or ["No data provided"],
+            "required_skills": ["No data provided"],
+            "suggested_priority": suggested_priority
+        }
@@ -1,27 +1,31 @@
-import replicate
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from ..models.task import Task
-import json
 from ..config import CONFIG
-import logging
+from .analyzer import TaskAnalyzer
+from .backends import get_backend
+from .heuristic_analyzer import HeuristicAnalyzer
+from .cache import AnalysisCache
+from .stream_parser import iter_task_entries
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class LLMAnalyzer:
-    def analyze_batch(self, tasks: List[Task]) -> List[Task]:
-        try:
-            logger.info(f"Analyzing {len(tasks)} tasks")
-            system_prompt = (
-                "You are an AI assistant that analyzes task descriptions and provides detailed insights. "
-                "Your responses must be in valid JSON format, exactly matching the structure provided."
-            )
-            user_prompt = "Analyze the following tasks:\n\n"
-            
-            for i, task in enumerate(tasks, 1):
-                user_prompt += f"Task {i}:\nTitle: {task.title}\nDescription: {task.description}\n\n"
-            
-            user_prompt += """For each task, provide the following information:
+# Bump whenever the prompt or the result normalisation changes so cached
+# analyses produced by the old prompt are no longer reused.
+PROMPT_VERSION = 1
+
+# Rough size of one task's JSON answer, used to budget chunks
+OUTPUT_TOKENS_PER_TASK = 150
+
+SYSTEM_PROMPT = (
+    "You are an AI assistant that analyzes task descriptions and provides detailed insights. "
+    "Your responses must be in valid JSON format, exactly matching the structure provided."
+)
+
+INSTRUCTIONS = """For each task, provide the following information:
 1. Estimated complexity (integer from 1 to 10)
 2. Potential risks (list exactly 3 risks)
 3. Required skills (list exactly 3 skills)
@@ -45,52 +49,196 @@ Respond in JSON format using the following structure:
 
 Ensure all fields are filled for each task and maintain this exact JSON structure. Do not include any text before or after the JSON object."""
 
-            input_data = {
-                "system_prompt": system_prompt,
-                "prompt": user_prompt,
-                "max_new_tokens": CONFIG['llm']['max_tokens'],
-                "temperature": 0.1,  # Lower temperature for more consistent output
-                "prompt_template": "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
-            }
-
-            output = replicate.run(
-                CONFIG['llm']['model'],
-                input=input_data
+PROMPT_TEMPLATE = "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{prompt}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+
+class LLMAnalyzer(TaskAnalyzer):
+    def __init__(self, backend=None):
+        llm_config = CONFIG['llm']
+        self.model = llm_config['model']
+        self.backend = backend or get_backend(llm_config.get('backend', 'replicate'))
+        self.max_tokens = llm_config['max_tokens']
+        self.chunk_token_budget = min(llm_config.get('chunk_token_budget', self.max_tokens), self.max_tokens)
+        self.max_workers = max(1, llm_config.get('max_workers', 4))
+        self.max_retries = llm_config.get('max_retries', 2)
+        self.retry_backoff = llm_config.get('retry_backoff', 1.0)
+        self.cache = None
+        if llm_config.get('cache_enabled', True):
+            self.cache = AnalysisCache.shared(
+                llm_config.get('cache_path', 'output/llm_cache.json'),
+                llm_config.get('cache_max_entries', 10000)
             )
-            response_text = "".join(output).strip()
-            logger.info(f"Received analysis results for {len(tasks)} tasks")
-            logger.info(f"Analysis results: {response_text}")
-            
+
+    def analyze_batch(self, tasks: List[Task], on_task_analyzed=None) -> List[Task]:
+        """
+        Attach an llm_analysis to every task. on_task_analyzed, if given, is
+        called with each task as soon as its analysis is available, possibly
+        from a worker thread, while the rest of the batch is still streaming.
+        """
+        if self.cache is None:
+            return self._request_analysis(tasks, on_task_analyzed)
+
+        pending = []
+        for task in tasks:
+            cached = self.cache.get(self._cache_key(task))
+            if cached is not None:
+                task.llm_analysis = cached
+                if on_task_analyzed:
+                    on_task_analyzed(task)
+            else:
+                pending.append(task)
+        logger.info(f"Analysis cache: {len(tasks) - len(pending)} hit(s), {len(pending)} miss(es)")
+
+        if pending and self._analyze_missed(pending, on_task_analyzed) is None:
+            return None
+        return tasks
+
+    def _analyze_missed(self, tasks: List[Task], on_task_analyzed=None) -> List[Task]:
+        """Request analyses for tasks the cache missed and persist the cache with them."""
+        if self._request_analysis(tasks, on_task_analyzed) is None:
+            return None
+        try:
+            self.cache.save()
+        except OSError as e:
+            logger.warning(f"Could not persist analysis cache: {e}")
+        return tasks
+
+    def _cache_key(self, task):
+        return AnalysisCache.make_key(f"{self.backend.name}:{self.model}", PROMPT_VERSION, task.title, task.description)
+
+    def _request_analysis(self, tasks: List[Task], on_task_analyzed=None) -> List[Task]:
+        """
+        Analyze tasks in token-budgeted chunks on a bounded worker pool. A
+        chunk that still fails after its retries only falls back to default
+        analyses for its own tasks; None is returned only if every chunk failed.
+        """
+        chunks = self._chunk_tasks(tasks)
+        logger.info(f"Analyzing {len(tasks)} tasks in {len(chunks)} chunk(s)")
+        if len(chunks) == 1:
+            succeeded = [self._analyze_chunk_with_retry(chunks[0], on_task_analyzed)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                succeeded = list(executor.map(
+                    lambda chunk: self._analyze_chunk_with_retry(chunk, on_task_analyzed), chunks))
+
+        if not any(succeeded):
+            return None
+        return tasks
+
+    def _chunk_tasks(self, tasks):
+        chunks = []
+        current = []
+        used = self._estimate_tokens(SYSTEM_PROMPT + INSTRUCTIONS)
+        base = used
+        for task in tasks:
+            cost = self._estimate_tokens(f"{task.title}{task.description}") + OUTPUT_TOKENS_PER_TASK
+            if current and used + cost > self.chunk_token_budget:
+                chunks.append(current)
+                current = []
+                used = base
+            current.append(task)
+            used += cost
+        if current:
+            chunks.append(current)
+        return chunks
+
+    @staticmethod
+    def _estimate_tokens(text):
+        # About four characters per token for English prose
+        return len(text) // 4 + 1
+
+    def _analyze_chunk_with_retry(self, chunk, on_task_analyzed=None):
+        remaining = chunk
+        for attempt in range(self.max_retries + 1):
             try:
-                analysis_results = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON decode error: {e}")
-                return None
-            for i, task in enumerate(tasks, 1):
-                task_key = f"Task {i}"
-                task_analysis = analysis_results.get(task_key, {})
-                
-                if task_analysis:
-                    task.llm_analysis = {
-                        "estimated_complexity": task_analysis.get("estimatedComplexity", 5),
-                        "potential_risks": task_analysis.get("potentialRisks", ["No data provided"]),
-                        "required_skills": task_analysis.get("requiredSkills", ["No data provided"]),
-                        "suggested_priority": task_analysis.get("suggestedPriority", "medium").lower()
-                    }
-                else:
-                    logger.warning(f"No analysis found for {task_key}")
-                    task.llm_analysis = {
-                        "estimated_complexity": 5,
-                        "potential_risks": ["No data provided"],
-                        "required_skills": ["No data provided"],
-                        "suggested_priority": "medium"
-                    }
-
-            return tasks
+                remaining = self._analyze_chunk(remaining, on_task_analyzed)
+                if not remaining:
+                    return True
+                error = "stream interrupted"
+            except Exception as e:
+                error = e
+                if attempt == self.max_retries:
+                    logger.error(f"Error analyzing tasks: {e}", exc_info=True)
+            if attempt < self.max_retries:
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning(f"Analysis of {len(remaining)} task(s) failed ({error}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        for task in remaining:
+            task.llm_analysis = self._default_analysis()
+            if on_task_analyzed:
+                on_task_analyzed(task)
+        return len(remaining) < len(chunk)
+
+    def _analyze_chunk(self, chunk, on_task_analyzed=None):
+        """
+        Stream the model's answer for one chunk and attach each task's analysis
+        as soon as its JSON entry is complete. If the stream breaks off after
+        some entries arrived, those results are kept and the unanswered tasks
+        are returned for a retry. Tasks the model simply skipped get default
+        analyses. Raises when the answer contains no usable entry at all.
+        """
+        user_prompt = "Analyze the following tasks:\n\n"
+        for i, task in enumerate(chunk, 1):
+            user_prompt += f"Task {i}:\nTitle: {task.title}\nDescription: {task.description}\n\n"
+        user_prompt += INSTRUCTIONS
 
+        input_data = {
+            "system_prompt": SYSTEM_PROMPT,
+            "prompt": user_prompt,
+            "max_new_tokens": self.max_tokens,
+            "temperature": 0.1,  # Lower temperature for more consistent output
+            "prompt_template": PROMPT_TEMPLATE
+        }
+
+        tasks_by_key = {f"Task {i}": task for i, task in enumerate(chunk, 1)}
+        analyzed = set()
+        try:
+            output = self.backend.run(self.model, input_data)
+            for task_key, task_analysis in iter_task_entries(output):
+                task = tasks_by_key.get(task_key)
+                if task is None or task_key in analyzed or not isinstance(task_analysis, dict) or not task_analysis:
+                    continue
+                task.llm_analysis = self._normalize_analysis(task_analysis)
+                analyzed.add(task_key)
+                if self.cache is not None:
+                    self.cache.put(self._cache_key(task), task.llm_analysis)
+                if on_task_analyzed:
+                    on_task_analyzed(task)
         except Exception as e:
-            logger.error(f"Error analyzing tasks: {e}", exc_info=True)
-            return None
+            if not analyzed:
+                raise
+            logger.warning(f"Analysis stream interrupted after {len(analyzed)} of {len(chunk)} tasks: {e}")
+            return [task for task_key, task in tasks_by_key.items() if task_key not in analyzed]
+
+        if not analyzed:
+            raise ValueError("Model output contained no task analyses")
+        logger.info(f"Received analysis results for {len(analyzed)} of {len(chunk)} tasks")
+
+        for task_key, task in tasks_by_key.items():
+            if task_key not in analyzed:
+                logger.warning(f"No analysis found for {task_key}")
+                task.llm_analysis = self._default_analysis()
+                if on_task_analyzed:
+                    on_task_analyzed(task)
+        return []
+
+    @staticmethod
+    def _normalize_analysis(task_analysis):
+        return {
+            "estimated_complexity": task_analysis.get("estimatedComplexity", 5),
+            "potential_risks": task_analysis.get("potentialRisks", ["No data provided"]),
+            "required_skills": task_analysis.get("requiredSkills", ["No data provided"]),
+            "suggested_priority": task_analysis.get("suggestedPriority", "medium").lower()
+        }
+
+    @staticmethod
+    def _default_analysis():
+        return {
+            "estimated_complexity": 5,
+            "potential_risks": ["No data provided"],
+            "required_skills": ["No data provided"],
+            "suggested_priority": "medium"
+        }
 
     @staticmethod
     def _parse_list(input_string):
@@ -113,4 +261,60 @@ Ensure all fields are filled for each task and maintain this exact JSON structur
         try:
             return int(value)
         except ValueError:
-            return default
\ No newline at end of file
+            return default
+
+
+class AsyncLLMAnalyzer(TaskAnalyzer):
+    """
+    Never waits on the model. Cached LLM analyses are used where available and
+    the heuristic estimator fills in the rest, then the model runs in a
+    background thread on copies of the missed tasks so that their results land
+    in the cache for the next run without changing the schedule in progress.
+    """
+    _in_flight = set()
+    _in_flight_lock = threading.Lock()
+
+    def __init__(self, llm_analyzer=None, fallback=None):
+        self.llm_analyzer = llm_analyzer or LLMAnalyzer()
+        self.fallback = fallback or HeuristicAnalyzer()
+
+    def analyze_batch(self, tasks: List[Task], on_task_analyzed=None) -> List[Task]:
+        cache = self.llm_analyzer.cache
+        dependents = self.fallback.dependent_counts(tasks)
+        backfill = {}
+        for task in tasks:
+            key = self.llm_analyzer._cache_key(task)
+            cached = cache.get(key) if cache is not None else None
+            if cached is not None:
+                task.llm_analysis = cached
+            else:
+                task.llm_analysis = self.fallback.estimate(task, dependents[task.id])
+                backfill[key] = Task(task.id, task.title, task.description)
+            if on_task_analyzed:
+                on_task_analyzed(task)
+
+        self.provisional = len(backfill) if cache is not None else 0
+        if backfill and cache is not None:
+            self._start_backfill(backfill)
+        return tasks
+
+    def _start_backfill(self, backfill):
+        with self._in_flight_lock:
+            backfill = {key: task for key, task in backfill.items() if key not in self._in_flight}
+            self._in_flight.update(backfill)
+        if not backfill:
+            return
+
+        def run():
+            try:
+                # Already counted as misses; another run may have filled some since
+                cache = self.llm_analyzer.cache
+                missed = [task for key, task in backfill.items() if cache.get(key, count=False) is None]
+                if missed:
+                    self.llm_analyzer._analyze_missed(missed)
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight.difference_update(backfill)
+
+        logger.info(f"Backfilling LLM analysis for {len(backfill)} task(s) in the background")
+        threading.Thread(target=run, name="llm-backfill", daemon=True).start()
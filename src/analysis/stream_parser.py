@@ -0,0 +1,110 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskEntryParser:
+    """
+    Incremental parser for a streamed JSON object of the form
+    {"Task 1": {...}, "Task 2": {...}}. Text is fed in arbitrary pieces and
+    each top-level member is returned as soon as its value is complete, so a
+    stream that is cut off still yields every entry finished before the cut.
+    Anything before the opening brace (e.g. a chatty preamble) is ignored:
+    the object starts at the first brace followed by a quoted key, and an
+    object that yields no entry is taken as preamble too.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self._opening = None  # position of a brace at depth 0 not yet known to open the object
+        self._found = False  # whether the current object has yielded an entry
+        self._done = False
+
+    def feed(self, text):
+        """Consume more text and return the (key, value) pairs it completed."""
+        if self._done:
+            return []
+        self._buffer += text
+        entries = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                if self._opening is None:
+                    if char == '{':
+                        self._opening = i
+                elif char == '"':
+                    # The first key is quoted, so the brace opens the object
+                    self._depth = 1
+                    self._member_start = self._opening + 1
+                    self._opening = None
+                    self._in_string = True
+                elif not char.isspace():
+                    self._opening = None
+                    continue  # look at this character again, it may be the brace
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1:
+                    # A nested value just closed: the member is complete
+                    self._emit(buffer[self._member_start:i + 1], entries)
+                    self._member_start = None
+                elif self._depth == 0:
+                    if self._member_start is not None:
+                        self._emit(buffer[self._member_start:i], entries)
+                        self._member_start = None
+                    if self._found or entries:
+                        self._done = True
+                        break
+                    # Nothing usable in it, so it was part of the preamble
+            elif char == ',' and self._depth == 1:
+                if self._member_start is not None:
+                    self._emit(buffer[self._member_start:i], entries)
+                self._member_start = i + 1
+            i += 1
+
+        # Drop text that can no longer be part of an unfinished member
+        keep_from = next((start for start in (self._member_start, self._opening) if start is not None), i)
+        self._buffer = buffer[keep_from:]
+        self._pos = i - keep_from
+        if self._member_start is not None:
+            self._member_start -= keep_from
+        if self._opening is not None:
+            self._opening -= keep_from
+        self._found = self._found or bool(entries)
+        return entries
+
+    @staticmethod
+    def _emit(member_text, entries):
+        if not member_text.strip():
+            return
+        try:
+            member = json.loads("{" + member_text + "}")
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping malformed analysis entry: {e}")
+            return
+        entries.extend(member.items())
+
+
+def iter_task_entries(pieces):
+    """Yield (key, value) pairs from a stream of JSON text pieces as they complete."""
+    parser = TaskEntryParser()
+    for piece in pieces:
+        yield from parser.feed(piece)
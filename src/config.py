@@ -28,5 +28,9 @@ class Config:
     def server_debug(self):
         return bool(self._config['server']['debug'])
 
+    @property
+    def server_preload(self):
+        return bool(self._config['server'].get('preload', False))
+
 # Create a global instance of the Config class
 CONFIG = Config()
\ No newline at end of file
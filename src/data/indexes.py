@@ -0,0 +1,149 @@
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+DIRECTIONS = ('upstream', 'downstream', 'both')
+
+
+class IntervalIndex:
+    """
+    Static index over half-open [start, end) intervals, sorted by start. The
+    largest end of every block of BLOCK_SIZE intervals is kept, so a window
+    query skips whole blocks that finish before the window opens and costs
+    O(log n + blocks + matches) instead of a scan over every interval.
+    """
+    BLOCK_SIZE = 64
+
+    def __init__(self, intervals):
+        """intervals: iterable of (start, end, value)."""
+        ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+        self.starts = [interval[0] for interval in ordered]
+        self.ends = [interval[1] for interval in ordered]
+        self.values = [interval[2] for interval in ordered]
+        self.block_max_end = [
+            max(self.ends[i:i + self.BLOCK_SIZE]) for i in range(0, len(self.ends), self.BLOCK_SIZE)
+        ]
+
+    def __len__(self):
+        return len(self.values)
+
+    def overlapping(self, t0=None, t1=None):
+        """
+        Values of the intervals that overlap [t0, t1), in start order. None
+        leaves that side of the window open, and t0 == t1 asks for the
+        intervals running at t0.
+        """
+        if t1 is None:
+            hi = len(self.starts)
+        elif t0 is not None and t1 <= t0:
+            hi = bisect_right(self.starts, t0)
+        else:
+            hi = bisect_left(self.starts, t1)
+        if t0 is None:
+            return self.values[:hi]
+
+        starts, ends, values = self.starts, self.ends, self.values
+        matches = []
+        for block, block_end in enumerate(self.block_max_end):
+            first = block * self.BLOCK_SIZE
+            if first >= hi:
+                break
+            if block_end < t0:
+                continue
+            for i in range(first, min(hi, first + self.BLOCK_SIZE)):
+                # A zero-length interval at t0 is still inside the window
+                if ends[i] > t0 or starts[i] >= t0:
+                    matches.append(values[i])
+        return matches
+
+
+class AdjacencyIndex:
+    """
+    Dependency graph as integer adjacency lists, for neighbourhood queries
+    that only touch the part of the graph they return. Dependencies on
+    unknown tasks are left out, as they are when scheduling.
+    """
+
+    def __init__(self, tasks):
+        """tasks: project input task dicts (id, title, dependencies)."""
+        self.ids = [task['id'] for task in tasks]
+        self.titles = [task.get('title') for task in tasks]
+        self.position = {task_id: i for i, task_id in enumerate(self.ids)}
+        self.predecessors = [[] for _ in self.ids]
+        self.successors = [[] for _ in self.ids]
+        for i, task in enumerate(tasks):
+            for dep in dict.fromkeys(task.get('dependencies', [])):
+                j = self.position.get(dep)
+                if j is not None:
+                    self.predecessors[i].append(j)
+                    self.successors[j].append(i)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def neighbourhood(self, task_id, depth, direction='both'):
+        """
+        [(position, distance)] of the tasks at most depth hops from task_id,
+        nearest first and in project order within a distance. upstream
+        follows dependencies, downstream follows dependents.
+        """
+        if direction not in DIRECTIONS:
+            raise ValueError(f"Unknown direction: {direction}")
+        start = self.position.get(task_id)
+        if start is None:
+            raise ValueError(f"Unknown task: {task_id}")
+        adjacency = []
+        if direction != 'downstream':
+            adjacency.append(self.predecessors)
+        if direction != 'upstream':
+            adjacency.append(self.successors)
+
+        distance = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if distance[node] == depth:
+                continue
+            for neighbours in adjacency:
+                for other in neighbours[node]:
+                    if other not in distance:
+                        distance[other] = distance[node] + 1
+                        queue.append(other)
+        return sorted(distance.items(), key=lambda item: (item[1], item[0]))
+
+    def edges_to_earlier(self, page, rank=None):
+        """
+        Edges between the page's tasks and tasks ranked before them in the same
+        result, so paging through a result returns each of its edges once.
+        rank maps position -> place in the result; None means the result is
+        every task in project order.
+        """
+        rank_of = rank.get if rank is not None else (lambda node, default: node)
+        edges = []
+        for node in page:
+            own_rank = rank_of(node, None)
+            for dep in self.predecessors[node]:
+                if rank_of(dep, own_rank) < own_rank or dep == node:
+                    edges.append((self.ids[dep], self.ids[node]))
+            for dependent in self.successors[node]:
+                if rank_of(dependent, own_rank) < own_rank:
+                    edges.append((self.ids[node], self.ids[dependent]))
+        return edges
+
+class ScheduleIndex:
+    """Interval indexes over the tasks of a schedule result, overall and per resource."""
+
+    def __init__(self, scheduled_tasks):
+        """scheduled_tasks: task output dicts (start_time, end_time, resources)."""
+        by_resource = {}
+        for task in scheduled_tasks:
+            for resource in dict.fromkeys(task['resources']):
+                by_resource.setdefault(resource, []).append((task['start_time'], task['end_time'], task))
+        self.tasks = IntervalIndex((task['start_time'], task['end_time'], task) for task in scheduled_tasks)
+        self.resources = {resource: IntervalIndex(intervals) for resource, intervals in by_resource.items()}
+
+    def query(self, t0=None, t1=None, resource=None):
+        """Task dicts active in [t0, t1) (see IntervalIndex.overlapping), optionally only those using resource."""
+        if resource is None:
+            return self.tasks.overlapping(t0, t1)
+        index = self.resources.get(resource)
+        return index.overlapping(t0, t1) if index is not None else []
@@ -1,5 +1,12 @@
 import json
+from .project_store import ProjectStore, DEFAULT_PROJECT_ID
 
 def load_project_data(file_path):
     with open(file_path, 'r') as file:
-        return json.load(file)
\ No newline at end of file
+        return json.load(file)
+
+def load_project(project_id=DEFAULT_PROJECT_ID):
+    project_data = ProjectStore.instance().get(project_id)
+    if project_data is None:
+        raise FileNotFoundError(f"Project not found: {project_id}")
+    return project_data
@@ -0,0 +1,155 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from ..config import CONFIG
+
+DEFAULT_PROJECT_ID = "default"
+PROJECT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+RESERVED_PROJECT_IDS = {"list"}
+
+
+def validate_project_id(project_id):
+    if not project_id or not PROJECT_ID_PATTERN.match(project_id) or project_id in RESERVED_PROJECT_IDS:
+        raise ValueError(f"Invalid project id: {project_id!r}")
+    return project_id
+
+
+def project_output_path(key, project_id=DEFAULT_PROJECT_ID):
+    """Per-project location of an output file from [paths]; the default project keeps the configured path."""
+    path = CONFIG['paths'][key]
+    if project_id == DEFAULT_PROJECT_ID:
+        return path
+    return os.path.join(os.path.dirname(path), validate_project_id(project_id), os.path.basename(path))
+
+
+class VersionConflict(Exception):
+    pass
+
+
+class ProjectStore:
+    """
+    Projects keyed by id in an embedded SQLite database. Each write is a single
+    transaction that bumps the project's version, so concurrent writers never
+    interleave. Parsed projects are cached in memory and only re-read when the
+    stored version changes, so a read is one indexed lookup, not a JSON parse.
+    Returned project dicts are shared with the cache and must not be mutated.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS projects ("
+            " id TEXT PRIMARY KEY,"
+            " data TEXT NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " task_count INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+        self._cache = {}  # project_id -> (version, data)
+
+    @classmethod
+    def instance(cls):
+        """Shared store for this process; SQLite connections must not cross a fork."""
+        db_path = CONFIG['paths'].get('project_db', 'input/projects.db')
+        key = (db_path, os.getpid())
+        with cls._instances_lock:
+            store = cls._instances.get(key)
+            if store is None:
+                store = cls._instances[key] = cls(db_path)
+                store._import_legacy_input(CONFIG['paths'].get('project_input'))
+            return store
+
+    def get(self, project_id):
+        return self.get_with_version(project_id)[1]
+
+    def get_with_version(self, project_id):
+        """(version, data) of a project, or (None, None); pass the version to put to update only that version."""
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if row is None:
+                self._cache.pop(project_id, None)
+                return None, None
+            cached = self._cache.get(project_id)
+            if cached is not None and cached[0] == row[0]:
+                return cached
+            row = self._conn.execute("SELECT version, data FROM projects WHERE id = ?", (project_id,)).fetchone()
+            if row is None:
+                return None, None
+            data = json.loads(row[1])
+            self._cache[project_id] = (row[0], data)
+            return row[0], data
+
+    def version(self, project_id):
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM projects WHERE id = ?", (project_id,)).fetchone()
+            return row[0] if row else None
+
+    def put(self, project_id, data, expected_version=None):
+        """
+        Atomically create or replace a project and return its new version.
+        With expected_version, raise VersionConflict instead if the stored
+        version is a different one by then.
+        """
+        validate_project_id(project_id)
+        encoded = json.dumps(data, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT version FROM projects WHERE id = ?", (project_id,)).fetchone()
+                if expected_version is not None and (row[0] if row else None) != expected_version:
+                    raise VersionConflict(f"Project {project_id} was changed by another request; reload and retry")
+                version = (row[0] if row else 0) + 1
+                self._conn.execute(
+                    "INSERT INTO projects (id, data, version, task_count, updated_at) VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT(id) DO UPDATE SET data = excluded.data, version = excluded.version,"
+                    " task_count = excluded.task_count, updated_at = excluded.updated_at",
+                    (project_id, encoded, version, len(data.get('tasks', [])), time.time())
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._cache[project_id] = (version, json.loads(encoded))
+            return version
+
+    def delete(self, project_id):
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+            self._cache.pop(project_id, None)
+            return cursor.rowcount > 0
+
+    def list(self, offset=0, limit=50):
+        """Return (summaries, total) for one page of projects ordered by id."""
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(*) FROM projects").fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT id, version, task_count, updated_at FROM projects ORDER BY id LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        summaries = [
+            {"id": row[0], "version": row[1], "task_count": row[2], "updated_at": row[3]}
+            for row in rows
+        ]
+        return summaries, total
+
+    def _import_legacy_input(self, path):
+        """Seed the default project from the single-file project input on first use."""
+        if not path or not os.path.exists(path) or self.version(DEFAULT_PROJECT_ID) is not None:
+            return
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.put(DEFAULT_PROJECT_ID, data)
@@ -0,0 +1,143 @@
+"""
+Encoding of schedule and Gantt documents: a document is a dict whose bulk is
+one list (scheduled_tasks, tasks). Files are written as JSON with the list's
+items one per line, so a reader can stream items without parsing the whole
+file. orjson and msgpack are used when installed.
+"""
+import json
+import os
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = 'application/json'
+NDJSON = 'application/x-ndjson'
+MSGPACK = 'application/msgpack'
+
+
+def _default(value):
+    # numpy scalars and similar
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+def dumps(obj):
+    """Compact JSON as bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, separators=(',', ':'), default=_default).encode('utf-8')
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def mimetypes():
+    """Encodings that can be served, preferred first."""
+    return [JSON, NDJSON] + ([MSGPACK] if msgpack is not None else [])
+
+
+def encode(obj, mimetype=JSON):
+    if mimetype == MSGPACK and msgpack is not None:
+        return msgpack.packb(obj, use_bin_type=True, default=_default)
+    if mimetype == JSON:
+        return dumps(obj)
+    raise ValueError(f"Unsupported encoding: {mimetype}")
+
+
+def iter_ndjson(header, items):
+    """The header, then one item per line."""
+    yield dumps(header) + b'\n'
+    for item in items:
+        yield dumps(item) + b'\n'
+
+
+def iter_document(header, list_key, items):
+    """
+    JSON chunks of header plus list_key: items, with the items last and one
+    per line. items may be any iterable, so a document is never built whole.
+    """
+    head = dumps(header)
+    yield head[:-1] + (b',' if header else b'') + dumps(list_key) + b':[\n'
+    previous = None
+    for item in items:
+        if previous is not None:
+            yield previous + b',\n'
+        previous = dumps(item)
+    if previous is not None:
+        yield previous + b'\n'
+    yield b']}\n'
+
+
+def write_document(path, header, list_key, items, hasher=None):
+    """
+    Stream the document to path, replacing any previous file atomically.
+    Each writer uses its own temp file, so concurrent writes of the same path
+    never interfere; the last one to finish wins. hasher (e.g. a
+    hashlib.sha256()), if given, is updated with every byte written.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            for chunk in iter_document(header, list_key, items):
+                f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def read_document(path):
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def read_header(path, list_key):
+    """Everything in the document at path except list_key, without reading the items."""
+    with open(path, 'rb') as f:
+        first = f.readline()
+        marker = dumps(list_key) + b':['
+        if first.rstrip().endswith(marker):
+            header = first.rstrip()[:-len(marker)].rstrip(b',')
+            return loads(header + b'}')
+        f.seek(0)
+        document = loads(f.read())
+    document.pop(list_key, None)
+    return document
+
+
+def iter_items(path, list_key):
+    """
+    Yield the items of list_key one by one. Files written by write_document
+    are read a line at a time; anything else is parsed whole first.
+    """
+    with open(path, 'rb') as f:
+        first = f.readline()
+        if first.rstrip().endswith(dumps(list_key) + b':['):
+            for line in f:
+                line = line.rstrip()
+                if line == b']}':
+                    return
+                yield loads(line.rstrip(b','))
+            return
+        f.seek(0)
+        document = loads(f.read())
+    yield from document.get(list_key, [])
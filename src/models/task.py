@@ -1,4 +1,16 @@
+def _copy_resources(resources):
+    """Required resources are a list of names (one unit each) or a {name: units} mapping."""
+    return dict(resources) if isinstance(resources, dict) else list(resources)
+
+
 class Task:
+    # Fixed attribute layout keeps per-task memory small on very large projects
+    __slots__ = (
+        'id', 'title', 'description', 'required_time', 'dependencies', 'required_resources',
+        'base_reward', 'reward_decay_factor', 'llm_analysis', 'current_priority',
+        'start_time', 'end_time', 'actual_reward'
+    )
+
     def __init__(self, id, title, description=None, requiredTime=None, dependencies=None, requiredResources=None, baseReward=None, rewardDecayFactor=None):
         self.id = id
         self.title = title
@@ -21,8 +33,8 @@ class Task:
             title=data['title'],
             description=data['description'],
             requiredTime=data['requiredTime'],
-            dependencies=data['dependencies'],
-            requiredResources=data['requiredResources'],
+            dependencies=list(data['dependencies']),
+            requiredResources=_copy_resources(data['requiredResources']),
             baseReward=data['baseReward'],
             rewardDecayFactor=data['rewardDecayFactor']
         )
@@ -35,11 +47,24 @@ class Task:
         )
         task.start_time = data['start_time']
         task.end_time = data['end_time']
-        task.required_resources = data['resources']
+        task.required_resources = _copy_resources(data['resources'])
+        task.dependencies = list(data.get('dependencies', []))
         task.actual_reward = data['actual_reward']
         task.llm_analysis = data['llm_analysis']
         return task
 
+    def to_input_dict(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'requiredTime': self.required_time,
+            'dependencies': list(self.dependencies),
+            'requiredResources': _copy_resources(self.required_resources),
+            'baseReward': self.base_reward,
+            'rewardDecayFactor': self.reward_decay_factor
+        }
+
     def to_output_dict(self):
         return {
             'id': self.id,
@@ -47,6 +72,7 @@ class Task:
             'start_time': self.start_time,
             'end_time': self.end_time,
             'resources': self.required_resources,
+            'dependencies': self.dependencies,
             'actual_reward': self.actual_reward,
             'llm_analysis': self.llm_analysis
         }
\ No newline at end of file
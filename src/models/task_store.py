@@ -0,0 +1,77 @@
+import copy
+from array import array
+
+
+class TaskStore:
+    """
+    Columnar, integer-indexed view of a list of tasks for very large projects.
+    Task ids are interned to their position in the list, numeric fields live
+    in typed arrays and the dependency graph is held in CSR form in both
+    directions (dependencies and dependents), so walking it touches a few
+    contiguous int arrays instead of per-task Python lists and sets.
+    """
+
+    def __init__(self, tasks, dependency_graph=None):
+        tasks = list(tasks)
+        self.ids = [task.id for task in tasks]
+        self.index = {task_id: i for i, task_id in enumerate(self.ids)}
+        self.required_time = array('d', (task.required_time or 0 for task in tasks))
+        self.base_reward = array('d', (task.base_reward or 0 for task in tasks))
+        self.reward_decay_factor = array('d', (task.reward_decay_factor or 0 for task in tasks))
+
+        # Dependencies in CSR form: deps of task i are dep_indices[dep_offsets[i]:dep_offsets[i + 1]]
+        self.dep_offsets = array('i', [0])
+        self.dep_indices = array('i')
+        for task in tasks:
+            deps = dependency_graph[task.id] if dependency_graph is not None else task.dependencies
+            seen = set()
+            for dep in deps:
+                dep_index = self.index.get(dep)
+                if dep_index is not None and dep_index not in seen:
+                    seen.add(dep_index)
+                    self.dep_indices.append(dep_index)
+            self.dep_offsets.append(len(self.dep_indices))
+
+        # Reverse edges (dependents) in CSR form, built by counting sort
+        n = len(self.ids)
+        counts = array('i', bytes(4 * (n + 1)))
+        for dep_index in self.dep_indices:
+            counts[dep_index + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+        self.dependent_offsets = array('i', counts)
+        self.dependent_indices = array('i', bytes(4 * len(self.dep_indices)))
+        cursor = array('i', counts[:n])
+        for i in range(n):
+            for k in range(self.dep_offsets[i], self.dep_offsets[i + 1]):
+                dep_index = self.dep_indices[k]
+                self.dependent_indices[cursor[dep_index]] = i
+                cursor[dep_index] += 1
+
+    def __len__(self):
+        return len(self.ids)
+
+    def updated(self, tasks):
+        """
+        Copy sharing this store's ids and dependency graph, with the numeric
+        fields of some tasks replaced; tasks maps index -> task.
+        """
+        store = copy.copy(self)
+        store.required_time = array('d', self.required_time)
+        store.base_reward = array('d', self.base_reward)
+        store.reward_decay_factor = array('d', self.reward_decay_factor)
+        for i, task in tasks.items():
+            store.required_time[i] = task.required_time or 0
+            store.base_reward[i] = task.base_reward or 0
+            store.reward_decay_factor[i] = task.reward_decay_factor or 0
+        return store
+
+    def dependencies_of(self, i):
+        return self.dep_indices[self.dep_offsets[i]:self.dep_offsets[i + 1]]
+
+    def dependents_of(self, i):
+        return self.dependent_indices[self.dependent_offsets[i]:self.dependent_offsets[i + 1]]
+
+    def in_degrees(self):
+        offsets = self.dep_offsets
+        return array('i', (offsets[i + 1] - offsets[i] for i in range(len(self.ids))))
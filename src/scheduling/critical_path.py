@@ -0,0 +1,134 @@
+import heapq
+from array import array
+
+
+class CriticalPath:
+    """
+    Resource-free timing of an acyclic dependency graph held in a TaskStore.
+    One topological ordering is built; a forward sweep over it gives each
+    task's earliest start and a backward sweep its bottom level (the longest
+    chain of work from the task to the end of the project). The critical-path
+    length, latest starts and slack follow from those two without another
+    pass over the edges. updated() re-times the same graph after some
+    durations changed, visiting only the tasks whose timing moves.
+    """
+
+    def __init__(self, store):
+        n = len(store)
+        duration = store.required_time
+        dependent_offsets, dependent_indices = store.dependent_offsets, store.dependent_indices
+        in_degree = store.in_degrees()
+
+        order = [i for i in range(n) if in_degree[i] == 0]
+        earliest_start = array('d', bytes(8 * n))
+        for i in order:  # order grows as tasks become free
+            finish = earliest_start[i] + duration[i]
+            for k in range(dependent_offsets[i], dependent_offsets[i + 1]):
+                j = dependent_indices[k]
+                if finish > earliest_start[j]:
+                    earliest_start[j] = finish
+                in_degree[j] -= 1
+                if in_degree[j] == 0:
+                    order.append(j)
+        if len(order) < n:
+            raise ValueError("Critical path needs an acyclic dependency graph")
+
+        bottom_level = array('d', duration)
+        for i in reversed(order):
+            longest = 0.0
+            for k in range(dependent_offsets[i], dependent_offsets[i + 1]):
+                level = bottom_level[dependent_indices[k]]
+                if level > longest:
+                    longest = level
+            bottom_level[i] += longest
+
+        self._set_timing(store.ids, order, earliest_start, bottom_level)
+
+    def _set_timing(self, ids, order, earliest_start, bottom_level):
+        self.ids = ids
+        self.order = order
+        self.earliest_start = earliest_start
+        self.bottom_level = bottom_level
+        self.length = max(bottom_level, default=0.0)
+        self.latest_start = array('d', (self.length - level for level in bottom_level))
+        self.slack = array('d', (latest - earliest for latest, earliest in zip(self.latest_start, earliest_start)))
+        self._position = None
+
+    def updated(self, store, changed):
+        """
+        Timing of the same graph once the tasks at indices changed have new
+        durations (store holds them). Earliest starts are only recomputed
+        downstream of a changed task and bottom levels upstream of one, each
+        walk stopping where the value stays the same.
+        """
+        if self._position is None:
+            self._position = array('i', bytes(4 * len(self.order)))
+            for position, i in enumerate(self.order):
+                self._position[i] = position
+        position = self._position
+        duration = store.required_time
+        earliest_start = array('d', self.earliest_start)
+        bottom_level = array('d', self.bottom_level)
+
+        # Forward, in topological order: a task starts once its slowest dependency is done
+        heap, queued = [], set()
+        for i in changed:
+            for j in store.dependents_of(i):
+                if j not in queued:
+                    queued.add(j)
+                    heapq.heappush(heap, (position[j], j))
+        while heap:
+            _, j = heapq.heappop(heap)
+            start = 0.0
+            for d in store.dependencies_of(j):
+                finish = earliest_start[d] + duration[d]
+                if finish > start:
+                    start = finish
+            if start != earliest_start[j]:
+                earliest_start[j] = start
+                for k in store.dependents_of(j):
+                    if k not in queued:
+                        queued.add(k)
+                        heapq.heappush(heap, (position[k], k))
+
+        # Backward, in reverse topological order: a task's own work plus its longest dependent chain
+        heap, queued = [], set(changed)
+        for i in queued:
+            heapq.heappush(heap, (-position[i], i))
+        while heap:
+            _, i = heapq.heappop(heap)
+            longest = 0.0
+            for k in store.dependents_of(i):
+                if bottom_level[k] > longest:
+                    longest = bottom_level[k]
+            level = duration[i] + longest
+            if level != bottom_level[i]:
+                bottom_level[i] = level
+                for d in store.dependencies_of(i):
+                    if d not in queued:
+                        queued.add(d)
+                        heapq.heappush(heap, (-position[d], d))
+
+        critical_path = CriticalPath.__new__(CriticalPath)
+        critical_path._set_timing(self.ids, self.order, earliest_start, bottom_level)
+        critical_path._position = position
+        return critical_path
+
+    def critical_tasks(self):
+        """Ids of the zero-slack tasks, in topological order."""
+        return [self.ids[i] for i in self.order if self.slack[i] <= 1e-9]
+
+    def to_dict(self):
+        return {
+            "length": self.length,
+            "critical_tasks": self.critical_tasks(),
+            "tasks": {
+                task_id: {
+                    "bottom_level": self.bottom_level[i],
+                    "earliest_start": self.earliest_start[i],
+                    "latest_start": self.latest_start[i],
+                    "slack": self.slack[i]
+                }
+                for i, task_id in enumerate(self.ids)
+            }
+        }
@@ -0,0 +1,456 @@
+import heapq
+import logging
+from array import array
+from collections import Counter
+import numpy as np
+from ..analysis.heuristic_analyzer import HeuristicAnalyzer
+from ..models.task_store import TaskStore
+from .resource_pool import ResourcePool
+from .scheduler import Scheduler
+
+logger = logging.getLogger(__name__)
+
+TASK_FIELDS = ('id', 'title', 'description', 'requiredTime', 'dependencies', 'requiredResources',
+               'baseReward', 'rewardDecayFactor')
+PATCH_KEYS = ('add_tasks', 'update_tasks', 'remove_tasks', 'resources')
+
+
+def apply_patch(project_data, patch):
+    """
+    Return a copy of project_data with patch applied. A patch may hold
+    add_tasks (complete task dicts), update_tasks (partial task dicts with an
+    id), remove_tasks (task ids) and resources (the new resource list or
+    capacities). Removed tasks are also dropped from other tasks' dependencies.
+    """
+    unknown = set(patch) - set(PATCH_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown patch fields: {', '.join(sorted(unknown))}")
+
+    tasks = {task['id']: task for task in project_data['tasks']}
+    removed = set()
+    for task_id in patch.get('remove_tasks', []):
+        if task_id not in tasks:
+            raise ValueError(f"Cannot remove unknown task {task_id}")
+        del tasks[task_id]
+        removed.add(task_id)
+    for update in patch.get('update_tasks', []):
+        task_id = update.get('id')
+        if task_id not in tasks:
+            raise ValueError(f"Cannot update unknown task {task_id}")
+        tasks[task_id] = {**tasks[task_id], **update}
+    for task in patch.get('add_tasks', []):
+        missing = [field for field in TASK_FIELDS if field not in task]
+        if missing:
+            raise ValueError(f"New task is missing fields: {', '.join(missing)}")
+        if task['id'] in tasks:
+            raise ValueError(f"Task {task['id']} already exists")
+        tasks[task['id']] = dict(task)
+
+    if removed:
+        for task_id, task in tasks.items():
+            if any(dep in removed for dep in task['dependencies']):
+                tasks[task_id] = {**task, 'dependencies': [dep for dep in task['dependencies'] if dep not in removed]}
+
+    return {**project_data, 'tasks': list(tasks.values()), 'resources': patch.get('resources', project_data['resources'])}
+
+
+class IncrementalScheduler(Scheduler):
+    """
+    Event-engine scheduler that starts from a previous result. It finds the
+    earliest time at which the edit can change a scheduling decision, keeps
+    every prior task that started before then, and resumes the event loop
+    from that point with the kept tasks completed or still holding their
+    resources. Unchanged tasks also keep their prior analysis. The result
+    matches a full event-engine run as long as reused analyses still hold.
+
+    Given the patch, only the tasks it touches are re-examined. If it leaves
+    the dependency graph as it was (and the prior run had nothing to drop or
+    break), validation and cycle breaking are skipped, and with the prior
+    run's scheduler (prior_scheduler) its priority inputs, task store,
+    resource demands and critical path are reused with only the touched
+    tasks updated.
+    """
+
+    def __init__(self, tasks, resources, prior_project, prior_result, patch=None, prior_scheduler=None, **kwargs):
+        kwargs['engine'] = 'event'
+        super().__init__(tasks, resources, **kwargs)
+        self.prior_inputs = {task['id']: task for task in prior_project['tasks']}
+        self.prior_resources = prior_project['resources']
+        self.prior_capacities = ResourcePool(self.prior_resources).capacities
+        self.prior_tasks = {task['id']: task for task in prior_result['scheduled_tasks']}
+        self.prior_order = [task['id'] for task in prior_result['scheduled_tasks']]
+        self.prior_critical_path = prior_result.get('critical_path')
+        # Prior analyses that were stand-ins for pending LLM results are not reused
+        self.prior_provisional = bool(prior_result.get('provisional_analyses'))
+        self.restart_time = 0
+
+        # Ids of the added and edited tasks, and of the removed ones; None when not known (no patch)
+        self.edited = None
+        self.removed = None
+        self.structure_changed = True
+        if patch is not None:
+            self._read_patch(patch)
+        self.graph_intact = not self.structure_changed and self._prior_graph_intact()
+        # When the prior run parked tasks and queued them again, which decides their place among ties
+        self.prior_parking = None
+        self.prior_full_passes = None
+        if prior_scheduler is not None and prior_scheduler.engine == 'event' and prior_scheduler._parking_complete:
+            self.prior_parking = prior_scheduler._parking
+            self.prior_full_passes = prior_scheduler._full_passes
+        self.prior_scheduler = prior_scheduler if self._can_reuse(prior_scheduler) else None
+        if self.prior_scheduler is not None:
+            self._demands = {task_id: demand for task_id, demand in self.prior_scheduler._demands.items()
+                             if task_id not in self.edited}
+        self._reanalyzed = set()
+
+    def _read_patch(self, patch):
+        updates = patch.get('update_tasks', [])
+        added = patch.get('add_tasks', [])
+        self.removed = set(patch.get('remove_tasks', []))
+        self.edited = {update['id'] for update in updates} | {task['id'] for task in added}
+        if self.removed:
+            # Tasks that depended on a removed task lost that dependency
+            self.edited.update(task_id for task_id, task in self.prior_inputs.items()
+                               if task_id not in self.removed and any(dep in self.removed for dep in task['dependencies']))
+        self.structure_changed = bool(self.removed or added or any('dependencies' in update for update in updates))
+
+    def _prior_graph_intact(self):
+        """Whether the prior run kept every input dependency (none invalid, no cycle broken)."""
+        if len(self.prior_tasks) < len(self.prior_inputs):
+            return False
+        return all(self._prior_dependencies(task_id) == prior_input['dependencies']
+                   for task_id, prior_input in self.prior_inputs.items())
+
+    def _can_reuse(self, prior):
+        return (prior is not None and self.graph_intact and not self.prior_provisional
+                and prior.engine == 'event' and prior.critical_path is not None
+                and prior._priority_batch.bias is None
+                and (prior.priority_calculator.bottom_level_weight, prior.priority_calculator.slack_weight)
+                == (self.priority_calculator.bottom_level_weight, self.priority_calculator.slack_weight)
+                and list(prior.tasks) == list(self.tasks))
+
+    def _analyze_tasks(self):
+        heuristic = isinstance(self.analyzer, HeuristicAnalyzer)
+        if self.prior_provisional or (heuristic and self.edited is None):
+            # Estimates depend on the whole graph and are cheap, so redo them all
+            super()._analyze_tasks()
+            return
+        refresh = self._dependent_count_changes() if heuristic else set()
+        fresh = []
+        for task in self.tasks.values():
+            if self.edited is not None:
+                unchanged = task.id not in self.edited and task.id not in refresh
+            else:
+                unchanged = self._input_unchanged(task)
+            prior = self.prior_tasks.get(task.id)
+            if unchanged and prior is not None and prior.get('llm_analysis') is not None:
+                task.llm_analysis = prior['llm_analysis']
+            else:
+                fresh.append(task)
+        if fresh:
+            logger.info("Analyzing %d new or edited task(s)", len(fresh))
+            if heuristic:
+                dependents = self._dependent_counts(fresh)
+                for task in fresh:
+                    task.llm_analysis = HeuristicAnalyzer.estimate(task, dependents[task.id])
+            else:
+                self.analyzer.analyze_batch(fresh)
+        self.counters['analysis_provisional'] = getattr(self.analyzer, 'provisional', 0)
+        self._reanalyzed = {task.id for task in fresh}
+        self._fill_missing_analysis()
+
+    def _dependent_count_changes(self):
+        """Tasks whose number of dependents the patch may have changed, so their estimates can differ."""
+        if not self.structure_changed:
+            return set()
+        changed = set()
+        for task_id in self.edited:
+            if task_id in self.tasks:
+                changed.update(self.tasks[task_id].dependencies)
+            if task_id in self.prior_inputs:
+                changed.update(self.prior_inputs[task_id]['dependencies'])
+        for task_id in self.removed:
+            changed.update(self.prior_inputs[task_id]['dependencies'])
+        return changed
+
+    def _dependent_counts(self, tasks):
+        if self.prior_scheduler is None:
+            return HeuristicAnalyzer.dependent_counts(self.tasks.values())
+        # Same graph as the prior run, whose task store already counts each task's dependents
+        store = self.prior_scheduler.task_store
+        return {task.id: store.dependent_offsets[store.index[task.id] + 1] - store.dependent_offsets[store.index[task.id]]
+                for task in tasks}
+
+    def _prepare_priorities(self):
+        if self.prior_scheduler is None:
+            super()._prepare_priorities()
+            return
+        self._task_index = self.prior_scheduler._task_index
+        changed = {self._task_index[task_id]: self.tasks[task_id] for task_id in self._reanalyzed}
+        self._priority_batch = self.prior_scheduler._priority_batch.updated(changed, self.priority_calculator)
+
+    def _validate_dependencies(self):
+        if self.graph_intact:
+            return  # same dependencies as the prior run, which had none to drop
+        super()._validate_dependencies()
+
+    def _check_resources(self):
+        if self.edited is not None and self.resources.capacities == self.prior_capacities:
+            # Only new or edited demands can exceed capacities the prior project met
+            super()._check_resources(self.tasks[task_id] for task_id in self.edited if task_id in self.tasks)
+        else:
+            super()._check_resources()
+
+    def _break_dependency_cycles(self):
+        if self.graph_intact:
+            return 0  # the prior graph was acyclic and the patch kept it
+        return super()._break_dependency_cycles()
+
+    def _analyze_critical_path(self):
+        prior = self.prior_scheduler
+        if prior is None:
+            super()._analyze_critical_path()
+            return
+        changed = {self._task_index[task_id]: self.tasks[task_id] for task_id in self.edited}
+        durations = [i for i, task in changed.items() if task.required_time != prior.tasks[task.id].required_time]
+        self.task_store = prior.task_store.updated(changed)
+        self.critical_path = prior.critical_path
+        if durations:
+            self.critical_path = prior.critical_path.updated(self.task_store, durations)
+            self._priority_batch.apply_critical_path(self.critical_path, self.priority_calculator)
+
+    def _input_unchanged(self, task):
+        prior_input = self.prior_inputs.get(task.id)
+        return prior_input is not None and (
+            prior_input['title'] == task.title
+            and prior_input['description'] == task.description
+            and prior_input['requiredTime'] == task.required_time
+            and prior_input['dependencies'] == task.dependencies
+            and prior_input['requiredResources'] == task.required_resources
+            and prior_input['baseReward'] == task.base_reward
+            and prior_input['rewardDecayFactor'] == task.reward_decay_factor
+        )
+
+    def _prior_dependencies(self, task_id):
+        prior = self.prior_tasks[task_id]
+        if 'dependencies' in prior:
+            return prior['dependencies']
+        return self.prior_inputs[task_id]['dependencies']
+
+    def _prior_ready_time(self, dependencies):
+        """When the given dependencies had all finished in the prior schedule."""
+        return max((self.prior_tasks[dep]['end_time'] for dep in dependencies if dep in self.prior_tasks), default=0)
+
+    def _task_changed(self, task):
+        prior_input = self.prior_inputs[task.id]
+        prior = self.prior_tasks[task.id]
+        return (
+            task.required_time != prior_input['requiredTime']
+            or task.base_reward != prior_input['baseReward']
+            or task.reward_decay_factor != prior_input['rewardDecayFactor']
+            or self._demand(task) != ResourcePool.demand(prior_input['requiredResources'])
+            or task.llm_analysis != prior.get('llm_analysis')
+            or self.dependency_graph[task.id] != set(self._prior_dependencies(task.id))
+            or self._path_factor_changed(task.id)
+        )
+
+    def _path_factor_changed(self, task_id):
+        """Critical-path priority terms depend on the whole graph, so compare them too."""
+        if not self.priority_calculator.uses_critical_path:
+            return False
+        prior = self.prior_critical_path['tasks'][task_id]
+        prior_factor = self.priority_calculator.path_factor(
+            prior['bottom_level'], prior['slack'], self.prior_critical_path['length'])
+        return prior_factor != self._priority_batch.path_factor[self._task_index[task_id]]
+
+    def _earliest_affected_time(self):
+        """
+        Earliest time at which the new project can diverge from the prior
+        schedule. Before a task becomes ready it cannot influence any choice,
+        and a removed task only mattered once it started, so each edit bounds
+        the divergence from below.
+        """
+        if len(self.prior_tasks) < len(self.prior_inputs):
+            return 0  # the prior schedule was incomplete
+        if self.priority_calculator.uses_critical_path and not self.prior_critical_path:
+            return 0
+
+        candidates = []
+        for task_id in self._suspects():
+            task = self.tasks.get(task_id)
+            if task is None:
+                continue
+            if task_id not in self.prior_tasks:
+                candidates.append(self._prior_ready_time(self.dependency_graph[task_id]))
+            elif self._task_changed(task):
+                candidates.append(min(self._prior_ready_time(self._prior_dependencies(task_id)),
+                                      self._prior_ready_time(self.dependency_graph[task_id])))
+        for task_id in self.prior_tasks if self.removed is None else self.removed:
+            if task_id not in self.tasks:
+                candidates.append(self.prior_tasks[task_id]['start_time'])
+
+        old_capacities = self.prior_capacities
+        new_capacities = self.resources.capacities
+        if old_capacities != new_capacities:
+            # Tasks that waited after becoming ready may now start sooner, and whether they waited
+            # parked or in the queue (which decides ties) follows when the whole pool ran dry
+            for task_id, prior in self.prior_tasks.items():
+                ready_time = self._prior_ready_time(self._prior_dependencies(task_id))
+                if prior['start_time'] > ready_time:
+                    candidates.append(ready_time)
+        for name in set(old_capacities) | set(new_capacities):
+            if new_capacities.get(name, 0) >= old_capacities.get(name, 0):
+                continue
+            candidates.extend(prior['start_time'] for prior in self.prior_tasks.values() if name in prior['resources'])
+
+        if not candidates:
+            return max((prior['end_time'] for prior in self.prior_tasks.values()), default=0)
+        return min(candidates)
+
+    def _suspects(self):
+        """Ids of the tasks whose scheduling inputs may differ from the prior run's."""
+        if self.edited is None or not self.graph_intact:
+            return self.tasks  # the graph (or cycle breaking) may differ anywhere
+        suspects = self.edited | self._reanalyzed
+        if self.priority_calculator.uses_critical_path:
+            if self.prior_scheduler is None:
+                return self.tasks
+            if self.critical_path is self.prior_scheduler.critical_path:
+                return suspects
+            # A new duration moves the critical-path terms of other tasks too
+            moved = np.nonzero(self.prior_scheduler._priority_batch.path_factor != self._priority_batch.path_factor)[0]
+            suspects |= {self.task_store.ids[i] for i in moved.tolist()}
+        return suspects
+
+    def _run_engine(self):
+        self.restart_time = self._earliest_affected_time()
+        if self.restart_time <= 0:
+            logger.info("Edit affects the whole schedule, rescheduling from time 0")
+            self._run_event_engine()
+            return
+
+        tasks = list(self.tasks.values())
+        store = self.task_store or TaskStore(tasks, self.dependency_graph)
+        completions = []
+        kept = set()
+        self.current_time = self.restart_time
+
+        for task_id in self.prior_order:
+            prior = self.prior_tasks[task_id]
+            if task_id not in self.tasks or prior['start_time'] >= self.restart_time:
+                continue
+            task = self.tasks[task_id]
+            task.start_time = prior['start_time']
+            task.end_time = prior['end_time']
+            task.actual_reward = prior['actual_reward']
+            self.scheduled_tasks.append(task)
+            self.makespan = max(self.makespan, task.end_time)
+            self.total_reward += task.actual_reward
+            kept.add(task_id)
+            if task.end_time <= self.restart_time:
+                self.completed_tasks.add(task_id)
+            elif self.resources.try_acquire(self._demand(task)):
+                self.in_progress[task_id] = task.end_time
+                heapq.heappush(completions, (task.end_time, self._task_index[task_id]))
+            else:
+                logger.warning("Kept task %s no longer fits the resource pool, rescheduling from time 0", task_id)
+                self._reset()
+                self._run_event_engine()
+                return
+
+        # Unfinished dependencies of the tasks still to schedule; kept tasks are never ready again
+        in_degree = array('i', bytes(4 * len(tasks)))
+        ready = []
+        ids, completed = store.ids, self.completed_tasks
+        for i, task in enumerate(tasks):
+            if task.id in kept:
+                continue
+            in_degree[i] = sum(1 for dep in store.dependencies_of(i) if ids[dep] not in completed)
+            if in_degree[i] == 0:
+                ready.append(task)
+        queue = self._restart_queue(ready, store, kept)
+        if queue is None:
+            logger.info("Queue order at time %s is unknown, rescheduling from time 0", self.restart_time)
+            self._reset()
+            self.restart_time = 0
+            self._run_event_engine()
+            return
+
+        logger.info("Reusing %d of %d prior task(s), rescheduling from time %s",
+                    len(kept), len(self.prior_tasks), self.restart_time)
+        ready, blocked, ranks = queue
+        self._event_loop(tasks, store, in_degree, ready, completions, blocked, ranks)
+
+    def _restart_queue(self, ready, store, kept):
+        """
+        (ready, blocked, ranks) for _event_loop at the restart time: the tasks
+        free to start, the tasks a full run would still keep parked, and the
+        rank of each in the queue (see _QueuePlace), from the step at which it
+        last joined it. The steps taken before the restart time are recorded
+        as a full run would have them. Without the prior run's parking history
+        every task counts as queued from when it became ready; None is
+        returned if that guess could decide a priority tie, or if the steps
+        taken are not known.
+        """
+        ids, n = store.ids, len(self.tasks)
+        if any(self.tasks[task_id].start_time == self.tasks[task_id].end_time for task_id in kept):
+            return None  # a task that ends as it starts takes a second step at that time
+        step_times = sorted({0} | {self.tasks[task_id].end_time for task_id in kept
+                                   if self.tasks[task_id].end_time < self.restart_time})
+        steps = {time: step for step, time in enumerate(step_times)}
+        restart_step = steps[self.restart_time] = len(step_times)
+        arrival = {}
+        for task in ready:
+            arrival[task.id] = steps[max((self.tasks[ids[dep]].end_time
+                                          for dep in store.dependencies_of(self._task_index[task.id])), default=0)]
+
+        blocked = {}
+        parked = set()
+        full_passes = []
+        self._parking = {}
+        if self.prior_parking is not None:
+            for task_id, events in self.prior_parking.items():
+                # Parked during the restart step happens again; rejoining during it already did
+                events = [event for event in events
+                          if event[0] < self.restart_time or (event[0] == self.restart_time and event[1] is None)]
+                if not events or task_id not in self.tasks:
+                    continue
+                self._parking[task_id] = events
+                if task_id not in arrival:
+                    continue
+                # The scan passed over the task at each shortage, so it rejoined at the next step
+                arrival[task_id] = max([arrival[task_id]] + [steps[time] + 1 for time, resource in events
+                                                             if resource is not None])
+                resource = events[-1][1]
+                if resource is not None:
+                    blocked.setdefault(resource, []).append(self.tasks[task_id])
+                    parked.add(task_id)
+            full_passes = [time for time in self.prior_full_passes if time < self.restart_time]
+        else:
+            self._parking_complete = False
+            # A task that waited may have been parked and queued again later, which only matters on a tie
+            priorities = self._priority_batch.priorities(
+                self.restart_time, [self._task_index[task.id] for task in ready]).tolist()
+            counts = Counter(priorities)
+            if any(counts[priority] > 1 for task, priority in zip(ready, priorities)
+                   if arrival[task.id] < restart_step):
+                return None
+
+        self._step_times = step_times
+        self._full_passes = full_passes
+        self._requeued = (steps[full_passes[-1]] + 1) * n if full_passes else 0
+        ranks = [0] * n
+        for task_id, step in arrival.items():
+            index = self._task_index[task_id]
+            ranks[index] = step * n + index
+        return [task for task in ready if task.id not in parked], blocked, ranks
+
+    def _reset(self):
+        for task_id in self.in_progress:
+            self.resources.release(self._demand(self.tasks[task_id]))
+        self.scheduled_tasks = []
+        self.in_progress = {}
+        self.completed_tasks = set()
+        self.current_time = 0
+        self.makespan = 0
+        self.total_reward = 0
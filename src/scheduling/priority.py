@@ -1,16 +1,171 @@
+import copy
+import numpy as np
+from ..config import CONFIG
+
+PRIORITY_MAP = {'low': 1, 'medium': 2, 'high': 3}
+
 class PriorityCalculator:
-    def calculate(self, task, current_time, llm_analysis):
+    def __init__(self, bottom_level_weight=None, slack_weight=None):
+        scheduler_config = CONFIG.get('scheduler', {})
+        if bottom_level_weight is None:
+            bottom_level_weight = scheduler_config.get('bottom_level_weight', 0.0)
+        if slack_weight is None:
+            slack_weight = scheduler_config.get('slack_weight', 0.0)
+        self.bottom_level_weight = bottom_level_weight
+        self.slack_weight = slack_weight
+
+    @property
+    def uses_critical_path(self):
+        return bool(self.bottom_level_weight or self.slack_weight)
+
+    def calculate(self, task, current_time, llm_analysis, path_factor=1.0):
         time_elapsed = max(0, current_time - getattr(task, 'earliest_start', 0))
         decayed_reward = task.base_reward * (task.reward_decay_factor ** time_elapsed)
-        
-        complexity = llm_analysis.get('complexity', 5)
-        priority_map = {'low': 1, 'medium': 2, 'high': 3}
-        suggested_priority = priority_map.get(llm_analysis.get('suggested_priority', 'medium').lower(), 2)
-        
-        llm_factor = (complexity / 10) * suggested_priority
-        
-        return decayed_reward * llm_factor
+        priority = decayed_reward * self.llm_factor(llm_analysis)
+        if path_factor != 1.0:
+            priority *= path_factor
+        return priority
+
+    def path_factor(self, bottom_level, slack, critical_path_length):
+        """
+        Boost for tasks with a lot of work behind them (bottom level) and
+        little room to slip (slack), both relative to the critical path.
+        Equal to 1 with the default weights of 0.
+        """
+        if not critical_path_length:
+            return 1.0
+        return ((1 + self.bottom_level_weight * bottom_level / critical_path_length)
+                * (1 + self.slack_weight * (1 - slack / critical_path_length)))
+
+    @staticmethod
+    def llm_factor(llm_analysis):
+        llm_analysis = llm_analysis or {}
+        # LLMAnalyzer writes estimated_complexity; 'complexity' is kept for older results
+        complexity = llm_analysis.get('estimated_complexity', llm_analysis.get('complexity', 5))
+        try:
+            complexity = float(complexity)
+        except (TypeError, ValueError):
+            complexity = 5
+        suggested_priority = PRIORITY_MAP.get(str(llm_analysis.get('suggested_priority', 'medium')).lower(), 2)
+        return (complexity / 10) * suggested_priority
 
     def calculate_reward(self, task, start_time):
         time_elapsed = max(0, start_time - getattr(task, 'earliest_start', 0))
-        return task.base_reward * (task.reward_decay_factor ** time_elapsed)
\ No newline at end of file
+        return task.base_reward * (task.reward_decay_factor ** time_elapsed)
+
+    def prepare_batch(self, tasks):
+        return PriorityBatch(tasks, self)
+
+
+class PriorityBatch:
+    """
+    Column snapshot of the priority inputs of a fixed list of tasks. Priorities
+    for any subset of them at a given time are computed in one NumPy call and
+    match PriorityCalculator.calculate value for value. Decay powers are taken
+    with Python's pow once per distinct decay factor rather than np.power,
+    whose vectorised kernel can differ from it in the last bit.
+    """
+
+    def __init__(self, tasks, calculator):
+        self.base_reward = np.array([task.base_reward for task in tasks], dtype=np.float64)
+        self.decay = np.array([task.reward_decay_factor for task in tasks], dtype=np.float64)
+        self.earliest_start = np.array([getattr(task, 'earliest_start', 0) for task in tasks], dtype=np.float64)
+        self.llm_factor = np.array([calculator.llm_factor(task.llm_analysis) for task in tasks], dtype=np.float64)
+        self._index_columns()
+        self.path_factor = None
+        self.bias = None
+
+    def _index_columns(self):
+        self.decay_values, self.decay_codes = np.unique(self.decay, return_inverse=True)
+        self.decay_values = self.decay_values.tolist()
+        self._common_start = self.earliest_start[0] if len(self.earliest_start) and np.all(self.earliest_start == self.earliest_start[0]) else None
+        self._scalar_columns = None
+
+    def updated(self, tasks, calculator):
+        """
+        Copy for the same list of tasks with the inputs of some of them
+        replaced; tasks maps index -> task. This batch is left as it was.
+        """
+        batch = copy.copy(self)
+        if not tasks:
+            return batch
+        indices = np.fromiter(tasks, dtype=np.intp, count=len(tasks))
+        changed = list(tasks.values())
+        batch.base_reward = self.base_reward.copy()
+        batch.base_reward[indices] = [task.base_reward for task in changed]
+        batch.decay = self.decay.copy()
+        batch.decay[indices] = [task.reward_decay_factor for task in changed]
+        batch.earliest_start = self.earliest_start.copy()
+        batch.earliest_start[indices] = [getattr(task, 'earliest_start', 0) for task in changed]
+        batch.llm_factor = self.llm_factor.copy()
+        batch.llm_factor[indices] = [calculator.llm_factor(task.llm_analysis) for task in changed]
+        batch._index_columns()
+        return batch
+
+    def apply_critical_path(self, critical_path, calculator):
+        """Fold the calculator's critical-path terms into later priorities."""
+        self._scalar_columns = None
+        if not calculator.uses_critical_path:
+            self.path_factor = None
+            return
+        self.path_factor = np.array([
+            calculator.path_factor(bottom_level, slack, critical_path.length)
+            for bottom_level, slack in zip(critical_path.bottom_level, critical_path.slack)
+        ], dtype=np.float64)
+
+    def apply_bias(self, bias):
+        """Scale later priorities by a fixed per-task factor (None removes it)."""
+        self._scalar_columns = None
+        self.bias = None if bias is None else np.asarray(bias, dtype=np.float64)
+
+    def tie_groups(self):
+        """
+        Group number per task. Tasks of one group have the same priority
+        inputs, so their priorities are equal at every time; tasks of different
+        groups can still round to equal priorities at some times only.
+        """
+        columns = [self.base_reward, self.decay, self.earliest_start, self.llm_factor]
+        columns += [column for column in (self.path_factor, self.bias) if column is not None]
+        _, groups = np.unique(np.column_stack(columns), axis=0, return_inverse=True)
+        return groups.reshape(-1).tolist()
+
+    def priorities(self, current_time, indices=None):
+        """Priorities at current_time for the tasks at indices (all tasks if None)."""
+        if indices is None:
+            indices = slice(None)
+        else:
+            indices = np.asarray(indices, dtype=np.intp)
+
+        if self._common_start is not None:
+            time_elapsed = max(0, current_time - self._common_start)
+            powers = np.array([decay ** time_elapsed for decay in self.decay_values], dtype=np.float64)
+            decay_factor = powers[self.decay_codes[indices]]
+        else:
+            decay_factor = np.array([
+                decay ** max(0, current_time - earliest_start)
+                for decay, earliest_start in zip(self.decay[indices].tolist(), self.earliest_start[indices].tolist())
+            ], dtype=np.float64)
+        priorities = (self.base_reward[indices] * decay_factor) * self.llm_factor[indices]
+        if self.path_factor is not None:
+            priorities = priorities * self.path_factor[indices]
+        if self.bias is not None:
+            priorities = priorities * self.bias[indices]
+        return priorities
+
+    def priority(self, index, current_time):
+        """priorities(current_time, [index])[0] as a float, without the array overhead."""
+        if self._scalar_columns is None:
+            self._scalar_columns = [None if column is None else column.tolist() for column in (
+                self.base_reward, self.decay, self.earliest_start, self.llm_factor, self.path_factor, self.bias,
+                self.decay_codes)]
+        base_reward, decay, earliest_start, llm_factor, path_factor, bias, decay_codes = self._scalar_columns
+        if self._common_start is not None:
+            decay_factor = self.decay_values[decay_codes[index]] ** max(0, current_time - self._common_start)
+        else:
+            decay_factor = decay[index] ** max(0, current_time - earliest_start[index])
+        priority = (base_reward[index] * float(decay_factor)) * llm_factor[index]
+        if path_factor is not None:
+            priority *= path_factor[index]
+        if bias is not None:
+            priority *= bias[index]
+        return priority
@@ -0,0 +1,85 @@
+from collections import Counter
+
+
+def _units(value, what, minimum):
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{what} must be an integer of at least {minimum}, got {value!r}")
+    return value
+
+
+class ResourcePool:
+    """
+    Counted pool of interchangeable resource units. Each resource name maps to
+    a capacity and an available count, so acquiring and releasing a unit is a
+    dictionary update instead of a list scan. Resources are given either as a
+    list of names, one unit per entry, or as typed {name: capacity} mapping.
+    """
+
+    def __init__(self, resources):
+        self.typed = isinstance(resources, dict)
+        if self.typed:
+            self.capacities = {name: _units(count, f"Capacity of resource {name}", 0)
+                               for name, count in resources.items()}
+        else:
+            self.capacities = dict(Counter(resources))
+        self.available = dict(self.capacities)
+        self._total_available = sum(self.available.values())
+
+    @staticmethod
+    def demand(required_resources):
+        """
+        Collapse a task's required resources, a list of names (one unit each)
+        or a {name: units} mapping, into a {name: units} mapping.
+        """
+        if isinstance(required_resources, dict):
+            return {name: _units(units, f"Required units of {name}", 0)
+                    for name, units in required_resources.items() if units != 0}
+        return dict(Counter(required_resources))
+
+    def infeasible(self, demand):
+        """Return the first resource in demand that exceeds its total capacity, or None."""
+        capacities = self.capacities
+        for name, units in demand.items():
+            if capacities.get(name, 0) < units:
+                return name
+        return None
+
+    def can_acquire(self, demand):
+        return self.shortfall(demand) is None
+
+    def shortfall(self, demand):
+        """Return the first resource in demand without enough free units, or None."""
+        available = self.available
+        for name, units in demand.items():
+            if available.get(name, 0) < units:
+                return name
+        return None
+
+    def try_acquire(self, demand):
+        """Acquire every unit in demand, or nothing if any unit is missing."""
+        if self.shortfall(demand) is not None:
+            return False
+        for name, units in demand.items():
+            self.available[name] -= units
+            self._total_available -= units
+        return True
+
+    def release(self, demand):
+        for name, units in demand.items():
+            self.available[name] = self.available.get(name, 0) + units
+            self._total_available += units
+
+    def to_list(self):
+        return [name for name, count in self.available.items() for _ in range(count)]
+
+    def __contains__(self, name):
+        return self.available.get(name, 0) > 0
+
+    def __bool__(self):
+        return self._total_available > 0
+
+    def __len__(self):
+        return self._total_available
+
+    def __repr__(self):
+        return f"ResourcePool({self.available})"
@@ -1,177 +1,711 @@
-import traceback
-from collections import deque, defaultdict
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter, deque, defaultdict
+from contextlib import contextmanager
+import numpy as np
 from ..models.task import Task
+from ..models.task_store import TaskStore
 from .priority import PriorityCalculator
-from ..analysis.llm_analyzer import LLMAnalyzer
+from .critical_path import CriticalPath
+from .resource_pool import ResourcePool
+from .tracing import EventTracer
+from ..analysis.analyzer import create_analyzer
+from ..analysis.heuristic_analyzer import HeuristicAnalyzer
+from ..config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+ENGINES = ('tick', 'event')
+
+
+class _QueuePlace:
+    """
+    A ready task's place in the tick engine's queue, as the event engine
+    tracks it; compared only between tasks of equal priority. The task's
+    rank is step * n + task index if it joined the queue at that step, n
+    being the number of tasks: the tick engine appends the tasks that become
+    ready at a step in input order, and its scan drops a task it cannot start
+    to be appended again at the next step. Tasks with the same priority
+    inputs (tie group) are ordered by rank; others by their earlier
+    priorities first.
+    """
+    __slots__ = ('scheduler', 'index', 'group')
+
+    def __init__(self, scheduler, index, group):
+        self.scheduler = scheduler
+        self.index = index
+        self.group = group
+
+    def __lt__(self, other):
+        if self.group == other.group:
+            ranks = self.scheduler._ranks
+            return ranks[self.index] < ranks[other.index]
+        return self.scheduler._queued_before(self.index, other.index)
+
 
 class Scheduler:
-    def __init__(self, tasks, resources):
+    def __init__(self, tasks, resources, engine=None, analyzer=None, tracer=None):
+        self.engine = engine or CONFIG['scheduler'].get('engine', 'tick')
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown scheduler engine: {self.engine}")
         self.tasks = {task.id: task for task in tasks}
-        self.resources = resources.copy()
+        self.resources = ResourcePool(resources)
+        self._demands = {}
         self.scheduled_tasks = []
         self.ready_tasks = deque()
         self.in_progress = {}
         self.completed_tasks = set()
         self.current_time = 0
         self.priority_calculator = PriorityCalculator()
-        self.llm_analyzer = LLMAnalyzer()
+        self.analyzer = analyzer or create_analyzer()
+        self.tracer = tracer or EventTracer.from_config()
+        self.state_sample_every = CONFIG.get('tracing', {}).get('state_sample_every', 100)
+        self._steps = 0
+        self._blocked_count = 0  # ready tasks parked in the event engine's blocked index
+        # Per task index: rank and place in the tick engine's queue, as the event engine tracks them (see _QueuePlace)
+        self._ranks = []
+        self._queue_places = []
+        # Task id -> [(time, resource)]: each step at which the event engine found the task short of
+        # resource (parked, or passed over by the tick engine's scan while parked), and (time, None)
+        # when its release put it back among the ready tasks; incomplete if a resumed run lacks the prior run's
+        self._parking = {}
+        self._parking_complete = True
+        self._full_passes = []  # times of the steps whose scan reached every parked task
+        self._step_times = []  # time of each event engine step so far
+        self._requeued = 0
+        self._tie_orders = {}
+        self.makespan = 0  # running end of the schedule and total reward, as tasks start
+        self.total_reward = 0
+        self.phase_timings = {}
+        self.counters = Counter()
         self.dependency_graph = self._build_dependency_graph()
+        self.task_store = None
+        self.critical_path = None
 
     def _build_dependency_graph(self):
         graph = {task_id: set(task.dependencies) for task_id, task in self.tasks.items()}
         return graph
 
-    def _find_all_cycles(self):
-        def dfs(node, path):
-            if node in path:
-                return [path[path.index(node):]]
-            
-            cycles = []
-            path.append(node)
-            for neighbor in self.dependency_graph[node]:
-                if neighbor in self.dependency_graph:
-                    cycles.extend(dfs(neighbor, path.copy()))
-            return cycles
-
-        all_cycles = []
-        for node in self.dependency_graph:
-            all_cycles.extend(dfs(node, []))
-        return [list(dict.fromkeys(cycle)) for cycle in all_cycles]  # Remove duplicates
-
-    def _break_dependency_cycle(self):
-        cycles = self._find_all_cycles()
-        if not cycles:
-            print("No cycles found")
-            return False
+    def _strongly_connected_components(self, nodes):
+        """
+        Iterative Tarjan SCC over the dependency graph restricted to nodes.
+        Dependencies are walked in task order so the result is deterministic.
+        """
+        node_set = set(nodes)
+        index = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        components = []
+        counter = 0
+
+        for root in nodes:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.tasks[root].dependencies))]
+            while work:
+                node, neighbors = work[-1]
+                descended = False
+                for neighbor in neighbors:
+                    if neighbor not in node_set:
+                        continue
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self.tasks[neighbor].dependencies)))
+                        descended = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component[::-1])
+        return components
+
+    def _cyclic_components(self, nodes):
+        return [component for component in self._strongly_connected_components(nodes)
+                if len(component) > 1 or component[0] in self.dependency_graph[component[0]]]
+
+    def _find_cycle(self, component):
+        """Shortest cycle through the first node of a strongly connected component."""
+        start = component[0]
+        members = set(component)
+        parent = {}
+        frontier = deque([start])
+        while frontier:
+            node = frontier.popleft()
+            for dep in self.tasks[node].dependencies:
+                if dep == start:
+                    cycle = [node]
+                    while cycle[-1] != start:
+                        cycle.append(parent[cycle[-1]])
+                    return cycle[::-1]
+                if dep in members and dep not in parent:
+                    parent[dep] = node
+                    frontier.append(dep)
+        return []
+
+    def _remove_dependency(self, task_id, dep):
+        self.dependency_graph[task_id].discard(dep)
+        task = self.tasks[task_id]
+        task.dependencies = [d for d in task.dependencies if d != dep]
 
+    def _break_dependency_cycles(self):
+        """
+        Break every dependency cycle by removing the lowest-priority edge of
+        one cycle at a time. Only the strongly connected component that lost
+        an edge is re-examined, so the rest of the graph is visited once.
+        Returns the number of edges removed.
+        """
+        pending = self._cyclic_components(list(self.dependency_graph))
+        if not pending:
+            logger.info("No dependency cycles found")
+            return 0
+
+        initial_priorities = self._priority_batch.priorities(0).tolist()
         edges_removed = 0
-        for cycle in cycles:
-            print(f"Found cycle: {' -> '.join(cycle)}")
+        while pending:
+            component = pending.pop()
+            cycle = self._find_cycle(component)
+            logger.info("Found cycle: %s", ' -> '.join(cycle))
             edge_to_remove = min(((cycle[i], cycle[(i+1) % len(cycle)]) for i in range(len(cycle))),
-                                 key=lambda x: self.priority_calculator.calculate(self.tasks[x[0]], 0, self.tasks[x[0]].llm_analysis))
-            
-            if edge_to_remove[0] in self.dependency_graph and edge_to_remove[1] in self.dependency_graph[edge_to_remove[0]]:
-                self.dependency_graph[edge_to_remove[0]].remove(edge_to_remove[1])
-                if edge_to_remove[0] in self.tasks:
-                    self.tasks[edge_to_remove[0]].dependencies.remove(edge_to_remove[1])
-                print(f"Removed dependency: {edge_to_remove[1]} -> {edge_to_remove[0]}")
-                edges_removed += 1
+                                 key=lambda x: initial_priorities[self._task_index[x[0]]])
+
+            self._remove_dependency(*edge_to_remove)
+            logger.info("Removed dependency: %s -> %s", edge_to_remove[1], edge_to_remove[0])
+            if self.tracer.enabled:
+                self.tracer.emit("cycle_broken", cycle=cycle, task=edge_to_remove[0], removed_dependency=edge_to_remove[1])
+            edges_removed += 1
+            pending.extend(self._cyclic_components(component))
 
-        return edges_removed > 0
+        return edges_removed
 
     def _validate_dependencies(self):
-        print("Validating dependencies...")
+        logger.info("Validating dependencies...")
         for task_id, task in self.tasks.items():
-            print(f"Task {task_id} dependencies: {task.dependencies}")
             for dep in list(task.dependencies):  # Use list() to avoid runtime modification issues
                 if dep not in self.tasks:
-                    print(f"Warning: Task {task_id} has invalid dependency {dep}")
+                    logger.warning("Task %s has invalid dependency %s", task_id, dep)
                     task.dependencies.remove(dep)
         
         # Rebuild dependency graph after validation
         self.dependency_graph = self._build_dependency_graph()
-        print("Dependency graph after validation:")
-        for task_id, deps in self.dependency_graph.items():
-            print(f"Task {task_id} depends on: {deps}")
-
-    def _print_task_state(self):
-        print("\nCurrent task state:")
-        print("Completed tasks:", self.completed_tasks)
-        print("In-progress tasks:", self.in_progress)
-        print("Ready tasks:", [task.id for task in self.ready_tasks])
-        print("Remaining tasks:", set(self.tasks.keys()) - self.completed_tasks - set(self.in_progress.keys()))
-
-    def _print_full_task_state(self):
-        print("\nFull task state:")
+        if logger.isEnabledFor(logging.DEBUG):
+            for task_id, deps in self.dependency_graph.items():
+                logger.debug("Task %s depends on: %s", task_id, deps)
+
+    def _check_resources(self, tasks=None):
+        """
+        Reject demands no schedule could ever meet (more units than a typed
+        pool has in total), which would otherwise leave the task and
+        everything depending on it unscheduled. A pool given as a list of
+        names only warns, and such tasks are left unscheduled as they always
+        were. One dictionary lookup per demanded name. Checks tasks (default:
+        every task).
+        """
+        infeasible = []
+        for task in self.tasks.values() if tasks is None else tasks:
+            demand = self._demand(task)
+            name = self.resources.infeasible(demand)
+            if name is not None:
+                infeasible.append(f"{task.id} needs {demand[name]} x {name} "
+                                  f"(capacity {self.resources.capacities.get(name, 0)})")
+        if not infeasible:
+            return
+        shown = ", ".join(infeasible[:5]) + (f" and {len(infeasible) - 5} more" if len(infeasible) > 5 else "")
+        if self.resources.typed:
+            raise ValueError(f"{len(infeasible)} task(s) can never get their resources: {shown}")
+        logger.warning("%d task(s) can never get their resources and will not be scheduled: %s",
+                       len(infeasible), shown)
+
+    def resource_utilization(self):
+        """
+        Per resource: capacity, busy unit-time, the share of capacity x makespan
+        that was in use, and the most units in use at once.
+        """
+        makespan = max((task.end_time for task in self.scheduled_tasks), default=0)
+        busy = Counter()
+        changes = defaultdict(Counter)  # name -> time -> change in units in use
+        for task in self.scheduled_tasks:
+            for name, units in self._demand(task).items():
+                busy[name] += units * (task.end_time - task.start_time)
+                changes[name][task.start_time] += units
+                changes[name][task.end_time] -= units
+
+        utilization = {}
+        for name, capacity in self.resources.capacities.items():
+            in_use = peak = 0
+            for _, change in sorted(changes[name].items()):
+                in_use += change
+                peak = max(peak, in_use)
+            utilization[name] = {
+                "capacity": capacity,
+                "busy_time": busy[name],
+                "utilization": busy[name] / (capacity * makespan) if capacity and makespan else 0.0,
+                "peak_in_use": peak
+            }
+        return utilization
+
+    def _log_task_state(self):
+        """Count a step and its ready-queue size; log a state summary at DEBUG every state_sample_every steps."""
+        self._steps += 1
+        ready = len(self.ready_tasks) + self._blocked_count
+        self.counters['ready_queue_total'] += ready
+        if ready > self.counters['ready_queue_max']:
+            self.counters['ready_queue_max'] = ready
+        if not self.state_sample_every or self._steps % self.state_sample_every:
+            return
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        logger.debug(
+            "Step %d at time %s: %d completed, %d in progress, %d ready, %d remaining",
+            self._steps, self.current_time, len(self.completed_tasks), len(self.in_progress), len(self.ready_tasks),
+            len(self.tasks) - len(self.completed_tasks) - len(self.in_progress)
+        )
+
+    def _log_full_task_state(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        ready_ids = {task.id for task in self.ready_tasks}
         for task_id, task in self.tasks.items():
             status = "Completed" if task_id in self.completed_tasks else \
                      "In Progress" if task_id in self.in_progress else \
-                     "Ready" if task in self.ready_tasks else "Not Ready"
-            print(f"Task {task_id}: {status}")
-            print(f"  Dependencies: {task.dependencies}")
-            print(f"  Required Resources: {task.required_resources}")
-            print(f"  Base Reward: {task.base_reward}")
-            print(f"  Required Time: {task.required_time}")
+                     "Ready" if task_id in ready_ids else "Not Ready"
+            logger.debug(
+                "Task %s: %s, dependencies=%s, required_resources=%s, base_reward=%s, required_time=%s",
+                task_id, status, task.dependencies, task.required_resources, task.base_reward, task.required_time
+            )
+
+    @contextmanager
+    def _phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            self.phase_timings[name] = self.phase_timings.get(name, 0.0) + seconds
+            if self.tracer.enabled:
+                self.tracer.emit("phase_finished", phase=name, seconds=seconds)
+
+    def metrics(self):
+        """Seconds spent in each phase of the last schedule() and the engine counters."""
+        counters = dict(self.counters)
+        counters['steps'] = self._steps
+        counters['tasks_scheduled'] = len(self.scheduled_tasks)
+        return {"phases": dict(self.phase_timings), "counters": counters}
 
     def schedule(self):
         try:
-            self._analyze_tasks()
-            self._validate_dependencies()
-            self._print_full_task_state()
-
-            cycles_broken = 0
-            while self._break_dependency_cycle():
-                cycles_broken += 1
-                print(f"Broke {cycles_broken} cycle(s)")
-
-            max_iterations = len(self.tasks) * 2
-            iteration = 0
-            while len(self.completed_tasks) < len(self.tasks) and iteration < max_iterations:
-                self._update_completed_tasks()
-                self._update_ready_tasks()
-                self._calculate_priorities()
-                self._assign_tasks()
-                self._advance_time()
-                self._print_task_state()
-                iteration += 1
-
-            if iteration >= max_iterations:
-                print("Warning: Reached maximum iterations. Scheduling might be incomplete.")
+            if self.tracer.enabled:
+                self.tracer.emit("schedule_started", tasks=len(self.tasks), engine=self.engine)
+            with self._phase('analysis'):
+                self._analyze_tasks()
+            with self._phase('priorities'):
+                self._prepare_priorities()
+            with self._phase('validation'):
+                self._validate_dependencies()
+                self._check_resources()
+                self._log_full_task_state()
+
+            with self._phase('cycles'):
+                cycles_broken = self._break_dependency_cycles()
+            self.counters['cycles_broken'] = cycles_broken
+            if cycles_broken:
+                logger.info("Broke %d cycle(s)", cycles_broken)
+            with self._phase('critical_path'):
+                self._analyze_critical_path()
 
+            with self._phase('engine'):
+                self._run_engine()
+            if self.tracer.enabled:
+                self.tracer.emit("schedule_finished", tasks_scheduled=len(self.scheduled_tasks),
+                                 makespan=self.makespan, total_reward=self.total_reward)
             return self.scheduled_tasks
 
         except Exception as e:
-            print(f"Error in scheduling process: {str(e)}")
-            print("Traceback:")
-            print(traceback.format_exc())
+            logger.exception("Error in scheduling process: %s", e)
             raise
 
+        finally:
+            self.tracer.close()
+
+    def _analyze_critical_path(self):
+        """
+        Time the now acyclic graph without resource limits and, if the
+        priority calculator weighs them, fold bottom levels and slack into
+        the task priorities.
+        """
+        self.task_store = TaskStore(self.tasks.values(), self.dependency_graph)
+        self.critical_path = CriticalPath(self.task_store)
+        self._priority_batch.apply_critical_path(self.critical_path, self.priority_calculator)
+        logger.info("Critical path length: %s (%d critical task(s))",
+                    self.critical_path.length, len(self.critical_path.critical_tasks()))
+
+    def _run_engine(self):
+        if self.engine == 'event':
+            self._run_event_engine()
+        else:
+            self._run_tick_engine()
+
+    def _run_tick_engine(self):
+        max_iterations = len(self.tasks) * 2
+        iteration = 0
+        while len(self.completed_tasks) < len(self.tasks) and iteration < max_iterations:
+            self._update_completed_tasks()
+            self._update_ready_tasks()
+            self._calculate_priorities()
+            self._assign_tasks()
+            self._advance_time()
+            self._log_task_state()
+            iteration += 1
+
+        if iteration >= max_iterations:
+            logger.warning("Reached maximum iterations. Scheduling might be incomplete.")
+
+    def _run_event_engine(self):
+        """
+        Event-driven equivalent of the tick engine. Readiness is tracked with
+        in-degree counters and time jumps straight to the next completion, so
+        tasks and edges are each touched once instead of once per tick. Ready
+        tasks that cannot get their resources are parked under the resource
+        they are short of and only reconsidered when that resource is released.
+        Priority ties are broken as the tick engine's queue breaks them (see
+        _QueuePlace), so both engines start the same tasks.
+        """
+        self._parking = {}
+        self._parking_complete = True
+        self._full_passes = []
+        self._step_times = []
+        self._requeued = 0
+        tasks = list(self.tasks.values())
+        store = self.task_store or TaskStore(tasks, self.dependency_graph)
+        in_degree = store.in_degrees()
+        ready = [tasks[i] for i, degree in enumerate(in_degree) if degree == 0]
+        if self.tracer.enabled:
+            for task in ready:
+                self.tracer.emit("task_ready", task=task.id, time=self.current_time)
+        self._event_loop(tasks, store, in_degree, ready, [])
+
+    def _event_loop(self, tasks, store, in_degree, ready, completions, blocked=None, ranks=None):
+        """
+        Run the event engine from the current state: in_degree counts unfinished
+        dependencies, ready holds the tasks that may start now, completions is
+        a min-heap of (end_time, task index) for the tasks in progress and
+        blocked maps resource names to the ready tasks parked until they are
+        released. ranks maps the index of each ready or parked task to its
+        rank (see _QueuePlace); by default they joined the queue at this step.
+        self._step_times holds the times of the steps already taken and
+        self._requeued the rank base of the last one whose scan reached every
+        parked task.
+        """
+        dependent_offsets, dependent_indices = store.dependent_offsets, store.dependent_indices
+        task_index = self._task_index
+        n = len(tasks)
+        blocked = defaultdict(list, blocked or {})  # resource name -> ready tasks waiting on it
+        self._blocked_count = sum(len(waiting) for waiting in blocked.values())
+        groups = self._priority_batch.tie_groups()
+        self._tie_groups = np.array(groups)
+        self._queue_places = [_QueuePlace(self, i, group) for i, group in enumerate(groups)]
+        self._tie_orders = {}  # pair of tie groups -> what _last_difference has scanned
+        rank = self._ranks = [0] * n
+        step = len(self._step_times)
+        for task in itertools.chain(ready, *blocked.values()):
+            index = task_index[task.id]
+            rank[index] = step * n + index if ranks is None else ranks[index]
+
+        while len(self.completed_tasks) < len(self.tasks):
+            self._step_times.append(self.current_time)
+            while completions and completions[0][0] <= self.current_time:
+                _, i = heapq.heappop(completions)
+                task = tasks[i]
+                self._complete_task(task.id)
+                for name in self._demand(task):
+                    if name in blocked:
+                        unblocked = blocked.pop(name)
+                        self._blocked_count -= len(unblocked)
+                        for waiting in unblocked:
+                            self._requeue_if_passed(waiting, name)
+                            self._parking[waiting.id].append((self.current_time, None))
+                        ready.extend(unblocked)
+                for k in range(dependent_offsets[i], dependent_offsets[i + 1]):
+                    dependent = dependent_indices[k]
+                    in_degree[dependent] -= 1
+                    if in_degree[dependent] == 0:
+                        rank[dependent] = step * n + dependent
+                        ready.append(tasks[dependent])
+                        if self.tracer.enabled:
+                            self.tracer.emit("task_ready", task=tasks[dependent].id, time=self.current_time)
+
+            # Tasks the scan cannot start rejoin the queue at the next step
+            self._requeue_rank = (step + 1) * n
+            ready, started = self._assign_by_priority(ready, blocked)
+            self.ready_tasks = ready
+            for task in started:
+                heapq.heappush(completions, (task.end_time, self._task_index[task.id]))
+
+            if not completions:
+                if len(self.completed_tasks) < len(self.tasks):
+                    logger.warning("No runnable tasks left. Scheduling might be incomplete.")
+                break
+            step += 1
+            self.current_time = completions[0][0]
+            self._log_task_state()
+
+    def _assign_by_priority(self, ready, blocked):
+        """
+        Start ready tasks in priority order while resources remain, skipping
+        past tasks that cannot be started into the blocked index. Ties go to
+        the task ahead in the tick engine's queue. Returns the tasks still to
+        be considered once the pool is no longer empty, and the tasks started.
+        """
+        rank = self._ranks
+        indices = [self._task_index[task.id] for task in ready]
+        priorities = self._priority_batch.priorities(self.current_time, indices)
+        mixed = self._ties_across_groups(priorities, indices)
+        if mixed is None:
+            heap = [(-priority, rank[index], task) for task, index, priority in zip(ready, indices, priorities.tolist())]
+        else:
+            # Tasks sharing a priority with another tie group compare by place, the rest by rank
+            places = self._queue_places
+            heap = [(-priority, places[index] if across else rank[index], task)
+                    for task, index, priority, across in zip(ready, indices, priorities.tolist(), mixed.tolist())]
+        for entry in heap:
+            entry[2].current_priority = -entry[0]
+        heapq.heapify(heap)
+
+        started = []
+        scanned = bool(self.resources)
+        stop = None  # key of the task whose start emptied the pool
+        while heap and self.resources:
+            negated, _, task = heapq.heappop(heap)
+            index = self._task_index[task.id]
+            demand = self._demand(task)
+            missing = self.resources.shortfall(demand)
+            if missing is None:
+                self.resources.try_acquire(demand)
+                self._start_task(task)
+                started.append(task)
+                if not self.resources:
+                    stop = (negated, self._queue_places[index])
+            else:
+                rank[index] = self._requeue_rank + index
+                blocked[missing].append(task)
+                self._blocked_count += 1
+                self._parking.setdefault(task.id, []).append((self.current_time, missing))
+                self.counters['resource_waits'] += 1
+                if self.tracer.enabled:
+                    self.tracer.emit("resource_wait", task=task.id, resource=missing, time=self.current_time)
+        if stop is not None:
+            self._requeue_scanned(blocked, stop)
+        elif scanned and self._blocked_count:
+            # The scan reached every parked task; their ranks catch up when next needed
+            self._requeued = self._requeue_rank
+            self._full_passes.append(self.current_time)
+        return [entry[2] for entry in heap], started
+
+    def _ties_across_groups(self, priorities, indices):
+        """
+        Mask of the tasks at indices whose priority another tie group shares,
+        or None if there are none.
+        """
+        if len(indices) < 2:
+            return None
+        groups = self._tie_groups[indices]
+        order = np.lexsort((groups, priorities))
+        sorted_priorities, sorted_groups = priorities[order], groups[order]
+        tied = sorted_priorities[1:] == sorted_priorities[:-1]
+        across = tied & (sorted_groups[1:] != sorted_groups[:-1])
+        if not across.any():
+            return None
+        runs = np.concatenate(([0], np.cumsum(~tied)))  # equal priorities share a run number
+        mixed = np.empty(len(order), dtype=bool)
+        mixed[order] = np.isin(runs, runs[1:][across])
+        return mixed
+
+    def _requeue_if_passed(self, task, name):
+        """Move a parked task behind the last scan that reached every parked task, if it is not already."""
+        index = self._task_index[task.id]
+        if self._ranks[index] < self._requeued + index:
+            self._ranks[index] = self._requeued + index
+            self._parking[task.id].append((self._full_passes[-1], name))
+
+    def _requeue_scanned(self, blocked, stop):
+        """
+        Move the parked tasks ahead of stop, where the tick engine's scan
+        stopped this step, to the back of the queue as the scan would have.
+        """
+        rank, places = self._ranks, self._queue_places
+        waiting = [(name, task, self._task_index[task.id]) for name, tasks in blocked.items() for task in tasks]
+        if not waiting:
+            return
+        priorities = self._priority_batch.priorities(self.current_time, [entry[2] for entry in waiting]).tolist()
+        for (name, task, index), priority in zip(waiting, priorities):
+            if rank[index] == self._requeue_rank + index:
+                continue  # parked by this scan
+            self._requeue_if_passed(task, name)
+            if (-priority, places[index]) < stop:
+                rank[index] = self._requeue_rank + index
+                self._parking[task.id].append((self.current_time, name))
+
+    def _queued_before(self, first, second):
+        """
+        Whether the tick engine's queue holds the task at index first ahead of
+        the one at second, two tasks of different tie groups with equal
+        priorities at this step. The queue is re-sorted by priority at each
+        step without reordering ties, so the last earlier step at which both
+        were queued and their priorities differed decides, and their ranks
+        only if there was none.
+        """
+        rank, n = self._ranks, len(self._ranks)
+        joined = max(rank[first], rank[second]) // n
+        step, higher = self._last_difference(first, second, joined)
+        if step >= joined:
+            return higher
+        return rank[first] < rank[second]
+
+    def _last_difference(self, first, second, since):
+        """
+        (step, whether first's priority was the higher) for the last step
+        before this one at which the priorities of the tasks at first and
+        second differed, or (-1, None) if they did not at any step from since.
+        Priorities only depend on the tie group, so what has been scanned is
+        kept per pair of groups and each step is looked at once per pair.
+        """
+        batch = self._priority_batch
+        flip = self._queue_places[first].group > self._queue_places[second].group
+        if flip:
+            first, second = second, first
+        pair = (self._queue_places[first].group, self._queue_places[second].group)
+        current = len(self._step_times) - 1
+        # Steps low to checked have been scanned; differed is the last of them with different priorities
+        low, checked, differed, higher = self._tie_orders.get(pair, (current, current - 1, -1, None))
+        for step in range(checked + 1, current):
+            first_priority = batch.priority(first, self._step_times[step])
+            second_priority = batch.priority(second, self._step_times[step])
+            if first_priority != second_priority:
+                differed, higher = step, first_priority > second_priority
+        if differed < 0:
+            for step in range(low - 1, since - 1, -1):
+                first_priority = batch.priority(first, self._step_times[step])
+                second_priority = batch.priority(second, self._step_times[step])
+                if first_priority != second_priority:
+                    differed, higher = step, first_priority > second_priority
+                    break
+            low = min(low, max(since, differed))
+        self._tie_orders[pair] = (low, current - 1, differed, higher)
+        return differed, higher if differed < 0 or not flip else not higher
+
     def _analyze_tasks(self):
         tasks = list(self.tasks.values())
-        analyzed_tasks = self.llm_analyzer.analyze_batch(tasks)
+        on_task_analyzed = None
+        if self.tracer.enabled:
+            analyzed = itertools.count(1)
+            # May be called from the analyzer's worker threads
+            on_task_analyzed = lambda task: self.tracer.emit(
+                "analysis_progress", task=task.id, analyzed=next(analyzed), total=len(tasks))
+        analyzed_tasks = self.analyzer.analyze_batch(tasks, on_task_analyzed)
+        self.counters['analysis_provisional'] = getattr(self.analyzer, 'provisional', 0)
         if analyzed_tasks:
             self.tasks = {task.id: task for task in analyzed_tasks}
+        self._fill_missing_analysis()
+
+    def _fill_missing_analysis(self):
+        missing = [task for task in self.tasks.values() if task.llm_analysis is None]
+        if missing:
+            logger.warning("No analysis for %d task(s), using heuristic estimates", len(missing))
+            dependents = HeuristicAnalyzer.dependent_counts(self.tasks.values())
+            for task in missing:
+                task.llm_analysis = HeuristicAnalyzer.estimate(task, dependents[task.id])
+
+    def _prepare_priorities(self):
+        """Snapshot priority inputs once analysis is done, indexed in task order."""
+        self._task_index = {task_id: i for i, task_id in enumerate(self.tasks)}
+        self._priority_batch = self.priority_calculator.prepare_batch(list(self.tasks.values()))
 
     def _update_completed_tasks(self):
         completed = [task_id for task_id, end_time in self.in_progress.items() if end_time <= self.current_time]
         for task_id in completed:
-            self.completed_tasks.add(task_id)
-            del self.in_progress[task_id]
-            task = self.tasks[task_id]
-            self.resources.extend(task.required_resources)
+            self._complete_task(task_id)
+
+    def _complete_task(self, task_id):
+        self.completed_tasks.add(task_id)
+        del self.in_progress[task_id]
+        task = self.tasks[task_id]
+        self.resources.release(self._demand(task))
+        if self.tracer.enabled:
+            self.tracer.emit("task_finished", task=task_id, time=task.end_time)
 
     def _update_ready_tasks(self):
-        print("\nUpdating ready tasks:")
         for task in self.tasks.values():
             if task.id not in self.completed_tasks and task.id not in self.in_progress:
                 unmet_dependencies = [dep for dep in task.dependencies if dep not in self.completed_tasks]
                 if not unmet_dependencies:
                     if task not in self.ready_tasks:
                         self.ready_tasks.append(task)
-                        print(f"Task {task.id} is now ready")
-                else:
-                    print(f"Task {task.id} is not ready. Unmet dependencies: {unmet_dependencies}")
+                        if self.tracer.enabled:
+                            self.tracer.emit("task_ready", task=task.id, time=self.current_time)
 
     def _calculate_priorities(self):
-        for task in self.ready_tasks:
-            task.current_priority = self.priority_calculator.calculate(task, self.current_time, task.llm_analysis)
+        indices = [self._task_index[task.id] for task in self.ready_tasks]
+        priorities = self._priority_batch.priorities(self.current_time, indices).tolist()
+        for task, priority in zip(self.ready_tasks, priorities):
+            task.current_priority = priority
 
     def _assign_tasks(self):
         self.ready_tasks = deque(sorted(self.ready_tasks, key=lambda x: x.current_priority, reverse=True))
         while self.ready_tasks and self.resources:
             task = self.ready_tasks.popleft()
-            if all(resource in self.resources for resource in task.required_resources):
-                for resource in task.required_resources:
-                    self.resources.remove(resource)
-                task.start_time = self.current_time
-                task.end_time = self.current_time + task.required_time
-                self.in_progress[task.id] = task.end_time
-                task.actual_reward = self.priority_calculator.calculate_reward(task, self.current_time)
-                self.scheduled_tasks.append(task)
+            if self.resources.try_acquire(self._demand(task)):
+                self._start_task(task)
+                continue
+            self.counters['resource_waits'] += 1
+            if self.tracer.enabled:
+                self.tracer.emit("resource_wait", task=task.id, resource=self.resources.shortfall(self._demand(task)), time=self.current_time)
+
+    def _demand(self, task):
+        demand = self._demands.get(task.id)
+        if demand is None:
+            demand = self._demands[task.id] = ResourcePool.demand(task.required_resources)
+        return demand
+
+    def _start_task(self, task):
+        task.start_time = self.current_time
+        task.end_time = self.current_time + task.required_time
+        self.in_progress[task.id] = task.end_time
+        task.actual_reward = self.priority_calculator.calculate_reward(task, self.current_time)
+        self.scheduled_tasks.append(task)
+        self.makespan = max(self.makespan, task.end_time)
+        self.total_reward += task.actual_reward
+        if self.tracer.enabled:
+            self.tracer.emit("task_started", task=task.id, time=task.start_time, end_time=task.end_time,
+                             resources=task.required_resources, reward=task.actual_reward,
+                             makespan=self.makespan, total_reward=self.total_reward)
 
     def _advance_time(self):
         if self.in_progress:
             self.current_time = min(self.in_progress.values())
         else:
             self.current_time += 1
-        print(f"Advanced time to {self.current_time}")
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Advanced time to %s", self.current_time)
\ No newline at end of file
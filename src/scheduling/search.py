@@ -0,0 +1,267 @@
+import logging
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import numpy as np
+from ..analysis.analyzer import TaskAnalyzer
+from ..models.task import Task
+from .priority import PriorityCalculator
+from .scheduler import Scheduler
+from .tracing import EventTracer
+from ..config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+OBJECTIVES = ('total_time', 'total_reward', 'reward_per_time')
+WEIGHT_GRID = ((0.0, 0.0), (1.0, 0.0), (0.0, 1.0), (2.0, 1.0), (4.0, 0.0), (0.0, 4.0), (4.0, 4.0))
+WEIGHT_CHOICES = (0.0, 0.5, 1.0, 2.0, 4.0, 8.0)
+NOISE_CHOICES = (0.02, 0.05, 0.1, 0.2)
+
+
+def objective_score(objective, total_time, total_reward, complete=True):
+    """Sort key for a schedule under objective; higher is better."""
+    if not complete:
+        return (-math.inf,)
+    if objective == 'total_time':
+        return (-total_time, total_reward)
+    if objective == 'total_reward':
+        return (total_reward, -total_time)
+    if objective == 'reward_per_time':
+        return (total_reward / total_time if total_time else 0.0, -total_time)
+    raise ValueError(f"Unknown search objective: {objective}")
+
+
+def variant_is_plain(variant):
+    return not variant['noise'] and not variant['swaps']
+
+
+def make_variant(bottom_level_weight=0.0, slack_weight=0.0, noise=0.0, seed=0, swaps=()):
+    return {
+        "bottom_level_weight": bottom_level_weight,
+        "slack_weight": slack_weight,
+        "noise": noise,
+        "seed": seed,
+        "swaps": tuple(swaps)
+    }
+
+
+class _StopAtPassed(Exception):
+    pass
+
+
+class _PrecomputedAnalysis(TaskAnalyzer):
+    """Keeps the analysis the tasks already carry."""
+
+    def analyze_batch(self, tasks, on_task_analyzed=None):
+        return tasks
+
+
+class VariantScheduler(Scheduler):
+    """
+    Event-engine scheduler for one search variant. A variant sets the
+    critical-path priority weights and perturbs the priority order: noise
+    multiplies every task's priority by a seeded random factor, and each swap
+    exchanges the time-zero priorities of two tasks. With stop_at (a
+    time.time() value) the engine gives up once it is passed, leaving the
+    schedule incomplete and timed_out set.
+    """
+
+    def __init__(self, tasks, resources, variant, stop_at=None):
+        super().__init__(tasks, resources, engine='event', analyzer=_PrecomputedAnalysis(), tracer=EventTracer())
+        self.variant = variant
+        self.stop_at = stop_at
+        self.timed_out = False
+        self.priority_calculator = PriorityCalculator(variant['bottom_level_weight'], variant['slack_weight'])
+
+    def _run_engine(self):
+        try:
+            super()._run_engine()
+        except _StopAtPassed:
+            self.timed_out = True
+
+    def _assign_by_priority(self, ready, blocked):
+        if self.stop_at is not None and time.time() >= self.stop_at:
+            raise _StopAtPassed()
+        return super()._assign_by_priority(ready, blocked)
+
+    def _analyze_critical_path(self):
+        super()._analyze_critical_path()
+        n = len(self.tasks)
+        if variant_is_plain(self.variant) or not n:
+            return
+        bias = np.ones(n)
+        if self.variant['noise']:
+            rng = np.random.default_rng(self.variant['seed'])
+            bias += self.variant['noise'] * rng.uniform(-1.0, 1.0, n)
+        if self.variant['swaps']:
+            base = self._priority_batch.priorities(0) * bias
+            for i, j in self.variant['swaps']:
+                if base[i] > 0 and base[j] > 0:
+                    bias[i] *= base[j] / base[i]
+                    bias[j] *= base[i] / base[j]
+                    base[i], base[j] = base[j], base[i]
+        self._priority_batch.apply_bias(bias)
+
+
+# Read-only project data, set once per worker process by _init_worker
+_worker_tasks = None
+_worker_resources = None
+
+
+def _init_worker(task_data, resources):
+    global _worker_tasks, _worker_resources
+    _worker_tasks = task_data
+    _worker_resources = resources
+    logging.getLogger('src.scheduling').setLevel(logging.WARNING)
+
+
+def _build_tasks(task_data):
+    tasks = []
+    for data in task_data:
+        task = Task.from_input_dict(data)
+        task.llm_analysis = data['llm_analysis']
+        tasks.append(task)
+    return tasks
+
+
+def _evaluate(variant, stop_at):
+    """Score of variant, or None if the deadline passed before it could start."""
+    if time.time() >= stop_at:
+        return None  # queued past the deadline: not worth building and analyzing its tasks
+    scheduler = VariantScheduler(_build_tasks(_worker_tasks), _worker_resources, variant, stop_at)
+    scheduled = scheduler.schedule()
+    complete = not scheduler.timed_out and len(scheduled) == len(_worker_tasks)
+    total_time = max((task.end_time for task in scheduled), default=0)
+    total_reward = sum(task.actual_reward for task in scheduled)
+    order = [scheduler._task_index[task.id] for task in scheduled]
+    return variant, complete, total_time, total_reward, order
+
+
+class ScheduleSearch:
+    """
+    Multi-strategy schedule search. A normal greedy pass analyzes the tasks
+    and gives the baseline. Variants of it are then scheduled in a process
+    pool until the time budget runs out: a grid of critical-path priority
+    weightings, random weightings with randomized tie-breaking, and local
+    search that swaps tasks the best variant so far starts next to each
+    other. Workers receive the analyzed project once, at start-up, and return
+    only scores and start orders; the best variant is replayed here to build
+    its schedule. Variants that start after the deadline are skipped and
+    running ones stop at it, so the search ends with it.
+    """
+
+    def __init__(self, objective=None, time_budget=None, max_workers=None, seed=None):
+        search_config = CONFIG.get('search', {})
+        self.objective = objective or search_config.get('objective', 'total_time')
+        if self.objective not in OBJECTIVES:
+            raise ValueError(f"Unknown search objective: {self.objective}")
+        self.time_budget = search_config.get('time_budget', 5.0) if time_budget is None else time_budget
+        self.max_workers = max_workers or search_config.get('max_workers', 0) or os.cpu_count() or 1
+        self.local_search_ratio = search_config.get('local_search_ratio', 0.5)
+        self.seed = search_config.get('seed', 0) if seed is None else seed
+        self.summary = None
+
+    def run(self, tasks, resources):
+        """Return the scheduler holding the best schedule found."""
+        started_at = time.monotonic()
+        baseline = Scheduler(tasks, resources)
+        baseline.schedule()
+        best_scheduler = baseline
+        best_score = self._score(baseline.scheduled_tasks, len(baseline.tasks))
+        baseline_totals = self._totals(baseline.scheduled_tasks)
+
+        task_data = []
+        for task in baseline.tasks.values():
+            data = task.to_input_dict()
+            data['llm_analysis'] = task.llm_analysis
+            task_data.append(data)
+
+        best_variant = None
+        evaluated = 0
+        deadline = started_at + self.time_budget
+        if task_data and time.monotonic() < deadline:
+            start_order = [baseline._task_index[task.id] for task in baseline.scheduled_tasks]
+            best_variant, variant_score, evaluated = self._search(task_data, resources, start_order, deadline)
+            if best_variant is not None and variant_score > best_score:
+                best_scheduler = VariantScheduler(_build_tasks(task_data), resources, best_variant)
+                best_scheduler.schedule()
+                best_scheduler.counters['analysis_provisional'] = baseline.counters['analysis_provisional']
+            else:
+                best_variant = None
+
+        total_time, total_reward = self._totals(best_scheduler.scheduled_tasks)
+        self.summary = {
+            "objective": self.objective,
+            "variants_evaluated": evaluated,
+            "workers": self.max_workers,
+            "elapsed": time.monotonic() - started_at,
+            "baseline": {"total_time": baseline_totals[0], "total_reward": baseline_totals[1]},
+            "best_variant": {**best_variant, "swaps": [list(pair) for pair in best_variant['swaps']]}
+            if best_variant else None
+        }
+        logger.info("Schedule search: %d variant(s) in %.2fs, total_time %s -> %s, total_reward %.2f -> %.2f",
+                    evaluated, self.summary['elapsed'], baseline_totals[0], total_time,
+                    baseline_totals[1], total_reward)
+        return best_scheduler
+
+    def _search(self, task_data, resources, start_order, deadline):
+        rng = random.Random(self.seed)
+        grid = [make_variant(bw, sw) for bw, sw in WEIGHT_GRID]
+        best_variant, best_score, best_order, evaluated = None, (-math.inf,), start_order, 0
+        # The deadline as wall-clock time, which the worker processes share
+        stop_at = time.time() + (deadline - time.monotonic())
+        pending = set()
+        # Not forked: the search runs inside a multi-threaded server
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                       initargs=(task_data, resources),
+                                       mp_context=multiprocessing.get_context("forkserver"))
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                while len(pending) < 2 * self.max_workers:
+                    variant = grid.pop(0) if grid else self._next_variant(rng, best_variant, best_order)
+                    pending.add(executor.submit(_evaluate, variant, stop_at))
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.warning("Schedule variant failed: %s", e)
+                        continue
+                    if result is None:
+                        continue
+                    variant, complete, total_time, total_reward, order = result
+                    evaluated += 1
+                    score = objective_score(self.objective, total_time, total_reward, complete)
+                    if score > best_score:
+                        best_variant, best_score, best_order = variant, score, order
+        finally:
+            # Variants still running stop at stop_at themselves
+            executor.shutdown(wait=True, cancel_futures=True)
+        return best_variant, best_score, evaluated
+
+    def _next_variant(self, rng, best_variant, best_order):
+        """best_order holds the task indices of best_variant's schedule in start order."""
+        if best_variant is not None and len(best_order) > 1 and rng.random() < self.local_search_ratio:
+            swaps = list(best_variant['swaps'])
+            for _ in range(rng.randint(1, 3)):
+                position = rng.randrange(len(best_order) - 1)
+                other = min(len(best_order) - 1, position + rng.randint(1, 3))
+                swaps.append((best_order[position], best_order[other]))
+            return {**best_variant, "swaps": tuple(swaps)}
+        return make_variant(rng.choice(WEIGHT_CHOICES), rng.choice(WEIGHT_CHOICES),
+                            rng.choice(NOISE_CHOICES), rng.randrange(2 ** 32))
+
+    def _score(self, scheduled_tasks, task_count):
+        total_time, total_reward = self._totals(scheduled_tasks)
+        return objective_score(self.objective, total_time, total_reward, len(scheduled_tasks) == task_count)
+
+    @staticmethod
+    def _totals(scheduled_tasks):
+        return max((task.end_time for task in scheduled_tasks), default=0), \
+            sum(task.actual_reward for task in scheduled_tasks)
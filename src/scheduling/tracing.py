@@ -0,0 +1,72 @@
+import json
+import logging
+import threading
+from ..config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class EventTracer:
+    """
+    Optional machine-readable stream of scheduler events (task_ready,
+    task_started, task_finished, resource_wait, ...), one JSON object per line
+    in a file and/or handed to listeners as dicts. Disabled unless a path or
+    a listener is given; callers should check `enabled` before building event
+    fields so a normal run pays nothing.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._write_file = bool(path)
+        self._listeners = []
+        self.enabled = self._write_file
+        self._file = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        return cls(CONFIG.get('tracing', {}).get('event_stream') or None)
+
+    def add_listener(self, listener):
+        """Call listener(record) with every event from now on, on the scheduler's thread."""
+        with self._lock:
+            self._listeners.append(listener)
+            self.enabled = True
+
+    def remove_listener(self, listener):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+            self.enabled = self._write_file or bool(self._listeners)
+
+    def emit(self, event, **fields):
+        if not self.enabled:
+            return
+        record = {"event": event, **fields}
+        if self._write_file:
+            self._write(record)
+        for listener in list(self._listeners):
+            try:
+                listener(record)
+            except Exception as e:
+                logger.warning("Removing failing scheduler event listener: %s", e)
+                self.remove_listener(listener)
+
+    def _write(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            if self._file is None:
+                try:
+                    self._file = open(self.path, 'a', buffering=1024 * 1024)
+                except OSError as e:
+                    logger.warning("Disabling scheduler event stream %s: %s", self.path, e)
+                    self._write_file = False
+                    self.enabled = bool(self._listeners)
+                    return
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
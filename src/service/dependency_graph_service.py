@@ -1,30 +1,89 @@
 import os
-from ..data.loader import load_project_data
+import threading
+from ..data.indexes import AdjacencyIndex
+from ..data.loader import load_project
+from ..data.project_store import DEFAULT_PROJECT_ID, project_output_path
 from ..models.task import Task
-from ..visualization.dependency_graph import DependencyGraphVisualizer
-from ..config import CONFIG
+from ..visualization.graph_layout import svg_path
+
+GRAPH_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
 
 class DependencyGraphService:
+    # Adjacency index over the last project version queried per project, as (project_data, AdjacencyIndex)
+    _indexes = {}
+    _index_lock = threading.Lock()
+
     @staticmethod
     def _generate_graph(tasks, output_file):
+        # networkx and Pillow are only loaded once a graph is drawn
+        from ..visualization.dependency_graph import DependencyGraphVisualizer
         G = DependencyGraphVisualizer.create_graph(tasks)
         DependencyGraphVisualizer.visualize(G, output_file)
         return output_file
 
     @classmethod
-    def generate_from_file(cls):
-        """Generate dependency graph from local file"""
-        input_file = CONFIG['paths']['project_input']
-        output_file = CONFIG['paths']['dependency_graph']
-        
-        project_data = load_project_data(input_file)
+    def generate_from_file(cls, project_id=DEFAULT_PROJECT_ID):
+        """Generate dependency graph from the stored project"""
+        output_file = project_output_path('dependency_graph', project_id)
+        os.makedirs(os.path.dirname(output_file), exist_ok=True)
+
+        project_data = load_project(project_id)
         tasks = [Task.from_input_dict(task) for task in project_data['tasks']]
         return cls._generate_graph(tasks, output_file)
 
     @classmethod
-    def get_graph_file(cls):
-        """Retrieve the dependency graph file path"""
-        file_path = CONFIG['paths']['dependency_graph']
+    def get_graph_file(cls, project_id=DEFAULT_PROJECT_ID, image_format='png'):
+        """Retrieve the dependency graph file path (PNG, or its SVG twin)"""
+        if image_format not in GRAPH_FORMATS:
+            raise ValueError(f"Unsupported dependency graph format: {image_format}")
+        file_path = project_output_path('dependency_graph', project_id)
+        if image_format == 'svg':
+            file_path = svg_path(file_path)
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Dependency graph not found: {file_path}")
-        return file_path
\ No newline at end of file
+        return file_path
+
+
+    @classmethod
+    def _adjacency_index(cls, project_id):
+        project_data = load_project(project_id)
+        with cls._index_lock:
+            cached = cls._indexes.get(project_id)
+            if cached is not None and cached[0] is project_data:
+                return cached[1]
+        index = AdjacencyIndex(project_data['tasks'])
+        with cls._index_lock:
+            cls._indexes[project_id] = (project_data, index)
+        return index
+
+    @classmethod
+    def query_nodes(cls, project_id=DEFAULT_PROJECT_ID, task_id=None, depth=1, direction='both', offset=0, limit=50):
+        """
+        One page of the dependency graph: every task in project order, or with
+        task_id the tasks within depth hops of it, nearest first. Edges link
+        the page's tasks to each other and to tasks on earlier pages.
+        """
+        index = cls._adjacency_index(project_id)
+        if task_id is None:
+            total = len(index)
+            page = list(range(offset, min(total, offset + limit)))
+            nodes = [{"id": index.ids[node], "title": index.titles[node]} for node in page]
+            edges = index.edges_to_earlier(page)
+        else:
+            matches = index.neighbourhood(task_id, depth, direction)
+            total = len(matches)
+            rank = {node: i for i, (node, _) in enumerate(matches[:offset + limit])}
+            page_matches = matches[offset:offset + limit]
+            page = [node for node, _ in page_matches]
+            nodes = [
+                {"id": index.ids[node], "title": index.titles[node], "distance": distance}
+                for node, distance in page_matches
+            ]
+            edges = index.edges_to_earlier(page, rank)
+        return {
+            "nodes": nodes,
+            "edges": [{"source": source, "target": target} for source, target in edges],
+            "total": total,
+            "offset": offset,
+            "limit": limit
+        }
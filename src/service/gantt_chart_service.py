@@ -1,31 +1,74 @@
-import json
 import os
+import threading
+from .scheduler_service import SchedulerService
 from ..visualization.gantt_chart import GanttChartVisualizer
-from ..models.task import Task
-from ..config import CONFIG
+from ..data.indexes import ScheduleIndex
+from ..data.serialization import iter_items, read_document, read_header
+from ..data.project_store import DEFAULT_PROJECT_ID, project_output_path
 
 class GanttChartService:
-    @staticmethod
-    def _generate_chart(scheduled_tasks, output_file):
-        GanttChartVisualizer.create_chart(scheduled_tasks, output_file)
-        return output_file
+    # Index over the last schedule result queried per project, as (result, ScheduleIndex)
+    _indexes = {}
+    _index_lock = threading.Lock()
 
     @classmethod
-    def generate_from_file(cls):
-        """Generate Gantt chart data from local file"""
-        input_file = CONFIG['paths']['schedule_output']
-        output_file = CONFIG['paths']['gantt_chart']
+    def generate_from_file(cls, project_id=DEFAULT_PROJECT_ID):
+        """
+        Generate Gantt chart data from the stored schedule. Scheduling already
+        writes it, so this only streams the schedule's tasks into a new chart
+        when the chart is missing or older than the schedule.
+        """
+        input_file = project_output_path('schedule_output', project_id)
+        output_file = project_output_path('gantt_chart', project_id)
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"Schedule output not found: {input_file}")
+        if os.path.exists(output_file) and os.path.getmtime(output_file) >= os.path.getmtime(input_file):
+            return output_file
 
-        with open(input_file, 'r') as f:
-            scheduled_tasks_data = json.load(f)
-        scheduled_tasks = [Task.from_output_dict(task_data) for task_data in scheduled_tasks_data['scheduled_tasks']]
-        return cls._generate_chart(scheduled_tasks, output_file)
+        total_time = read_header(input_file, 'scheduled_tasks')['total_time']
+        GanttChartVisualizer.create_chart(iter_items(input_file, 'scheduled_tasks'), output_file, total_time)
+        return output_file
 
     @classmethod
-    def get_chart_data(cls):
-        """Retrieve the Gantt chart data"""
-        file_path = CONFIG['paths']['gantt_chart']
+    def get_chart_file(cls, project_id=DEFAULT_PROJECT_ID):
+        """Path of the Gantt chart data (a document with its tasks one per line)"""
+        file_path = project_output_path('gantt_chart', project_id)
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Gantt chart data not found: {file_path}")
-        with open(file_path, 'r') as f:
-            return json.load(f)
\ No newline at end of file
+        return file_path
+
+    @classmethod
+    def get_chart_data(cls, project_id=DEFAULT_PROJECT_ID):
+        """Retrieve the Gantt chart data"""
+        return read_document(cls.get_chart_file(project_id))
+
+    @classmethod
+    def _schedule_index(cls, project_id):
+        result, _ = SchedulerService.get_cached_result(project_id)
+        if result is None:
+            raise FileNotFoundError(f"No schedule for the current version of project {project_id}")
+        with cls._index_lock:
+            cached = cls._indexes.get(project_id)
+            if cached is not None and cached[0] is result:
+                return result, cached[1]
+        index = ScheduleIndex(result['scheduled_tasks'])
+        with cls._index_lock:
+            cls._indexes[project_id] = (result, index)
+        return result, index
+
+    @classmethod
+    def query_tasks(cls, project_id=DEFAULT_PROJECT_ID, start=None, end=None, resource=None, offset=0, limit=50):
+        """
+        One page of the Gantt tasks of the project's current schedule that are
+        active in [start, end) (schedule time units) and, if given, use resource
+        """
+        result, index = cls._schedule_index(project_id)
+        matches = index.query(start, end, resource)
+        page = matches[offset:offset + limit]
+        return {
+            "tasks": [GanttChartVisualizer.task_data(task) for task in page],
+            "total": len(matches),
+            "offset": offset,
+            "limit": limit,
+            **GanttChartVisualizer.chart_header(result['total_time'])
+        }
@@ -0,0 +1,165 @@
+import hashlib
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from ..analysis.cache import AnalysisCache
+from .metrics_service import MetricsRegistry
+from ..config import CONFIG
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind, key):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.error_type = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self):
+        status = self.status
+        if status == "queued" and self.future is not None and self.future.running():
+            status = "running"
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobQueue:
+    """
+    In-process job runner for slow endpoints. Work runs on a thread or process
+    pool with a bounded number of outstanding jobs; submitting work whose key
+    matches a job that is still queued or running returns that job instead of
+    starting a duplicate. Finished jobs are kept for polling up to a limit.
+    Process workers are started from a fork server rather than forked from
+    the (multi-threaded) API process, and send the metrics a job recorded
+    back with its result.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_workers=2, max_pending=32, max_finished=200, executor="process"):
+        self._in_workers = executor == "process"
+        if executor == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers,
+                                                 mp_context=multiprocessing.get_context("forkserver"))
+        elif executor == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        else:
+            raise ValueError(f"Unknown job executor: {executor}")
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._jobs = OrderedDict()
+        self._in_flight = {}  # dedupe key -> job
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                jobs_config = CONFIG.get('jobs', {})
+                cls._instance = cls(
+                    max_workers=jobs_config.get('max_workers', 2),
+                    max_pending=jobs_config.get('max_pending', 32),
+                    max_finished=jobs_config.get('max_finished', 200),
+                    executor=jobs_config.get('executor', 'process')
+                )
+            return cls._instance
+
+    def submit(self, kind, func, *args, key=None):
+        """Queue func(*args) and return its Job. Raises JobQueueFull when saturated."""
+        key = key or (kind, uuid.uuid4().hex)
+        with self._lock:
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing
+            if len(self._in_flight) >= self.max_pending:
+                raise JobQueueFull(f"Too many pending jobs ({self.max_pending})")
+            job = Job(kind, key)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+            if self._in_workers:
+                job.future = self._executor.submit(_run_in_worker, func, *args)
+            else:
+                job.future = self._executor.submit(func, *args)
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _finish(self, job, future):
+        error = future.exception()
+        result = None
+        if error is None:
+            result = future.result()
+            if self._in_workers:
+                result, error, metrics = result
+                MetricsRegistry.instance().merge(metrics)
+        with self._lock:
+            if error is None:
+                job.result = result
+                job.status = "succeeded"
+            else:
+                job.error = str(error)
+                job.error_type = type(error).__name__
+                job.status = "failed"
+            job.finished_at = time.time()
+            self._in_flight.pop(job.key, None)
+            self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+def _run_in_worker(func, *args):
+    """
+    Run func(*args) in a job worker process and return (result, error,
+    metrics): what it returned or raised, and everything it recorded in the
+    worker's metrics registry and LLM cache counts, for the API process to
+    merge into its own. Workers run one job at a time.
+    """
+    registry = MetricsRegistry.instance()
+    registry.reset()
+    caches_before = AnalysisCache.all_stats()
+    result = error = None
+    try:
+        result = func(*args)
+    except Exception as e:
+        error = e
+    for path, stats in AnalysisCache.all_stats().items():
+        before = caches_before.get(path, {"hits": 0, "misses": 0})
+        registry.add_cache_counts(path, stats["hits"] - before["hits"], stats["misses"] - before["misses"])
+    return result, error, registry.snapshot()
+
+
+def file_digest(path):
+    """Content hash of an input file, used as a de-duplication key."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
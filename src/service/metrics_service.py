@@ -0,0 +1,217 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from ..analysis.cache import AnalysisCache
+
+
+@contextmanager
+def timed(timings, name):
+    """Add the seconds spent in the block to timings[name]."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters, gauges and timing summaries for scheduling runs,
+    rendered in the Prometheus text exposition format. Values are kept per
+    process; jobs run in a process pool send a snapshot of what they recorded
+    back with their result, which is merged here (see JobQueue).
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}  # name -> (type, help)
+        self._values = {}  # (name, labels) -> value, or [count, sum] for summaries
+        self._cache_counts = {}  # LLM cache path -> [hits, misses] counted in job worker processes
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _key(self, name, kind, help_text, labels):
+        self._metrics.setdefault(name, (kind, help_text))
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, help_text="", **labels):
+        with self._lock:
+            key = self._key(name, "counter", help_text, labels)
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, help_text="", **labels):
+        with self._lock:
+            self._values[self._key(name, "gauge", help_text, labels)] = value
+
+    def set_total(self, name, value, help_text="", **labels):
+        """Set a counter whose running total is kept elsewhere, e.g. by a cache."""
+        with self._lock:
+            self._values[self._key(name, "counter", help_text, labels)] = value
+
+    def observe(self, name, value, help_text="", **labels):
+        with self._lock:
+            key = self._key(name, "summary", help_text, labels)
+            summary = self._values.setdefault(key, [0, 0.0])
+            summary[0] += 1
+            summary[1] += value
+
+    def add_cache_counts(self, path, hits, misses):
+        with self._lock:
+            counts = self._cache_counts.setdefault(path, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+            self._values.clear()
+            self._cache_counts.clear()
+
+    def snapshot(self):
+        """Everything recorded so far, as plain data that can be sent to another process and merged there."""
+        with self._lock:
+            return {
+                "metrics": dict(self._metrics),
+                "values": {key: list(value) if isinstance(value, list) else value
+                           for key, value in self._values.items()},
+                "cache_counts": {path: list(counts) for path, counts in self._cache_counts.items()}
+            }
+
+    def merge(self, snapshot):
+        """Add a snapshot from another registry: counters and summaries add up, gauges take its value."""
+        with self._lock:
+            for name, meta in snapshot["metrics"].items():
+                self._metrics.setdefault(name, meta)
+            for key, value in snapshot["values"].items():
+                kind = self._metrics[key[0]][0]
+                if kind == "summary":
+                    summary = self._values.setdefault(key, [0, 0.0])
+                    summary[0] += value[0]
+                    summary[1] += value[1]
+                elif kind == "counter":
+                    self._values[key] = self._values.get(key, 0) + value
+                else:
+                    self._values[key] = value
+            for path, (hits, misses) in snapshot["cache_counts"].items():
+                counts = self._cache_counts.setdefault(path, [0, 0])
+                counts[0] += hits
+                counts[1] += misses
+
+    def record_schedule(self, run_metrics):
+        """Fold one scheduling request (see SchedulerService.schedule_from_file) into the totals."""
+        self.inc("schedule_requests_total", help_text="Scheduling requests by outcome",
+                 outcome=run_metrics["outcome"])
+        for phase, seconds in run_metrics.get("phases", {}).items():
+            self.observe("schedule_request_phase_seconds", seconds,
+                         help_text="Time per phase of a scheduling request", phase=phase)
+        scheduler = run_metrics.get("scheduler")
+        if not scheduler:
+            return
+        for phase, seconds in scheduler["phases"].items():
+            self.observe("scheduler_phase_seconds", seconds, help_text="Time per Scheduler.schedule() phase",
+                         phase=phase)
+        counters = scheduler["counters"]
+        for counter in ("steps", "resource_waits", "cycles_broken", "tasks_scheduled"):
+            self.inc(f"scheduler_{counter}_total", counters.get(counter, 0),
+                     help_text=f"Scheduler {counter.replace('_', ' ')}")
+        self.set("scheduler_ready_queue_max", counters.get("ready_queue_max", 0),
+                 help_text="Largest ready queue of the last scheduling run")
+
+    def render(self):
+        caches = AnalysisCache.all_stats()
+        with self._lock:
+            worker_counts = {path: list(counts) for path, counts in self._cache_counts.items()}
+        for path in set(caches) | set(worker_counts):
+            stats = caches.get(path, {"hits": 0, "misses": 0})
+            hits, misses = worker_counts.get(path, (0, 0))
+            self.set_total("llm_cache_hits_total", stats["hits"] + hits, help_text="LLM analysis cache hits",
+                           path=path)
+            self.set_total("llm_cache_misses_total", stats["misses"] + misses, help_text="LLM analysis cache misses",
+                           path=path)
+            if path in caches:
+                self.set("llm_cache_entries", stats["size"], help_text="LLM analysis cache entries", path=path)
+
+        with self._lock:
+            by_name = {}
+            for (name, labels), value in self._values.items():
+                by_name.setdefault(name, []).append((labels, value))
+            lines = []
+            for name in sorted(by_name):
+                kind, help_text = self._metrics[name]
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(by_name[name]):
+                    if kind == "summary":
+                        lines.append(f"{name}_count{_format_labels(labels)} {value[0]}")
+                        lines.append(f"{name}_sum{_format_labels(labels)} {value[1]}")
+                    else:
+                        lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# cProfile refuses to start while another profiler is active, so profiled calls take turns
+_profile_lock = threading.Lock()
+
+
+def profile_call(func, *args, cpu=True, memory=False, top=25, **kwargs):
+    """
+    Run func under cProfile and/or tracemalloc and return (result, report).
+    Profiled calls run one at a time; a second one waits for the first.
+    tracemalloc is process-wide, so allocations of concurrent unprofiled
+    requests still show up in the memory report.
+    """
+    with _profile_lock:
+        return _profile_call(func, args, kwargs, cpu, memory, top)
+
+
+def _profile_call(func, args, kwargs, cpu, memory, top):
+    report = {}
+    profiler = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if profiler:
+        profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        if profiler:
+            profiler.disable()
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            report["memory"] = {
+                "peak_bytes": tracemalloc.get_traced_memory()[1],
+                "top": [
+                    {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+                    for stat in snapshot.statistics('lineno')[:top]
+                ]
+            }
+            if started_tracing:
+                tracemalloc.stop()
+    if profiler:
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(top)
+        report["cpu"] = stream.getvalue()
+    return result, report
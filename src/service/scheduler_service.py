@@ -1,42 +1,276 @@
 import os
 import json
-from ..data.loader import load_project_data
-from ..scheduling.scheduler import Scheduler
+import hashlib
+import threading
+from ..data.loader import load_project
+from ..data.project_store import ProjectStore, DEFAULT_PROJECT_ID, project_output_path
+from .metrics_service import MetricsRegistry, timed
+from ..data.serialization import read_document, write_document
+from ..visualization.gantt_chart import GanttChartVisualizer
 from ..models.task import Task
 from ..config import CONFIG
 
 class SchedulerService:
+    # Last result served per project, as (fingerprint, etag, result)
+    _cached_results = {}
+    _cache_lock = threading.Lock()
+    # Fingerprint of the project dict the store last returned, as (project_data, fingerprint)
+    _fingerprints = {}
+    # Scheduler of the last single-pass event-engine result, as (etag, scheduler), for reschedule to build on
+    _schedulers = {}
+
+    @staticmethod
+    def _process_tasks(tasks, resources, scheduler=None, optimize=False, run_metrics=None, listener=None):
+        # The scheduling modules pull in numpy and process pools, so they are
+        # imported on first use rather than when the API starts
+        from ..scheduling.scheduler import Scheduler
+        from ..scheduling.search import ScheduleSearch
+        search = None
+        timings = {}
+        with timed(timings, 'schedule'):
+            if optimize:
+                search = ScheduleSearch()
+                scheduler = search.run(tasks, resources)
+                scheduled_tasks = scheduler.scheduled_tasks
+            else:
+                scheduler = scheduler or Scheduler(tasks, resources)
+                if listener is not None:
+                    scheduler.tracer.add_listener(listener)
+                scheduled_tasks = scheduler.schedule()
+
+        with timed(timings, 'serialize'):
+            scheduled_tasks_dict = [task.to_output_dict() for task in scheduled_tasks]
+            total_time = max(task.end_time for task in scheduled_tasks)
+            total_reward = sum(task.actual_reward for task in scheduled_tasks)
+
+            result = {
+                "scheduled_tasks": scheduled_tasks_dict,
+                "total_time": total_time,
+                "total_reward": total_reward,
+                "critical_path": scheduler.critical_path.to_dict(),
+                "resource_utilization": scheduler.resource_utilization()
+            }
+            if search is not None:
+                result["search"] = search.summary
+            if scheduler.counters['analysis_provisional']:
+                # Scheduled on estimates while the LLM analyses are backfilled ([analysis] mode = "llm_async")
+                result["provisional_analyses"] = scheduler.counters['analysis_provisional']
+        if run_metrics is not None:
+            run_metrics["scheduler"] = scheduler.metrics()
+            run_metrics.setdefault("phases", {}).update(timings)
+        return result, scheduler
+
     @staticmethod
-    def _process_tasks(tasks, resources):
-        scheduler = Scheduler(tasks, resources)
-        scheduled_tasks = scheduler.schedule()
-
-        scheduled_tasks_dict = [task.to_output_dict() for task in scheduled_tasks]
-        total_time = max(task.end_time for task in scheduled_tasks)
-        total_reward = sum(task.actual_reward for task in scheduled_tasks)
-
-        return {
-            "scheduled_tasks": scheduled_tasks_dict,
-            "total_time": total_time,
-            "total_reward": total_reward
+    def project_fingerprint(project_data):
+        """
+        Hash of the normalized project and the configuration that affects the
+        schedule. Task order is kept because it breaks priority ties; resource
+        order is not, since the pool only counts units.
+        """
+        resources = project_data['resources']
+        payload = {
+            "tasks": project_data['tasks'],
+            "resources": sorted(resources) if isinstance(resources, list) else resources,
+            "config": {
+                "scheduler": CONFIG.get('scheduler', {}),
+                "analysis": CONFIG.get('analysis', {}),
+                "search": CONFIG.get('search', {}),
+                "llm": {key: CONFIG['llm'].get(key) for key in ('model', 'backend')}
+            }
         }
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _current_fingerprint(cls, project_id, project_data):
+        """
+        project_fingerprint, computed once per stored version: the project
+        store hands out the same dict until the project is rewritten.
+        """
+        with cls._cache_lock:
+            cached = cls._fingerprints.get(project_id)
+            if cached is not None and cached[0] is project_data:
+                return cached[1]
+        fingerprint = cls.project_fingerprint(project_data)
+        with cls._cache_lock:
+            cls._fingerprints[project_id] = (project_data, fingerprint)
+        return fingerprint
+
+    @staticmethod
+    def _meta_file(project_id):
+        output_file = project_output_path('schedule_output', project_id)
+        return os.path.splitext(output_file)[0] + '.meta.json'
+
+    @classmethod
+    def _stored_entry(cls, project_id, fingerprint):
+        """
+        (result, etag) of the stored result for fingerprint, or None. The
+        etag is a hash of the stored document, so it changes whenever the
+        result is rewritten, even for an unchanged project. The small meta
+        file is read every time because other processes (jobs) may have
+        saved a newer result; the document itself only when it did change.
+        """
+        try:
+            with open(cls._meta_file(project_id), 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        etag = meta.get('etag')
+        if meta.get('fingerprint') != fingerprint or not etag:
+            return None
+        with cls._cache_lock:
+            cached = cls._cached_results.get(project_id)
+            if cached is not None and cached[:2] == (fingerprint, etag):
+                return cached[2], etag
+        try:
+            result = read_document(project_output_path('schedule_output', project_id))
+        except (OSError, ValueError):
+            return None
+        with cls._cache_lock:
+            cls._cached_results[project_id] = (fingerprint, etag, result)
+        return result, etag
 
     @classmethod
-    def schedule_from_file(cls):
+    def _stored_result(cls, project_id, fingerprint):
+        """Return the stored result for fingerprint, from memory or disk, or None."""
+        entry = cls._stored_entry(project_id, fingerprint)
+        return entry[0] if entry is not None else None
+
+    @classmethod
+    def invalidate_cache(cls, project_id=DEFAULT_PROJECT_ID):
+        """Forget the stored result, e.g. after the project was rewritten."""
+        with cls._cache_lock:
+            cls._cached_results.pop(project_id, None)
+            cls._fingerprints.pop(project_id, None)
+            cls._schedulers.pop(project_id, None)
+            try:
+                os.remove(cls._meta_file(project_id))
+            except FileNotFoundError:
+                pass
+
+    @classmethod
+    def get_cached_result(cls, project_id=DEFAULT_PROJECT_ID):
+        """
+        Return (result, etag) for the project if its current content has
+        already been scheduled, or (None, None) otherwise. The etag identifies
+        the stored result itself (see _stored_entry).
+        """
+        project_data = load_project(project_id)
+        fingerprint = cls._current_fingerprint(project_id, project_data)
+        return cls._stored_entry(project_id, fingerprint) or (None, None)
+
+    @classmethod
+    def schedule_from_file(cls, project_id=DEFAULT_PROJECT_ID, use_cache=True, optimize=None, run_metrics=None,
+                           listener=None):
+        """
+        Load project data from the project store, schedule tasks, and return
+        results. An unchanged project returns the stored result without
+        rescheduling, unless that result was built on provisional estimates
+        (provisional_analyses) whose LLM analyses may since have arrived.
+        With optimize (default: [search] enabled) the best of a parallel
+        schedule search is returned instead of a single greedy pass.
+        If run_metrics is a dict it is filled with the outcome, the seconds
+        spent per phase and the scheduler's own phases and counters. listener,
+        if given, receives the scheduler's events (see EventTracer) of a
+        single-pass run as they happen.
         """
-        Load project data from a file, schedule tasks, and return results
+        if optimize is None:
+            optimize = CONFIG.get('search', {}).get('enabled', False)
+        run_metrics = {} if run_metrics is None else run_metrics
+        run_metrics.update(outcome="error", phases={})
+        phases = run_metrics["phases"]
+        try:
+            with timed(phases, 'total'):
+                with timed(phases, 'load'):
+                    project_data = load_project(project_id)
+                with timed(phases, 'fingerprint'):
+                    fingerprint = cls._current_fingerprint(project_id, project_data)
+                if use_cache:
+                    with timed(phases, 'cache_lookup'):
+                        cached = cls._stored_result(project_id, fingerprint)
+                    # A result scheduled on estimates is redone once the LLM analyses may have arrived
+                    if cached is not None and (not optimize or 'search' in cached) \
+                            and not cached.get('provisional_analyses'):
+                        run_metrics["outcome"] = "cache_hit"
+                        return cached
+
+                with timed(phases, 'build_tasks'):
+                    tasks = [Task.from_input_dict(task) for task in project_data['tasks']]
+                    resources = project_data['resources']
+
+                result, scheduler = cls._process_tasks(tasks, resources, optimize=optimize, run_metrics=run_metrics,
+                                                       listener=listener)
+                with timed(phases, 'write'):
+                    cls._save_result(project_id, fingerprint, result, scheduler)
+                run_metrics["outcome"] = "scheduled"
+                return result
+        finally:
+            MetricsRegistry.instance().record_schedule(run_metrics)
+
+    @classmethod
+    def reschedule(cls, patch, project_id=DEFAULT_PROJECT_ID):
+        """
+        Apply an edit to the stored project and update its schedule. When the
+        unedited project has a stored result, only the part of the schedule
+        from the earliest affected time onwards is recomputed, and if this
+        process still holds the scheduler behind that result, only the edited
+        tasks' analyses, priorities and critical-path terms are. The edit is
+        saved only if the project is still the version it was applied to;
+        otherwise VersionConflict is raised.
         """
-        input_file = CONFIG['paths']['project_input']
-        project_data = load_project_data(input_file)
+        from ..scheduling.incremental import IncrementalScheduler, apply_patch
+        store = ProjectStore.instance()
+        version, prior_project = store.get_with_version(project_id)
+        if prior_project is None:
+            raise FileNotFoundError(f"Project not found: {project_id}")
+        project_data = apply_patch(prior_project, patch)
+        prior_result = prior_scheduler = None
+        if CONFIG['scheduler'].get('engine', 'tick') == 'event':
+            entry = cls._stored_entry(project_id, cls._current_fingerprint(project_id, prior_project))
+            # A searched schedule is not the greedy pass being resumed
+            if entry is not None and 'search' not in entry[0]:
+                prior_result, etag = entry
+                with cls._cache_lock:
+                    warm = cls._schedulers.get(project_id)
+                if warm is not None and warm[0] == etag:
+                    prior_scheduler = warm[1]
+
         tasks = [Task.from_input_dict(task) for task in project_data['tasks']]
         resources = project_data['resources']
+        scheduler = None
+        if prior_result is not None:
+            scheduler = IncrementalScheduler(tasks, resources, prior_project, prior_result, patch, prior_scheduler)
 
-        result = cls._process_tasks(tasks, resources)
+        run_metrics = {"outcome": "rescheduled", "phases": {}}
+        result, scheduler = cls._process_tasks(tasks, resources, scheduler, run_metrics=run_metrics)
+        store.put(project_id, project_data, expected_version=version)
+        cls._save_result(project_id, cls._current_fingerprint(project_id, store.get(project_id)), result, scheduler)
+        MetricsRegistry.instance().record_schedule(run_metrics)
+        return result
 
-        # Save result to local file
-        output_file = CONFIG['paths']['schedule_output']
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        with open(output_file, 'w') as f:
-            json.dump(result, f, indent=2)
+    @classmethod
+    def _save_result(cls, project_id, fingerprint, result, scheduler=None):
+        """
+        Stream the result to its output file, and its Gantt chart data next to
+        it, without building either document as one string. The scheduler of
+        a single-pass event-engine result is kept for reschedule to build on.
+        """
+        output_file = project_output_path('schedule_output', project_id)
+        header = {key: value for key, value in result.items() if key != 'scheduled_tasks'}
+        hasher = hashlib.sha256()
+        write_document(output_file, header, 'scheduled_tasks', result['scheduled_tasks'], hasher=hasher)
+        etag = hasher.hexdigest()[:32]
+        GanttChartVisualizer.create_chart(result['scheduled_tasks'], project_output_path('gantt_chart', project_id),
+                                          result['total_time'])
+        meta_file = cls._meta_file(project_id)
+        tmp_file = f"{meta_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({"fingerprint": fingerprint, "etag": etag}, f)
+        os.replace(tmp_file, meta_file)
 
-        return result
\ No newline at end of file
+        with cls._cache_lock:
+            cls._cached_results[project_id] = (fingerprint, etag, result)
+            if scheduler is not None and scheduler.engine == 'event' and 'search' not in result:
+                cls._schedulers[project_id] = (etag, scheduler)
+            else:
+                cls._schedulers.pop(project_id, None)
@@ -0,0 +1,163 @@
+import logging
+import threading
+from collections import deque
+from .scheduler_service import SchedulerService
+from ..data.project_store import DEFAULT_PROJECT_ID
+from ..config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Scheduler events sent to clients; task_ready and resource_wait are engine internals
+STREAMED_EVENTS = {'schedule_started', 'analysis_progress', 'phase_finished', 'cycle_broken', 'task_started',
+                   'task_finished', 'schedule_finished'}
+# Events where only the latest one matters; a pending one is updated in place
+COALESCED_EVENTS = ('analysis_progress',)
+
+
+class StreamLimitReached(Exception):
+    pass
+
+
+class EventChannel:
+    """
+    Bounded hand-off of scheduler events from the scheduling thread to one
+    streaming client (STREAMED_EVENTS only). publish never blocks, so a slow
+    client cannot stall the engine: progress events are coalesced and, once
+    max_events are waiting, further events are dropped and counted. The final
+    event always gets through.
+    """
+
+    def __init__(self, max_events=1000):
+        self.max_events = max_events
+        self._events = deque()
+        self._pending = {}  # coalesced event name -> its record still in the queue
+        self._dropped = 0
+        self._finished = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def publish(self, record):
+        with self._cond:
+            if self._finished or self._closed:
+                return
+            name = record["event"]
+            if name not in STREAMED_EVENTS:
+                return
+            pending = self._pending.get(name)
+            if pending is not None:
+                pending.clear()
+                pending.update(record)
+                return
+            if len(self._events) >= self.max_events:
+                self._dropped += 1
+                return
+            if name in COALESCED_EVENTS:
+                record = self._pending[name] = dict(record)
+            self._events.append(record)
+            self._cond.notify()
+
+    def finish(self, record):
+        with self._cond:
+            if self._dropped:
+                record = dict(record, events_dropped=self._dropped)
+            self._events.append(record)
+            self._finished = True
+            self._cond.notify()
+
+    def close(self):
+        """The client is gone: discard what is queued and ignore further events."""
+        with self._cond:
+            self._closed = True
+            self._events.clear()
+            self._pending.clear()
+            self._cond.notify()
+
+    def events(self, heartbeat=15.0):
+        """
+        Yield queued events until the final one, or None after heartbeat
+        seconds without any. A gap left by dropped events is announced with
+        an events_dropped record.
+        """
+        while True:
+            with self._cond:
+                if not self._events and not self._finished and not self._closed:
+                    self._cond.wait(heartbeat)
+                if self._closed:
+                    return
+                batch = list(self._events)
+                self._events.clear()
+                self._pending.clear()
+                dropped, self._dropped = self._dropped, 0
+                finished = self._finished
+            if dropped and not finished:
+                yield {"event": "events_dropped", "count": dropped}
+            if not batch and not finished:
+                yield None
+            for record in batch:
+                yield record
+            if finished:
+                return
+
+
+class ScheduleStreams:
+    """Runs scheduling in a background thread per client and streams its events."""
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_streams=4, queue_size=1000):
+        self.max_streams = max_streams
+        self.queue_size = queue_size
+        self._active = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                streaming_config = CONFIG.get('streaming', {})
+                cls._instance = cls(
+                    max_streams=streaming_config.get('max_streams', 4),
+                    queue_size=streaming_config.get('queue_size', 1000)
+                )
+            return cls._instance
+
+    def open(self, project_id=DEFAULT_PROJECT_ID, use_cache=True):
+        """Start scheduling the project and return the EventChannel its events arrive on."""
+        with self._lock:
+            if self._active >= self.max_streams:
+                raise StreamLimitReached(f"Too many schedule streams ({self.max_streams}), try again later")
+            self._active += 1
+        channel = EventChannel(self.queue_size)
+        thread = threading.Thread(target=self._run, args=(channel, project_id, use_cache),
+                                  name="schedule-stream", daemon=True)
+        try:
+            thread.start()
+        except Exception:
+            self._release()
+            raise
+        return channel
+
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+
+    def _run(self, channel, project_id, use_cache):
+        # Searches run many variant schedules in other processes, so streams always run a single pass
+        run_metrics = {}
+        try:
+            result = SchedulerService.schedule_from_file(project_id, use_cache=use_cache, optimize=False,
+                                                         run_metrics=run_metrics, listener=channel.publish)
+            channel.finish({
+                "event": "done",
+                "outcome": run_metrics.get("outcome"),
+                "total_time": result["total_time"],
+                "total_reward": result["total_reward"],
+                "tasks_scheduled": len(result["scheduled_tasks"])
+            })
+        except (FileNotFoundError, ValueError) as e:
+            channel.finish({"event": "error", "error": str(e)})
+        except Exception:
+            logger.exception("Streamed scheduling of %s failed", project_id)
+            channel.finish({"event": "error", "error": "An unexpected error occurred"})
+        finally:
+            self._release()
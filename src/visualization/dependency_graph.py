@@ -1,9 +1,33 @@
 import networkx as nx
+import json
+import math
 import os
+import threading
+from xml.sax.saxutils import escape, quoteattr
+from PIL import Image, ImageDraw, ImageFont
+from .graph_layout import LayoutCache, NODE_RADIUS, choose_layout, structure_hash, svg_path
 from ..config import CONFIG
-import requests
-from PIL import Image
-import io
+
+NODE_FILL = (173, 216, 230, 255)  # lightblue
+LINE_COLOR = (0, 0, 0, 255)
+ARROW_SIZE = 9
+RENDER_VERSION = 1  # bump when the drawing itself changes
+
+
+def _write_file(path, write):
+    """
+    Call write with a per-writer temp path and move the result to path, so
+    concurrent renders of one graph never leave a mixed or partial file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
 
 class DependencyGraphVisualizer:
     @staticmethod
@@ -16,39 +40,122 @@ class DependencyGraphVisualizer:
         return G
 
     @staticmethod
-    def visualize(G, output_file):
-        A = nx.nx_agraph.to_agraph(G)
-        A.graph_attr.update(rankdir="LR", size=CONFIG['visualization']['dependency_graph_size'])
-        A.node_attr.update(shape="circle", style="filled", fillcolor="lightblue", fontsize="9", fontweight="bold")
-        A.edge_attr.update(color="black", arrowsize="0.9")
+    def svg_path(output_file):
+        return svg_path(output_file)
+
+    @classmethod
+    def visualize(cls, G, output_file):
+        """
+        Render G locally to a transparent PNG at output_file and an SVG next
+        to it. Nothing is redrawn when the files already show this graph, and
+        the layout comes from the shared layout cache when the structure has
+        been laid out before.
+        """
+        method = choose_layout(G)
+        max_size = CONFIG.get('visualization', {}).get('max_image_size', 8000)
+        fingerprint = f"{RENDER_VERSION}:{max_size}:{structure_hash(G, method)}"
+        meta_file = os.path.splitext(output_file)[0] + '.meta.json'
+        svg_file = cls.svg_path(output_file)
+        try:
+            with open(meta_file, 'r') as f:
+                if json.load(f).get('fingerprint') == fingerprint \
+                        and os.path.exists(output_file) and os.path.exists(svg_file):
+                    return output_file
+        except (OSError, ValueError):
+            pass
+
+        layout = LayoutCache.shared().get_or_compute(G, method)
+        cls.render_png(G, layout, output_file, max_size)
+        cls.render_svg(G, layout, svg_file)
+        _write_file(meta_file, lambda path: cls._write_json(path, {"fingerprint": fingerprint}))
+        return output_file
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path, 'w') as f:
+            json.dump(data, f)
 
-        A.layout(prog="dot")
-        temp_file = output_file + "_temp.png"
-        A.draw(temp_file)
+    @staticmethod
+    def _edge_segments(G, layout, radius, scale=1.0):
+        """Edge lines trimmed to the node circles, as (x1, y1, x2, y2) in output pixels."""
+        positions = layout.positions
+        for source, target in G.edges:
+            if source == target:
+                continue
+            x1, y1 = positions[source]
+            x2, y2 = positions[target]
+            length = math.hypot(x2 - x1, y2 - y1)
+            if length <= 2 * radius:
+                continue
+            dx, dy = (x2 - x1) / length, (y2 - y1) / length
+            yield ((x1 + dx * radius) * scale, (y1 + dy * radius) * scale,
+                   (x2 - dx * radius) * scale, (y2 - dy * radius) * scale)
 
-        # Remove background
+    @classmethod
+    def render_png(cls, G, layout, output_file, max_size=8000):
+        scale = min(1.0, max_size / max(layout.width, layout.height, 1))
+        size = (max(1, math.ceil(layout.width * scale)), max(1, math.ceil(layout.height * scale)))
+        image = Image.new('RGBA', size, (0, 0, 0, 0))
+        draw = ImageDraw.Draw(image)
+        radius = NODE_RADIUS * scale
+        arrow = ARROW_SIZE * scale
+
+        for x1, y1, x2, y2 in cls._edge_segments(G, layout, NODE_RADIUS, scale):
+            draw.line((x1, y1, x2, y2), fill=LINE_COLOR, width=1)
+            angle = math.atan2(y2 - y1, x2 - x1)
+            draw.polygon([
+                (x2, y2),
+                (x2 - arrow * math.cos(angle - 0.4), y2 - arrow * math.sin(angle - 0.4)),
+                (x2 - arrow * math.cos(angle + 0.4), y2 - arrow * math.sin(angle + 0.4))
+            ], fill=LINE_COLOR)
+
+        # Labels are unreadable once nodes shrink below a few pixels
+        font = cls._font(max(8, round(11 * scale))) if scale >= 0.5 else None
+        for node, (x, y) in layout.positions.items():
+            x, y = x * scale, y * scale
+            draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=NODE_FILL, outline=LINE_COLOR)
+            if font is not None:
+                draw.text((x, y), str(node), fill=LINE_COLOR, font=font, anchor='mm')
+
+        directory = os.path.dirname(output_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Fast zlib level: large, mostly transparent images still compress well
+        _write_file(output_file, lambda path: image.save(path, 'PNG', compress_level=1))
+        return output_file
+
+    @staticmethod
+    def _font(size):
         try:
-            with open(temp_file, 'rb') as file:
-                response = requests.post(
-                    'https://api.remove.bg/v1.0/removebg',
-                    files={'image_file': file},
-                    data={'size': 'auto'},
-                    headers={'X-Api-Key': CONFIG['api']['remove_bg_key']},
-                )
-                if response.status_code == requests.codes.ok:
-                    with Image.open(io.BytesIO(response.content)) as img:
-                        img.save(output_file, 'PNG')
-                    print(f"Dependency graph with removed background saved to {output_file}")
-                else:
-                    print(f"Error removing background: {response.status_code} {response.text}")
-                    print(f"Using original image without background removal")
-                    os.rename(temp_file, output_file)
-        except Exception as e:
-            print(f"Error in background removal: {str(e)}")
-            print(f"Using original image without background removal")
-            os.rename(temp_file, output_file)
-        finally:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-
-        return output_file
\ No newline at end of file
+            return ImageFont.load_default(size=size)
+        except TypeError:  # Pillow < 10.1 has a single bitmap size
+            return ImageFont.load_default()
+
+    @classmethod
+    def render_svg(cls, G, layout, output_file):
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{layout.width:g}" height="{layout.height:g}"'
+            f' viewBox="0 0 {layout.width:g} {layout.height:g}">',
+            '<defs><marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" markerHeight="7"'
+            ' orient="auto"><path d="M0,0 L10,5 L0,10 z" fill="black"/></marker></defs>',
+            '<g stroke="black" stroke-width="1" marker-end="url(#arrow)">'
+        ]
+        for x1, y1, x2, y2 in cls._edge_segments(G, layout, NODE_RADIUS):
+            parts.append(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/>')
+        parts.append('</g>')
+        parts.append('<g font-family="sans-serif" font-size="9" font-weight="bold" text-anchor="middle"'
+                     ' dominant-baseline="central">')
+        for node, (x, y) in layout.positions.items():
+            parts.append(
+                f'<g id={quoteattr(str(node))}><circle cx="{x:.1f}" cy="{y:.1f}" r="{NODE_RADIUS}"'
+                f' fill="lightblue" stroke="black"/><text x="{x:.1f}" y="{y:.1f}">{escape(str(node))}</text></g>'
+            )
+        parts.append('</g></svg>')
+
+        _write_file(output_file, lambda path: cls._write_text(path, "\n".join(parts)))
+        return output_file
+
+    @staticmethod
+    def _write_text(path, text):
+        with open(path, 'w') as f:
+            f.write(text)
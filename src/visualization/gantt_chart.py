@@ -1,35 +1,41 @@
-import json
 from datetime import datetime, timedelta
+from ..data.serialization import write_document
+
+START_DATE = datetime(2023, 1, 1)  # Arbitrary start date
 
 class GanttChartVisualizer:
     @staticmethod
-    def create_chart(scheduled_tasks, output_file):
-        chart_data = GanttChartVisualizer._generate_chart_data(scheduled_tasks)
-        
-        with open(output_file, 'w') as f:
-            json.dump(chart_data, f, indent=2)
+    def create_chart(scheduled_tasks, output_file, total_time=None):
+        """
+        Stream Gantt data for scheduled task output dicts to output_file, one
+        task at a time. scheduled_tasks may be any iterable when total_time
+        (the schedule's end) is given.
+        """
+        if total_time is None:
+            scheduled_tasks = list(scheduled_tasks)
+            total_time = max(task['end_time'] for task in scheduled_tasks)
+        now = datetime.now().timestamp()
+        header = GanttChartVisualizer.chart_header(total_time)
+        tasks_data = (GanttChartVisualizer.task_data(task, START_DATE, now) for task in scheduled_tasks)
+        return write_document(output_file, header, 'tasks', tasks_data)
 
     @staticmethod
-    def _generate_chart_data(scheduled_tasks):
-        start_date = datetime(2023, 1, 1)  # Arbitrary start date
-        tasks_data = []
-        for task in scheduled_tasks:
-            tasks_data.append({
-                'id': task.id,
-                'title': task.title,
-                'start': (start_date + timedelta(days=task.start_time)).isoformat(),
-                'end': (start_date + timedelta(days=task.end_time)).isoformat(),
-                'resources': task.required_resources,
-                'dependencies': task.dependencies,
-                'progress': 100 if task.end_time <= datetime.now().timestamp() else 0  # Simple progress calculation
-            })
-        
-        max_end_time = max(task.end_time for task in scheduled_tasks)
-        
-        chart_data = {
-            'tasks': tasks_data,
+    def chart_header(total_time, start_date=START_DATE):
+        return {
             'projectStart': start_date.isoformat(),
-            'projectEnd': (start_date + timedelta(days=int(max_end_time))).isoformat()
+            'projectEnd': (start_date + timedelta(days=int(total_time))).isoformat()
+        }
+
+    @staticmethod
+    def task_data(task, start_date=START_DATE, now=None):
+        """Gantt entry for one scheduled task output dict."""
+        now = datetime.now().timestamp() if now is None else now
+        return {
+            'id': task['id'],
+            'title': task['title'],
+            'start': (start_date + timedelta(days=task['start_time'])).isoformat(),
+            'end': (start_date + timedelta(days=task['end_time'])).isoformat(),
+            'resources': task['resources'],
+            'dependencies': task.get('dependencies', []),
+            'progress': 100 if task['end_time'] <= now else 0  # Simple progress calculation
         }
-        
-        return chart_data
\ No newline at end of file
@@ -0,0 +1,212 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from ..config import CONFIG
+
+NODE_RADIUS = 18
+LAYER_GAP = 100
+NODE_GAP = 48
+MARGIN = 30
+LAYOUTS = ('auto', 'dot', 'layered')
+
+
+def svg_path(output_file):
+    """The SVG drawn next to the PNG at output_file."""
+    return os.path.splitext(output_file)[0] + '.svg'
+
+
+class GraphLayout:
+    """Node centres in pixels for a left-to-right drawing of a dependency graph."""
+
+    def __init__(self, positions, width, height, method):
+        self.positions = positions
+        self.width = width
+        self.height = height
+        self.method = method
+
+    def to_dict(self):
+        return {"positions": self.positions, "width": self.width, "height": self.height, "method": self.method}
+
+    @classmethod
+    def from_dict(cls, data):
+        positions = {node: tuple(position) for node, position in data["positions"].items()}
+        return cls(positions, data["width"], data["height"], data["method"])
+
+
+def choose_layout(G, method=None):
+    """Resolve "auto" to Graphviz dot for small graphs (when available) and the layered layout otherwise."""
+    visualization_config = CONFIG.get('visualization', {})
+    method = method or visualization_config.get('graph_layout', 'auto')
+    if method not in LAYOUTS:
+        raise ValueError(f"Unknown graph layout: {method}")
+    if method != 'auto':
+        return method
+    if G.number_of_nodes() > visualization_config.get('dot_max_nodes', 300):
+        return 'layered'
+    try:
+        import pygraphviz  # noqa: F401
+    except ImportError:
+        return 'layered'
+    return 'dot'
+
+
+def structure_hash(G, method):
+    """Identity of everything a layout depends on: the method, the nodes in order and the edges."""
+    payload = json.dumps([method, list(G.nodes), sorted(G.edges)], separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def compute_layout(G, method):
+    if method == 'dot':
+        return dot_layout(G)
+    return layered_layout(G)
+
+
+def dot_layout(G):
+    import networkx as nx
+    positions = nx.nx_agraph.graphviz_layout(G, prog='dot', args='-Grankdir=LR')
+    if not positions:
+        return GraphLayout({}, 2 * MARGIN, 2 * MARGIN, 'dot')
+    min_x = min(x for x, _ in positions.values())
+    max_y = max(y for _, y in positions.values())
+    # Graphviz puts y up; the renderers put it down
+    placed = {node: (x - min_x + MARGIN, max_y - y + MARGIN) for node, (x, y) in positions.items()}
+    width = max(x for x, _ in placed.values()) + MARGIN
+    height = max(y for _, y in placed.values()) + MARGIN
+    return GraphLayout(placed, width, height, 'dot')
+
+
+def _assign_layers(G):
+    """Longest-path layering; a node on a cycle is placed once nothing else is free."""
+    order = {node: i for i, node in enumerate(G.nodes)}
+    in_degree = {node: G.in_degree(node) for node in G.nodes}
+    queue = deque(node for node in G.nodes if in_degree[node] == 0)
+    remaining = set(G.nodes)
+    layer = {}
+    while remaining:
+        if not queue:
+            queue.append(min(remaining, key=lambda node: (in_degree[node], order[node])))
+        node = queue.popleft()
+        if node not in remaining:
+            continue
+        remaining.discard(node)
+        layer[node] = max((layer[pred] + 1 for pred in G.predecessors(node) if pred in layer), default=0)
+        for succ in G.successors(node):
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                queue.append(succ)
+    return layer
+
+
+def layered_layout(G, sweeps=4):
+    """
+    Sugiyama-style layout in linear time per sweep: longest-path layers left
+    to right, then a few barycenter sweeps to reduce crossings within each
+    layer. Long edges get no dummy nodes, which keeps thousands of nodes fast.
+    """
+    layer = _assign_layers(G)
+    layers = [[] for _ in range(max(layer.values(), default=-1) + 1)]
+    for node in G.nodes:
+        layers[layer[node]].append(node)
+
+    position = {}
+    for nodes in layers:
+        for i, node in enumerate(nodes):
+            position[node] = i
+
+    def reorder(nodes, neighbours):
+        def barycenter(node):
+            placed = [position[other] for other in neighbours(node)]
+            return sum(placed) / len(placed) if placed else position[node]
+        nodes.sort(key=barycenter)
+        for i, node in enumerate(nodes):
+            position[node] = i
+
+    for sweep in range(sweeps):
+        if sweep % 2 == 0:
+            for nodes in layers[1:]:
+                reorder(nodes, G.predecessors)
+        else:
+            for nodes in reversed(layers[:-1]):
+                reorder(nodes, G.successors)
+
+    widest = max((len(nodes) for nodes in layers), default=0)
+    positions = {}
+    for index, nodes in enumerate(layers):
+        offset = (widest - len(nodes)) / 2
+        for node in nodes:
+            positions[node] = (MARGIN + index * LAYER_GAP, MARGIN + (position[node] + offset) * NODE_GAP)
+    width = 2 * MARGIN + max(0, len(layers) - 1) * LAYER_GAP
+    height = 2 * MARGIN + max(0, widest - 1) * NODE_GAP
+    return GraphLayout(positions, width, height, 'layered')
+
+
+class LayoutCache:
+    """
+    Layouts keyed by structure hash, kept in memory (bounded, LRU) and as one
+    JSON file per graph so unchanged graphs skip layout after a restart too.
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, directory, max_entries=64):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(CONFIG.get('visualization', {}).get('layout_cache_dir', 'output/layouts'))
+            return cls._instance
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        with self._lock:
+            layout = self._entries.get(key)
+            if layout is not None:
+                self._entries.move_to_end(key)
+                return layout
+        try:
+            with open(self._path(key), 'r') as f:
+                layout = GraphLayout.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError):
+            return None
+        self._remember(key, layout)
+        return layout
+
+    def put(self, key, layout):
+        self._remember(key, layout)
+        os.makedirs(self.directory, exist_ok=True)
+        # Per-writer temp file: several threads may lay out the same graph at once
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(layout.to_dict(), f, separators=(',', ':'))
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _remember(self, key, layout):
+        with self._lock:
+            self._entries[key] = layout
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, G, method=None):
+        method = choose_layout(G, method)
+        key = structure_hash(G, method)
+        layout = self.get(key)
+        if layout is None:
+            layout = compute_layout(G, method)
+            self.put(key, layout)
+        return layout
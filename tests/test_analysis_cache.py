@@ -0,0 +1,37 @@
+from src.analysis.cache import AnalysisCache
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.json"), max_entries=2)
+    cache.put("a", {"estimated_complexity": 1})
+    cache.put("b", {"estimated_complexity": 2})
+    assert cache.get("a") == {"estimated_complexity": 1}  # now most recently used
+    cache.put("c", {"estimated_complexity": 3})
+    assert cache.get("b") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 2, "max_entries": 2}
+
+
+def test_uncounted_lookups_leave_the_stats_alone(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "cache.json"))
+    cache.put("a", {})
+    assert cache.get("a", count=False) == {} and cache.get("b", count=False) is None
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
+def test_saved_entries_reload_in_lru_order(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = AnalysisCache(path, max_entries=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.save()
+
+    reloaded = AnalysisCache(path, max_entries=2)
+    reloaded.put("c", {"n": 3})  # evicts b, the least recently used before saving
+    assert reloaded.get("a") == {"n": 1} and reloaded.get("b") is None
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    assert AnalysisCache(str(path)).stats()["size"] == 0
@@ -0,0 +1,86 @@
+import random
+from collections import deque
+
+import pytest
+
+from src.data.indexes import AdjacencyIndex, IntervalIndex, ScheduleIndex
+
+
+def _overlapping(intervals, t0, t1):
+    """What IntervalIndex.overlapping returns, by a scan over every interval."""
+    matches = []
+    for start, end, value in sorted(intervals, key=lambda interval: (interval[0], interval[1])):
+        if t0 is not None and t1 is not None and t1 <= t0:
+            inside = start <= t0 and (end > t0 or start == t0)
+        else:
+            inside = (t1 is None or start < t1) and (t0 is None or end > t0 or start >= t0)
+        if inside:
+            matches.append(value)
+    return matches
+
+
+def test_window_queries_match_a_scan():
+    rng = random.Random()
+    for _ in range(20):
+        intervals = []
+        for i in range(rng.randint(0, 300)):
+            start = rng.randint(0, 200)
+            intervals.append((start, start + rng.choice([0, 1, 5, 40]), i))
+        index = IntervalIndex(intervals)
+        for _ in range(50):
+            t0, t1 = rng.choice([None, rng.randint(-5, 250)]), rng.choice([None, rng.randint(-5, 250)])
+            assert sorted(index.overlapping(t0, t1)) == sorted(_overlapping(intervals, t0, t1)), (t0, t1)
+
+
+def test_schedule_index_filters_by_resource():
+    tasks = [{"id": "A", "start_time": 0, "end_time": 3, "resources": ["Dev", "Dev"]},
+             {"id": "B", "start_time": 2, "end_time": 4, "resources": ["QA"]},
+             {"id": "C", "start_time": 5, "end_time": 6, "resources": ["Dev"]}]
+    index = ScheduleIndex(tasks)
+    assert [task["id"] for task in index.query(2, 5)] == ["A", "B"]
+    assert [task["id"] for task in index.query(2, 6, "Dev")] == ["A", "C"]
+    assert index.query(resource="Ops") == []
+
+
+def _tasks(n, rng):
+    return [{"id": f"T{i}", "title": f"Task {i}", "dependencies": [f"T{j}" for j in range(i) if rng.random() < 3 / n]}
+            for i in range(n)]
+
+
+def _hops(tasks, start, depth, direction):
+    """Distance of every task within depth hops of start, by a plain breadth-first search."""
+    edges = {task["id"]: set() for task in tasks}
+    for task in tasks:
+        for dep in task["dependencies"]:
+            if direction != 'downstream':
+                edges[task["id"]].add(dep)
+            if direction != 'upstream':
+                edges[dep].add(task["id"])
+    distance, queue = {start: 0}, deque([start])
+    while queue:
+        node = queue.popleft()
+        for other in edges[node] if distance[node] < depth else ():
+            if other not in distance:
+                distance[other] = distance[node] + 1
+                queue.append(other)
+    return distance
+
+
+@pytest.mark.parametrize("direction", ["upstream", "downstream", "both"])
+def test_k_hop_neighbourhoods_match_a_breadth_first_search(direction):
+    rng = random.Random()
+    tasks = _tasks(80, rng)
+    index = AdjacencyIndex(tasks)
+    for _ in range(30):
+        start, depth = rng.choice(tasks)["id"], rng.randint(0, 4)
+        found = index.neighbourhood(start, depth, direction)
+        assert found == sorted(found, key=lambda item: (item[1], item[0]))  # nearest first, then project order
+        assert {index.ids[node]: hops for node, hops in found} == _hops(tasks, start, depth, direction)
+
+
+def test_neighbourhood_rejects_unknown_tasks_and_directions():
+    index = AdjacencyIndex(_tasks(5, random.Random(0)))
+    with pytest.raises(ValueError):
+        index.neighbourhood("missing", 1)
+    with pytest.raises(ValueError):
+        index.neighbourhood("T0", 1, "sideways")
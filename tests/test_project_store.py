@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from src.data.project_store import ProjectStore, VersionConflict
+
+PROJECT = {"tasks": [{"id": "T1", "dependencies": []}], "resources": ["Dev"]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ProjectStore(str(tmp_path / "projects.db"))
+
+
+def test_put_bumps_the_version(store):
+    assert store.get_with_version("alpha") == (None, None)
+    assert store.put("alpha", PROJECT) == 1
+    assert store.put("alpha", {**PROJECT, "resources": ["QA"]}, expected_version=1) == 2
+    assert store.get_with_version("alpha") == (2, {**PROJECT, "resources": ["QA"]})
+
+
+def test_put_with_a_stale_version_raises_and_keeps_the_project(store):
+    store.put("alpha", PROJECT)
+    store.put("alpha", PROJECT)
+    with pytest.raises(VersionConflict):
+        store.put("alpha", {"tasks": [], "resources": []}, expected_version=1)
+    assert store.get_with_version("alpha") == (2, PROJECT)
+    with pytest.raises(VersionConflict):
+        store.put("beta", PROJECT, expected_version=1)  # no such project yet
+    assert store.version("beta") is None
+
+
+def test_concurrent_writers_of_one_version_get_one_success(store):
+    store.put("alpha", PROJECT)
+    outcomes = []
+
+    def write(n):
+        try:
+            outcomes.append(store.put("alpha", {**PROJECT, "resources": [f"R{n}"]}, expected_version=1))
+        except VersionConflict:
+            outcomes.append("conflict")
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(outcomes, key=str) == [2] + ["conflict"] * 7
+    assert store.version("alpha") == 2
+
+
+def test_invalid_ids_are_rejected(store):
+    for project_id in ("", "list", "../escape", "x" * 65):
+        with pytest.raises(ValueError):
+            store.put(project_id, PROJECT)
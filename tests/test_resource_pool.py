@@ -0,0 +1,43 @@
+import pytest
+
+from src.scheduling.resource_pool import ResourcePool
+
+
+def test_name_list_counts_one_unit_per_entry():
+    pool = ResourcePool(["Dev", "Dev", "QA"])
+    assert pool.capacities == {"Dev": 2, "QA": 1}
+    assert len(pool) == 3 and not pool.typed
+
+
+def test_acquire_and_release_are_counted_and_all_or_nothing():
+    pool = ResourcePool({"cpu": 4, "reviewer": 1})
+    assert pool.try_acquire({"cpu": 3, "reviewer": 1})
+    assert pool.available == {"cpu": 1, "reviewer": 0} and len(pool) == 1
+    assert pool.shortfall({"cpu": 1, "reviewer": 1}) == "reviewer"
+    assert not pool.try_acquire({"cpu": 1, "reviewer": 1})
+    assert pool.available == {"cpu": 1, "reviewer": 0}  # nothing taken on failure
+    assert pool.try_acquire({"cpu": 1})
+    assert not pool and "cpu" not in pool
+
+    pool.release({"cpu": 3, "reviewer": 1})
+    assert pool.available == {"cpu": 3, "reviewer": 1} and len(pool) == 4
+    pool.release({"cpu": 1})
+    assert pool.available == pool.capacities
+
+
+def test_infeasible_names_the_resource_beyond_capacity():
+    pool = ResourcePool({"cpu": 4})
+    assert pool.infeasible({"cpu": 4}) is None
+    assert pool.infeasible({"cpu": 5}) == "cpu"
+    assert pool.infeasible({"gpu": 1}) == "gpu"
+
+
+def test_demand_collapses_lists_and_drops_zero_units():
+    assert ResourcePool.demand(["Dev", "Dev", "QA"]) == {"Dev": 2, "QA": 1}
+    assert ResourcePool.demand({"cpu": 2, "gpu": 0}) == {"cpu": 2}
+
+
+@pytest.mark.parametrize("resources", [{"cpu": -1}, {"cpu": 1.5}, {"cpu": True}])
+def test_invalid_capacities_are_rejected(resources):
+    with pytest.raises(ValueError):
+        ResourcePool(resources)
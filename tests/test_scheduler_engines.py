@@ -0,0 +1,113 @@
+import hashlib
+import random
+
+import pytest
+
+from benchmarks.generators import GENERATORS
+from src.analysis.analyzer import TaskAnalyzer
+from src.models.task import Task
+from src.scheduling.incremental import IncrementalScheduler, apply_patch
+from src.scheduling.scheduler import Scheduler
+
+
+class TextAnalyzer(TaskAnalyzer):
+    """Deterministic analysis from each task's text, as the local LLM backend gives; equal text ties."""
+
+    def analyze_batch(self, tasks, on_task_analyzed=None):
+        for task in tasks:
+            digest = hashlib.sha256(f"{task.title}\n{task.description}".encode('utf-8')).digest()
+            task.llm_analysis = {"estimated_complexity": 1 + digest[0] % 10,
+                                 "suggested_priority": ("low", "medium", "high")[digest[1] % 3]}
+        return tasks
+
+
+def _task(task_id, dependencies=(), base_reward=10, required_time=1):
+    return {"id": task_id, "title": "Same work", "description": "Same description", "requiredTime": required_time,
+            "dependencies": list(dependencies), "requiredResources": ["Dev"], "baseReward": base_reward,
+            "rewardDecayFactor": 0.9}
+
+
+def _schedule(project, engine):
+    scheduler = Scheduler([Task.from_input_dict(task) for task in project['tasks']], project['resources'],
+                          engine=engine, analyzer=TextAnalyzer())
+    return scheduler, {task.id: (task.start_time, task.end_time) for task in scheduler.schedule()}
+
+
+def test_tied_priorities_go_to_the_task_ready_first():
+    # Waiting and Late tie at time 1; Waiting has been ready since 0, Late only since First finished
+    project = {"tasks": [_task("First", base_reward=100), _task("Late", ["First"]), _task("Waiting")],
+               "resources": ["Dev"]}
+    for engine in ("tick", "event"):
+        _, times = _schedule(project, engine)
+        assert times["Waiting"] == (1, 2), engine
+        assert times["Late"] == (2, 3), engine
+
+
+def _contended_project(seed):
+    """
+    Small project that keeps a few resources short, with equal priorities
+    throughout (same text, few rewards and decays) and rewards whose products
+    tie at some times only once decayed (e.g. 42 * 2.0 and 28 * 3.0).
+    """
+    rng = random.Random(seed)
+    names = ["A", "B", "C", "D"][:rng.randint(2, 4)]
+    typed = rng.random() < 0.4
+    if typed:
+        resources = {name: rng.randint(1, 3) for name in names}
+    else:
+        resources = [name for name in names for _ in range(rng.randint(1, 2))]
+    rewards = rng.choice([[10, 10, 20], [12, 18, 24, 28, 36, 42, 56, 84]])
+    tasks = []
+    for i in range(rng.randint(6, 20)):
+        picked = rng.sample(names, rng.randint(1, 2))
+        tasks.append({"id": f"T{i}", "title": "Same work", "description": rng.choice("abc"),
+                      "requiredTime": rng.randint(1, 4),
+                      "dependencies": [f"T{j}" for j in range(i) if rng.random() < 0.1],
+                      "requiredResources": {name: rng.randint(1, resources[name]) for name in picked} if typed else picked,
+                      "baseReward": rng.choice(rewards), "rewardDecayFactor": rng.choice([0.85, 0.9, 0.9, 0.95])})
+    return {"tasks": tasks, "resources": resources}
+
+
+def test_event_engine_matches_tick_engine():
+    seed = random.randrange(2 ** 32)
+    rng = random.Random(seed)
+    for _ in range(300):
+        project = _contended_project(rng.randrange(2 ** 32))
+        assert _schedule(project, "event")[1] == _schedule(project, "tick")[1], f"seed {seed}"
+
+
+@pytest.mark.parametrize("shape", sorted(GENERATORS))
+def test_event_engine_matches_tick_engine_on_benchmarks(shape):
+    seed = random.randrange(2 ** 32)
+    project = GENERATORS[shape](40, seed=seed)
+    assert _schedule(project, "event")[1] == _schedule(project, "tick")[1], f"seed {seed}"
+
+
+def test_infeasible_demands_are_skipped_with_a_name_list_and_rejected_with_a_typed_pool():
+    project = {"tasks": [_task("Dev work"), {**_task("Design"), "requiredResources": ["Designer"]},
+                         _task("After design", ["Design"])],
+               "resources": ["Dev"]}
+    for engine in ("tick", "event"):
+        assert _schedule(project, engine)[1] == {"Dev work": (0, 1)}, engine
+        with pytest.raises(ValueError, match="Design needs 1 x Designer"):
+            _schedule({**project, "resources": {"Dev": 1}}, engine)
+
+
+@pytest.mark.parametrize("patch", [
+    {"update_tasks": [{"id": "T20", "requiredTime": 1}]},
+    {"update_tasks": [{"id": "T30", "baseReward": 1}]},
+    {"remove_tasks": ["T25"]},
+])
+def test_rescheduling_keeps_tie_order(patch):
+    project = GENERATORS["random_dag"](40, seed=1927)
+    prior_scheduler, _ = _schedule(project, "event")
+    prior_result = {"scheduled_tasks": [task.to_output_dict() for task in prior_scheduler.scheduled_tasks],
+                    "critical_path": prior_scheduler.critical_path.to_dict()}
+    edited = apply_patch(project, patch)
+    _, expected = _schedule(edited, "event")
+
+    for prior in (None, prior_scheduler):
+        scheduler = IncrementalScheduler([Task.from_input_dict(task) for task in edited['tasks']],
+                                         edited['resources'], project, prior_result, patch, prior,
+                                         analyzer=TextAnalyzer())
+        assert {task.id: (task.start_time, task.end_time) for task in scheduler.schedule()} == expected
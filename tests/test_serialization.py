@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from src.data import serialization
+
+HEADER = {"total_time": 7, "total_reward": 12.5, "name": "ünïcode \"quoted\"\nline"}
+ITEMS = [{"id": f"T{i}", "start_time": i, "end_time": i + 2, "resources": ["Dev"] * (i % 3)} for i in range(25)]
+
+
+@pytest.mark.parametrize("header, items", [(HEADER, ITEMS), (HEADER, []), ({}, ITEMS), ({}, [])])
+def test_document_round_trip(tmp_path, header, items):
+    path = str(tmp_path / "out" / "schedule.json")
+    serialization.write_document(path, header, "scheduled_tasks", iter(items))
+    assert serialization.read_document(path) == {**header, "scheduled_tasks": items}
+    assert serialization.read_header(path, "scheduled_tasks") == header
+    assert list(serialization.iter_items(path, "scheduled_tasks")) == items
+    assert [name for name in (tmp_path / "out").iterdir()] == [tmp_path / "out" / "schedule.json"]
+
+
+def test_items_of_a_plain_json_file_are_read_too(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({**HEADER, "scheduled_tasks": ITEMS}, indent=2))
+    assert serialization.read_header(str(path), "scheduled_tasks") == HEADER
+    assert list(serialization.iter_items(str(path), "scheduled_tasks")) == ITEMS
+
+
+def test_ndjson_round_trip():
+    lines = b"".join(serialization.iter_ndjson(HEADER, ITEMS)).splitlines()
+    assert [serialization.loads(line) for line in lines] == [HEADER] + ITEMS
+
+
+def test_msgpack_round_trip():
+    msgpack = pytest.importorskip("msgpack")
+    document = {**HEADER, "scheduled_tasks": ITEMS}
+    assert serialization.MSGPACK in serialization.mimetypes()
+    assert msgpack.unpackb(serialization.encode(document, serialization.MSGPACK), raw=False) == document
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(ValueError):
+        serialization.encode({}, "text/csv")
@@ -0,0 +1,46 @@
+import json
+import random
+
+from src.analysis.stream_parser import TaskEntryParser, iter_task_entries
+
+ANALYSES = {
+    "Task 1": {"estimated_complexity": 3, "suggested_priority": "high", "notes": "uses {braces}, \"quotes\" and [brackets]"},
+    "Task 2": {"estimated_complexity": 7, "risks": ["scope", "deps"]},
+    "Task 3": {"estimated_complexity": 5, "suggested_priority": "low"},
+}
+DOCUMENT = json.dumps(ANALYSES, indent=2)
+
+
+def _split(text, rng):
+    cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, 20)))
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def test_entries_do_not_depend_on_how_the_stream_is_split():
+    rng = random.Random()
+    for _ in range(200):
+        assert dict(iter_task_entries(_split(DOCUMENT, rng))) == ANALYSES
+
+
+def test_truncated_stream_yields_the_entries_finished_before_the_cut():
+    ends = [DOCUMENT.index(f'"Task {n + 1}"') for n in range(1, len(ANALYSES))] + [len(DOCUMENT)]
+    for cut in range(len(DOCUMENT) + 1):
+        entries = dict(iter_task_entries([DOCUMENT[:cut]]))
+        assert list(entries) == list(ANALYSES)[:len(entries)]
+        assert all(entries[key] == ANALYSES[key] for key in entries)
+        # Each entry is complete once its value has closed
+        assert len(entries) >= sum(1 for end in ends if DOCUMENT.rfind("}", 0, end) < cut)
+
+
+def test_preamble_with_braces_is_skipped():
+    rng = random.Random()
+    for preamble in ["Note {x}: ", "Here you go {}\n", 'Example {"not": valid}, then: ', "{ {", "Sure!\n```json\n"]:
+        text = preamble + DOCUMENT + "\n```"
+        assert dict(iter_task_entries([text])) == ANALYSES, preamble
+        assert dict(iter_task_entries(_split(text, rng))) == ANALYSES, preamble
+
+
+def test_text_after_the_object_is_ignored():
+    parser = TaskEntryParser()
+    assert dict(parser.feed(DOCUMENT)) == ANALYSES
+    assert parser.feed(' {"Task 4": {}}') == []